@@ -0,0 +1,58 @@
+"""
+Benchmark - payload y tiempo de la grafica diaria con y sin submuestreo
+"""
+import time
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+sys.path.append(str(Path(__file__).parent.parent))
+from src.dashboard.charts import scatter, lttb_indices, minmax_indices, format_labels
+
+
+def build(x, y, downsampled):
+    """Figura con una serie: go.Scatter completo o el camino submuestreado"""
+    fig = go.Figure()
+    if downsampled:
+        fig.add_trace(scatter(x, y, mode='lines'))
+    else:
+        fig.add_trace(go.Scatter(x=x, y=y, mode='lines'))
+    return fig.to_json()
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    for n_days, n_properties in ((60, 1), (365 * 5, 1), (365 * 5, 50), (365 * 20, 100)):
+        # Propiedades concatenadas en una sola serie larga (peor caso para el navegador)
+        n = n_days * n_properties
+        x = pd.date_range('2026-01-01', periods=n, freq='h').to_numpy()
+        y = 70 + np.cumsum(rng.normal(0, 0.5, n))
+
+        start = time.perf_counter()
+        full = build(x, y, downsampled=False)
+        t_full = time.perf_counter() - start
+        start = time.perf_counter()
+        small = build(x, y, downsampled=True)
+        t_small = time.perf_counter() - start
+        print(f"{n:>9,} puntos: completo {len(full) / 1e6:7.2f} MB {t_full:6.3f}s | "
+              f"submuestreado {len(small) / 1e6:5.2f} MB {t_small:6.3f}s")
+
+    # Metodos de submuestreo sobre 1M de puntos
+    y = np.cumsum(rng.normal(0, 1, 1_000_000))
+    x = np.arange(len(y))
+    for name, func in (('lttb', lambda: lttb_indices(x, y, 2000)), ('minmax', lambda: minmax_indices(y, 2000))):
+        start = time.perf_counter()
+        func()
+        print(f"{name:>6}: 1M -> 2000 puntos en {time.perf_counter() - start:.3f}s")
+
+    # Etiquetas: apply fila por fila vs formato vectorizado
+    values = pd.Series(rng.integers(1e5, 1e7, 200_000))
+    start = time.perf_counter()
+    values.apply(lambda v: f'{v/1e6:.1f}M')
+    t_apply = time.perf_counter() - start
+    start = time.perf_counter()
+    format_labels(values, '%.1fM', 1e6)
+    print(f"Etiquetas 200k: apply {t_apply:.3f}s | format_labels {time.perf_counter() - start:.3f}s")
@@ -0,0 +1,90 @@
+"""
+Benchmark - tiempo de arranque (python -X importtime) de los modulos de entrada
+
+Cada modulo se importa en un proceso nuevo; se reporta el tiempo total de
+import, los modulos mas caros y cuales de las dependencias pesadas se cargaron.
+
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --output benchmarks/results/import.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+TARGETS = [
+    'config',
+    'src.storage',
+    'src.dashboard.data',
+    'src.dashboard.charts',
+    'src.models.scoring',
+    'src.models.predictor',
+    'src.pipeline.stages',
+]
+
+# Deben cargarse solo cuando se usan (entrenar, consultar Trends/API, dibujar)
+HEAVY = ['sklearn', 'joblib', 'plotly', 'pytrends', 'requests', 'scipy']
+
+
+def importtime(module):
+    """{modulo: (propio_us, acumulado_us)} de un import en un proceso nuevo"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=PROJECT_ROOT, capture_output=True, text=True,
+                            env={**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'})
+    if result.returncode != 0:
+        raise RuntimeError(f"No se pudo importar {module}:\n{result.stderr[-2000:]}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def measure(module, repeat=5, top=8):
+    runs = [importtime(module) for _ in range(repeat)]
+    totals = [run[module][1] for run in runs]
+    last = runs[-1]
+    return {
+        'module': module,
+        'median_ms': round(statistics.median(totals) / 1000, 1),
+        'min_ms': round(min(totals) / 1000, 1),
+        'heavy_loaded': [name for name in HEAVY if name in last],
+        'top_self_ms': [(name, round(self_us / 1000, 1)) for name, (self_us, _) in
+                        sorted(last.items(), key=lambda item: -item[1][0])[:top]]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo de import de los modulos de entrada")
+    parser.add_argument('modules', nargs='*', default=TARGETS)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', type=Path, help="Guardar resultados en JSON")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'Modulo':<24}{'Mediana ms':>12}{'Min ms':>10}  Pesados cargados")
+    for module in args.modules:
+        row = measure(module, args.repeat)
+        results.append(row)
+        print(f"{module:<24}{row['median_ms']:>12.1f}{row['min_ms']:>10.1f}  {', '.join(row['heavy_loaded']) or '-'}")
+
+    print("\nModulos mas caros (propio) al importar", results[-1]['module'])
+    for name, ms in results[-1]['top_self_ms']:
+        print(f"  {name:<40}{ms:>8.1f} ms")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\nResultados: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
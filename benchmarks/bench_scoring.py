@@ -0,0 +1,45 @@
+"""
+Benchmark - llamadas por segundo del scoring en proceso vs el pipeline por archivos
+"""
+import time
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+from src.models.occupancy import daily_occupancy
+from src.models.scoring import OccupancyScorer
+
+
+def calls_per_second(func, min_seconds=1.0):
+    """Repite `func` hasta juntar `min_seconds` y devuelve llamadas/s"""
+    calls, start = 0, time.perf_counter()
+    while time.perf_counter() - start < min_seconds:
+        func()
+        calls += 1
+    return calls / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    scorer = OccupancyScorer()
+    print(f"Modelo de demanda: {'v' + str(scorer.version) if scorer.version else 'tablas heuristicas'}")
+
+    today = np.datetime64(pd.Timestamp.today().date(), 'D')
+    for n_days in (1, 60, 365, 3650):
+        dates = today + np.arange(n_days)
+        rate = calls_per_second(lambda: scorer.score(dates, rooms=300, rate=150, zone='Hotel Zone',
+                                                     demand_shift=0.02, price_change=0.1))
+        print(f"{n_days:>5} dias: {rate:>10,.0f} llamadas/s ({1e6 / rate:,.0f} us/llamada)")
+
+    # Escenarios en lote: 100 propiedades x 365 dias en una llamada
+    dates = (today + np.arange(365))[:, None]
+    rooms = np.random.default_rng(0).integers(50, 800, 100)
+    rate = calls_per_second(lambda: scorer.score(dates, rooms=rooms, rate=180, price_change=-0.05))
+    print(f"100 propiedades x 365 dias: {rate:,.0f} llamadas/s")
+
+    # Referencia: el motor que arma un DataFrame por llamada
+    rng = np.random.default_rng(0)
+    rate = calls_per_second(lambda: daily_occupancy(None, 60, rng))
+    print(f"daily_occupancy (DataFrame, 60 dias): {rate:,.0f} llamadas/s")
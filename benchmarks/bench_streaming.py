@@ -0,0 +1,142 @@
+"""
+Benchmark - memoria del modo por bloques con archivos de millones de filas
+
+Genera un archivo sintetico de mercados (country, base_arrivals, interest),
+corre tourism_complete, training y arrivals_forecast por bloques (el mismo
+camino que `python -m src.cli run --chunk-rows`) en un proceso nuevo por tamano y compara el pico de memoria (ru_maxrss): el del archivo mas
+grande no debe crecer con el tamano de la entrada. Sale con 1 si se pasa
+del techo.
+
+    python benchmarks/bench_streaming.py
+    python benchmarks/bench_streaming.py --markets 300000 1200000 --chunk-rows 500000 --in-memory
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Corre en el proceso hijo: CANCUN_DATA_DIR ya apunta al directorio temporal
+CHILD = """
+import json, resource, sys, time
+from src.extractors.intelligent_generator import (YEARS, generate_panel, stream_current_data)
+from src.models.predictor import forecast_arrivals_by_country, stream_arrivals_forecast
+from src.models.training import train_models
+from src.storage import read_path, write_dataset
+
+markets, chunk_rows, mode = sys.argv[1], int(sys.argv[2]), sys.argv[3]
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+if mode == 'bloques':
+    _, rows = stream_current_data(markets=markets, chunk_rows=chunk_rows, force=True)
+    train_models(chunk_rows=chunk_rows, force=True)
+    _, forecast_rows = stream_arrivals_forecast(chunk_rows=chunk_rows, force=True)
+else:
+    df = read_path(markets)
+    panel = generate_panel(df.set_index(df['country'].astype(str))['base_arrivals'], df.dropna(), YEARS, seed=42)
+    write_dataset(panel, "tourism_complete")
+    rows = len(panel)
+    del df, panel
+    train_models(force=True)
+    forecast_rows = len(forecast_arrivals_by_country(force=True))
+print(json.dumps({'rows': rows, 'forecast_rows': forecast_rows, 'seconds': round(time.perf_counter() - start, 2),
+                  'baseline_mb': round(baseline / 1024, 1),
+                  'peak_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)}))
+"""
+
+
+def write_markets(path, n, block=250_000, seed=0):
+    """Archivo de `n` mercados escrito por bloques (ordenado por pais, como lo exige el modo por bloques)"""
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rng = np.random.default_rng(seed)
+    writer = None
+    for start in range(0, n, block):
+        ids = np.arange(start, min(start + block, n))
+        df = pd.DataFrame({
+            'country': [f"M{i:08d}" for i in ids],
+            'base_arrivals': rng.integers(1_000, 5_000_000, len(ids)),
+            'interest': np.where(rng.random(len(ids)) < 0.3, np.nan, rng.uniform(1, 100, len(ids)))
+        })
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        writer = writer or pq.ParquetWriter(path, table.schema)
+        writer.write_table(table)
+    writer.close()
+    return path
+
+
+def write_markets_apart(path, n):
+    """write_markets en otro proceso: ru_maxrss se hereda al lanzar hijos y el padre debe quedar liviano"""
+    code = f"import sys; sys.path.insert(0, 'benchmarks'); from bench_streaming import write_markets; " \
+           f"write_markets({str(path)!r}, {n})"
+    subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT, check=True)
+    return path
+
+
+def run_child(markets, chunk_rows, mode, data_dir):
+    # El modelo de demanda se entrena con la serie de Trends del repo
+    raw = Path(data_dir) / 'raw'
+    raw.mkdir(parents=True, exist_ok=True)
+    shutil.copy(PROJECT_ROOT / 'data' / 'raw' / 'trends_time_real.csv', raw)
+    env = {**os.environ, 'CANCUN_DATA_DIR': str(data_dir), 'CANCUN_MODELS_DIR': str(Path(data_dir) / 'models'),
+           'PYTHONDONTWRITEBYTECODE': '1'}
+    result = subprocess.run([sys.executable, '-c', CHILD, str(markets), str(chunk_rows), mode],
+                            cwd=PROJECT_ROOT, capture_output=True, text=True, env=env)
+    if result.returncode != 0:
+        raise RuntimeError(f"Fallo el modo {mode} con {markets}:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def ceiling_mb(small, large, tolerance=0.25, margin_mb=64):
+    """Techo del pico grande: lo usado por encima del import no debe crecer con la entrada"""
+    used_small = small['peak_mb'] - small['baseline_mb']
+    return large['baseline_mb'] + used_small * (1 + tolerance) + margin_mb
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pico de memoria del modo por bloques vs tamano de entrada")
+    parser.add_argument('--markets', type=int, nargs=2, default=[300_000, 1_200_000], metavar=('CHICO', 'GRANDE'),
+                        help="Mercados de los dos archivos (x7 anos = filas de tourism_complete)")
+    parser.add_argument('--chunk-rows', type=int, default=500_000)
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Crecimiento relativo maximo del pico (sobre lo cargado al importar)")
+    parser.add_argument('--margin-mb', type=float, default=64, help="Holgura absoluta del techo")
+    parser.add_argument('--in-memory', action='store_true', help="Corre tambien el modo en memoria para comparar")
+    parser.add_argument('--output', type=Path, help="Guardar resultados en JSON")
+    args = parser.parse_args()
+
+    modes = ['bloques'] + (['memoria'] if args.in_memory else [])
+    results = []
+    print(f"{'Modo':<10}{'Mercados':>11}{'Filas':>12}{'Segundos':>10}{'Base MB':>10}{'Pico MB':>10}")
+    with tempfile.TemporaryDirectory(prefix='cancun-stream-') as tmp:
+        for n in args.markets:
+            markets = write_markets_apart(Path(tmp) / f"markets_{n}.parquet", n)
+            for mode in modes:
+                row = {'mode': mode, 'markets': n, **run_child(markets, args.chunk_rows, mode, Path(tmp) / mode)}
+                results.append(row)
+                print(f"{mode:<10}{n:>11,}{row['rows']:>12,}{row['seconds']:>10.2f}"
+                      f"{row['baseline_mb']:>10.1f}{row['peak_mb']:>10.1f}")
+
+    small, large = [row for row in results if row['mode'] == 'bloques']
+    ceiling = ceiling_mb(small, large, args.tolerance, args.margin_mb)
+    passed = large['peak_mb'] <= ceiling
+    print(f"\nTecho por bloques: {ceiling:.1f} MB con {args.markets[1]:,} mercados -> "
+          f"pico {large['peak_mb']:.1f} MB ({'ok' if passed else 'EXCEDIDO'})")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps({'results': results, 'ceiling_mb': ceiling, 'passed': passed}, indent=2))
+        print(f"Resultados: {args.output}")
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
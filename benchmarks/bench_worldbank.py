@@ -0,0 +1,92 @@
+"""
+Benchmark - Extraccion World Bank (secuencial, concurrente y batch) contra un servidor local
+"""
+import json
+import tempfile
+import threading
+import time
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.append(str(Path(__file__).parent.parent))
+from src.extractors.http_cache import ResponseCache
+from src.extractors.worldbank_extractor import fetch_arrivals, fetch_indicators
+
+LATENCY = 0.05  # Segundos simulados por peticion
+N_COUNTRIES = 60
+
+
+class StubWorldBank(BaseHTTPRequestHandler):
+    """Responde como /v2/country/<codes>/indicator/<indicators>, con paginacion"""
+    requests_served = 0
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        parts = url.path.split('/')
+        query = parse_qs(url.query)
+        page = int(query.get('page', ['1'])[0])
+        per_page = int(query['per_page'][0])
+
+        entries = [
+            {'country': {'value': code}, 'countryiso3code': code, 'indicator': {'id': indicator},
+             'date': str(year), 'value': 1000000 + year}
+            for code in parts[-3].split(';')
+            for indicator in parts[-1].split(';')
+            for year in range(2019, 2024)
+        ]
+        pages = max(1, -(-len(entries) // per_page))
+        body = json.dumps([
+            {'page': page, 'pages': pages, 'per_page': per_page, 'total': len(entries)},
+            entries[(page - 1) * per_page:page * per_page]
+        ]).encode()
+        StubWorldBank.requests_served += 1
+        time.sleep(LATENCY)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub_server():
+    """Levanta el servidor en un puerto libre y devuelve (server, base_url)"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubWorldBank)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/v2"
+
+
+def run(fetch, base_url, **kwargs):
+    StubWorldBank.requests_served = 0
+    start = time.perf_counter()
+    df = fetch(rate_limit=1000, base_url=base_url, **kwargs)
+    return time.perf_counter() - start, df, StubWorldBank.requests_served
+
+
+if __name__ == "__main__":
+    server, base_url = start_stub_server()
+    country_codes = {f"Country {i}": f"C{i:02d}" for i in range(N_COUNTRIES)}
+
+    t_seq, df_seq, n_seq = run(fetch_arrivals, base_url, country_codes=country_codes, max_workers=1)
+    t_conc, df_conc, n_conc = run(fetch_arrivals, base_url, country_codes=country_codes, max_workers=8)
+    t_batch, df_batch, n_batch = run(fetch_indicators, base_url, country_codes=country_codes,
+                                     max_workers=8, per_page=500)
+
+    # Cache: la segunda pasada no debe tocar la red
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = ResponseCache(cache_dir)
+        t_cold, _, n_cold = run(fetch_arrivals, base_url, country_codes=country_codes, max_workers=8, cache=cache)
+        t_warm, df_warm, n_warm = run(fetch_arrivals, base_url, country_codes=country_codes, max_workers=8, cache=cache)
+    server.shutdown()
+
+    assert df_seq.equals(df_conc)
+    assert len(df_batch) == len(df_seq) * 4
+    assert n_warm == 0 and len(df_warm) == len(df_seq)
+    print(f"Secuencial:      {t_seq:.2f}s ({n_seq} peticiones, 1 indicador)")
+    print(f"Concurrente (8): {t_conc:.2f}s ({n_conc} peticiones, 1 indicador) | Speedup: {t_seq / t_conc:.1f}x")
+    print(f"Batch paginado:  {t_batch:.2f}s ({n_batch} peticiones, 4 indicadores)")
+    print(f"Cache frio:      {t_cold:.2f}s ({n_cold} peticiones) | Cache caliente: {t_warm:.3f}s ({n_warm} peticiones)")
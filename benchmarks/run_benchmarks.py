@@ -0,0 +1,257 @@
+"""
+Suite de benchmarks - todas las etapas del pipeline con datos sinteticos escalados
+
+Corre sin red: los extractores se reemplazan por datos sinteticos escritos en
+una carpeta temporal (CANCUN_DATA_DIR / CANCUN_MODELS_DIR), nunca sobre data/.
+Cada caso se mide dos veces: tiempo (mejor de --repeat) y pico de memoria
+(tracemalloc, una corrida aparte para no inflar los tiempos). Las etapas con
+pool de procesos se corren con un solo worker para que tracemalloc las vea.
+
+    python benchmarks/run_benchmarks.py                  # tamanos chicos
+    python benchmarks/run_benchmarks.py --full           # 10/200/2000 paises, 7/30 anos, 60/3650 dias
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<sha>.json
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# La carpeta de trabajo tiene que existir antes de importar config
+WORK_DIR = Path(tempfile.mkdtemp(prefix="cancun-bench-"))
+os.environ["CANCUN_DATA_DIR"] = str(WORK_DIR / "data")
+os.environ["CANCUN_MODELS_DIR"] = str(WORK_DIR / "models")
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(PROJECT_ROOT))
+sys.path.append(str(Path(__file__).parent))
+from bench_generator import synthetic_inputs
+from config import PROPERTIES_FILE
+from src.dashboard.data import country_frames, country_lookup
+from src.extractors import intelligent_generator
+from src.models.portfolio import forecast_portfolio
+from src.models.predictor import (predict_occupancy_monthly, predict_daily_next_month,
+                                  forecast_arrivals_by_country)
+from src.models.scenarios import simulate_scenarios
+from src.models.training import train_models
+from src.processors.aggregates import build_aggregates
+from src.storage import dataset_path, read_dataset, read_path, write_dataset
+
+QUICK = {'countries': [10, 200], 'years': [7], 'horizons': [60]}
+FULL = {'countries': [10, 200, 2000], 'years': [7, 30], 'horizons': [60, 3650]}
+
+# Lo que lee el dashboard (antes load_data() con read_csv)
+DASHBOARD_DATASETS = ['tourism_complete', 'occupancy_monthly', 'occupancy_daily', 'arrivals_forecast',
+                      'agg_kpis', 'agg_yearly', 'agg_country']
+
+SCENARIO_BENCH_PATHS = 1_000
+
+
+def stub_extractors(n_countries, n_years, seed=0):
+    """Reemplaza Trends y World Bank: escribe sus salidas crudas con datos sinteticos"""
+    rng = np.random.default_rng(seed)
+    base, trends = synthetic_inputs(n_countries, seed)
+    last_year = datetime.now().year
+    years = list(range(last_year - n_years + 1, last_year + 1))
+
+    weeks = pd.date_range(end=pd.Timestamp.today().normalize(), periods=n_years * 52, freq='W-SUN')
+    season = 70 + 15 * np.cos(2 * np.pi * (weeks.dayofyear.to_numpy() - 15) / 365.25)
+    trends_time = pd.DataFrame({
+        'date': weeks,
+        'Cancun': np.clip(season + rng.normal(0, 4, len(weeks)), 0, 100).round().astype('int64'),
+        'isPartial': False
+    })
+
+    worldbank = pd.DataFrame({
+        'country': np.repeat(base.index.to_numpy(), n_years),
+        'country_code': np.repeat([f"M{i:04d}" for i in range(n_countries)], n_years),
+        'year': np.tile(years, n_countries),
+        'arrivals': (np.repeat(base.to_numpy(), n_years)
+                     * rng.uniform(0.5, 1.5, n_countries * n_years)).astype('int64')
+    })
+
+    write_dataset(trends, "trends_real", 'raw')
+    write_dataset(trends_time, "trends_time_real", 'raw')
+    write_dataset(worldbank, "worldbank_tourism_real", 'raw')
+
+    # El generador lee su base y sus anos de constantes del modulo
+    intelligent_generator.CANCUN_BASE = base.to_dict()
+    intelligent_generator.YEARS = years
+
+
+def stub_properties(n_countries):
+    """Portafolio escalado: el archivo del proyecto repetido (~1 propiedad por pais)"""
+    props = pd.read_csv(PROJECT_ROOT / "data" / "raw" / PROPERTIES_FILE.name)
+    copies = max(1, n_countries // len(props))
+    scaled = pd.concat([props] * copies, ignore_index=True)
+    scaled['property_id'] = [f"{pid}-{i // len(props)}" for i, pid in enumerate(scaled['property_id'])]
+    scaled.to_csv(PROPERTIES_FILE, index=False)
+
+
+def _rows(result):
+    """Filas de los DataFrames que devuelve la etapa (None si no devuelve tablas)"""
+    items = result.values() if isinstance(result, dict) else result if isinstance(result, (tuple, list)) else [result]
+    counts = [len(item) for item in items if isinstance(item, pd.DataFrame)]
+    return sum(counts) if counts else None
+
+
+def measure(func, repeat=1):
+    """(segundos del mejor intento, pico de memoria en MB, filas del resultado)"""
+    best = float('inf')
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = func()
+            best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak / 1024 ** 2, _rows(result)
+
+
+def scale_cases(n_countries, n_years, days):
+    """Casos (nombre, funcion) de un tamano, en el orden del pipeline"""
+    months = max(1, days // 30)
+    cases = [
+        ('generate_current_data', lambda: intelligent_generator.generate_current_data(force=True)),
+        ('train_models', lambda: train_models(force=True)),
+        ('predict_occupancy_monthly', lambda: predict_occupancy_monthly(horizon=months, force=True)),
+        ('predict_daily_next_month', lambda: predict_daily_next_month(horizon=days, force=True)),
+        ('forecast_arrivals_by_country', lambda: forecast_arrivals_by_country(force=True)),
+        ('forecast_portfolio', lambda: forecast_portfolio(months=months, days=days, max_workers=1, force=True)),
+        ('simulate_scenarios', lambda: simulate_scenarios(n_paths=SCENARIO_BENCH_PATHS, monthly_horizon=months,
+                                                          daily_horizon=days, max_workers=1, force=True)),
+        ('build_aggregates', lambda: build_aggregates(force=True)),
+    ]
+    for name in DASHBOARD_DATASETS:
+        cases.append((f'load_csv:{name}', lambda name=name: read_path(dataset_path(name, fmt='csv'))))
+        cases.append((f'load:{name}', lambda name=name: read_dataset(name)))
+    cases += [
+        ('dashboard:country_frames', lambda: country_frames(read_dataset("tourism_complete"))),
+        ('dashboard:country_lookup', lambda: country_lookup(read_dataset("agg_country"))),
+    ]
+    return cases
+
+
+def run_suite(sizes, repeat=1, only=None):
+    results = []
+    for n_countries, n_years, days in itertools.product(sizes['countries'], sizes['years'], sizes['horizons']):
+        print(f"\n== {n_countries} paises x {n_years} anos, horizonte {days} dias")
+        stub_extractors(n_countries, n_years)
+        stub_properties(n_countries)
+
+        for case, func in scale_cases(n_countries, n_years, days):
+            if only and not any(pattern in case for pattern in only):
+                continue
+            seconds, peak_mb, rows = measure(func, repeat)
+            results.append({
+                'case': case, 'countries': n_countries, 'years': n_years, 'horizon_days': days,
+                'seconds': round(seconds, 4), 'peak_mb': round(peak_mb, 2), 'rows': rows
+            })
+            print(f"  {case:<36}{seconds:>9.3f}s{peak_mb:>10.1f} MB{rows if rows is not None else '-':>10} filas")
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def environment():
+    return {
+        'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+        'platform': platform.platform(), 'cpus': os.cpu_count()
+    }
+
+
+def _key(row):
+    return row['case'], row['countries'], row['years'], row['horizon_days']
+
+
+def compare(current, baseline, threshold):
+    """Imprime la razon actual/base por caso; devuelve los casos mas lentos que el umbral"""
+    base = {_key(row): row for row in baseline['results']}
+    regressions = []
+    print(f"\nComparacion contra {baseline.get('commit', '?')} (umbral x{threshold})")
+    for row in current:
+        old = base.get(_key(row))
+        if old is None or not old['seconds']:
+            continue
+        ratio = row['seconds'] / old['seconds']
+        mem_ratio = row['peak_mb'] / old['peak_mb'] if old['peak_mb'] else 1.0
+        flag = 'REGRESION' if ratio > threshold or mem_ratio > threshold else ''
+        if flag:
+            regressions.append(row)
+        label = f"{row['case']} [{row['countries']}x{row['years']}, {row['horizon_days']}d]"
+        print(f"  {label:<60} tiempo x{ratio:5.2f}  memoria x{mem_ratio:5.2f}  {flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de las etapas del pipeline (offline)")
+    parser.add_argument('--full', action='store_true', help="Todos los tamanos (10/200/2000 paises, 7/30 anos)")
+    parser.add_argument('--countries', type=int, nargs='+', help="Numero de paises a probar")
+    parser.add_argument('--years', type=int, nargs='+', help="Anos de historia a probar")
+    parser.add_argument('--horizons', type=int, nargs='+', help="Horizontes diarios a probar")
+    parser.add_argument('--only', nargs='+', help="Solo los casos que contengan alguno de estos textos")
+    parser.add_argument('--repeat', type=int, default=1, help="Intentos por caso (se guarda el mejor)")
+    parser.add_argument('--output', type=Path, help="Archivo JSON (por defecto benchmarks/results/<commit>.json)")
+    parser.add_argument('--compare', type=Path, help="Resultados base contra los que comparar")
+    parser.add_argument('--threshold', type=float, default=1.25, help="Razon a partir de la cual es regresion")
+    args = parser.parse_args()
+
+    sizes = dict(FULL if args.full else QUICK)
+    for option in ('countries', 'years', 'horizons'):
+        if getattr(args, option):
+            sizes[option] = getattr(args, option)
+
+    commit = git_revision()
+    try:
+        results = run_suite(sizes, args.repeat, args.only)
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    output = args.output or RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        'commit': commit,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'environment': environment(),
+        'sizes': sizes,
+        'results': results
+    }
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nResultados: {output}")
+
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text()), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} casos con regresion")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
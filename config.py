@@ -1,18 +1,39 @@
 """
 Configuracion global
 """
+import os
 from pathlib import Path
 
-# Rutas
+# Rutas (CANCUN_DATA_DIR / CANCUN_MODELS_DIR permiten correr sobre otra carpeta, ej. benchmarks)
 PROJECT_ROOT = Path(__file__).parent
-DATA_RAW = PROJECT_ROOT / "data" / "raw"
-DATA_PROCESSED = PROJECT_ROOT / "data" / "processed"
-MODELS_DIR = PROJECT_ROOT / "models"
+DATA_DIR = Path(os.environ.get("CANCUN_DATA_DIR", PROJECT_ROOT / "data"))
+DATA_RAW = DATA_DIR / "raw"
+DATA_PROCESSED = DATA_DIR / "processed"
+MODELS_DIR = Path(os.environ.get("CANCUN_MODELS_DIR", PROJECT_ROOT / "models"))
 
-# Crear carpetas
-DATA_RAW.mkdir(parents=True, exist_ok=True)
-DATA_PROCESSED.mkdir(parents=True, exist_ok=True)
-MODELS_DIR.mkdir(parents=True, exist_ok=True)
+# Las carpetas se crean al escribir (importar config no toca el disco)
+
+# Almacenamiento: formato principal + exportacion CSV opcional
+STORAGE_FORMAT = "parquet"  # "parquet", "feather" o "csv"
+STREAM_CHUNK_ROWS = 500_000  # Filas por bloque en el modo por bloques (memoria acotada)
+EXPORT_CSV = True
+
+# Portafolio de hoteles (una fila por propiedad)
+PROPERTIES_FILE = DATA_RAW / "properties.csv"
+PORTFOLIO_MAX_WORKERS = None  # None = todos los nucleos
+
+# Cache del dashboard (se invalida si cambia el archivo)
+DASHBOARD_CACHE_TTL = 600  # Segundos
+DASHBOARD_CACHE_MAX_ENTRIES = 32
+
+# Graficas: series largas se submuestrean y se dibujan con WebGL
+CHART_MAX_POINTS = 2000
+CHART_GL_THRESHOLD = 1000  # Puntos originales a partir de los cuales se usa Scattergl
+
+# Escenarios Monte Carlo (bandas P10/P50/P90)
+SCENARIO_PATHS = 10_000
+SCENARIO_CHUNK_MB = 64  # Memoria maxima por bloque de trayectorias (un bloque por proceso)
+SCENARIO_MAX_WORKERS = 4  # Procesos: el pico es ~ SCENARIO_MAX_WORKERS x SCENARIO_CHUNK_MB
 
 # Paises principales para Cancun
 TARGET_COUNTRIES = [
@@ -22,4 +43,54 @@ TARGET_COUNTRIES = [
 ]
 
 # Configuracion Cancun
-CANCUN_COORDS = {"lat": 21.16, "lon": -86.85}
\ No newline at end of file
+CANCUN_COORDS = {"lat": 21.16, "lon": -86.85}
+
+# Semilla global del pipeline (misma semilla -> mismos CSV)
+PIPELINE_SEED = int(os.environ.get("PIPELINE_SEED", 42))
+PIPELINE_MAX_WORKERS = 4  # Etapas independientes en paralelo
+PIPELINE_PROFILE = os.environ.get("PIPELINE_PROFILE") or None  # "cprofile" o "pyinstrument" por etapa
+PROFILE_DIR = DATA_PROCESSED / "profiles"
+
+# World Bank API
+WORLDBANK_API_URL = "https://api.worldbank.org/v2"
+WORLDBANK_MAX_WORKERS = 8  # Peticiones concurrentes
+WORLDBANK_RATE_LIMIT = 10  # Peticiones por segundo
+WORLDBANK_DATE_RANGE = "2019:2023"
+WORLDBANK_SOURCE = 2  # World Development Indicators (requerido en consultas multi-indicador)
+WORLDBANK_PER_PAGE = 1000
+WORLDBANK_BATCH_COUNTRIES = 50  # Paises por peticion (limita el largo de la URL)
+WORLDBANK_PROVISIONAL_YEARS = 2  # Anos recientes que se vuelven a pedir (datos preliminares)
+
+# Indicadores de turismo: codigo World Bank -> nombre corto
+TOURISM_INDICATORS = {
+    'ST.INT.ARVL': 'arrivals',
+    'ST.INT.DPRT': 'departures',
+    'ST.INT.RCPT.CD': 'receipts_usd',
+    'ST.INT.XPND.CD': 'expenditures_usd'
+}
+
+# Cache HTTP en disco (compartido por todos los extractores)
+CACHE_DIR = DATA_DIR / "cache"
+# World Bank: datos anuales. Menor que el intervalo de actualizacion (21 dias, ver
+# update-data.yml); las consultas con anos preliminares se revalidan siempre
+CACHE_TTL_SECONDS = 14 * 24 * 3600
+TRENDS_CACHE_TTL_SECONDS = 24 * 3600
+CACHE_MAX_BYTES = 200 * 1024 * 1024  # Limite total (eviccion LRU)
+
+# Reintentos HTTP
+HTTP_MAX_RETRIES = 4
+HTTP_BACKOFF = 0.5  # Segundos base del backoff exponencial
+
+# Google Trends incremental
+TRENDS_OVERLAP_WEEKS = 8  # Semanas solapadas para reescalar los datos nuevos
+
+# Google Trends por lotes (varias palabras clave, periodos y resoluciones)
+TRENDS_KEYWORDS = ["Cancun", "Tulum", "Playa del Carmen", "Riviera Maya", "Isla Mujeres"]
+TRENDS_BATCH_SIZE = 5  # Maximo de palabras por consulta que acepta Google
+TRENDS_TIMEFRAMES = ["today 12-m", "today 5-y"]
+TRENDS_GEO_RESOLUTIONS = [("", "COUNTRY"), ("US", "REGION"), ("MX", "REGION")]  # ("" = mundial)
+TRENDS_MIN_INTERVAL = 2.0  # Segundos entre consultas (se alarga con cada 429)
+TRENDS_MAX_INTERVAL = 120.0
+TRENDS_MAX_RETRIES = 5
+TRENDS_CHECKPOINT_DIR = DATA_DIR / "checkpoints" / "trends"
+TRENDS_CHECKPOINT_MAX_AGE_DAYS = 2  # Un checkpoint mas viejo se descarta (Trends cambia entre dias)
@@ -1,41 +1,23 @@
 """
-Script maestro - Extrae todos los datos
+Script maestro - Extrae todos los datos y genera las predicciones (pipeline DAG)
 """
 import sys
-from pathlib import Path
 
-sys.path.append(str(Path(__file__).parent))
+from src.pipeline.stages import run_pipeline
 
-print("\n" + "="*60)
-print("EXTRACCION DE DATOS - CANCUN TOURISM")
-print("="*60 + "\n")
+if __name__ == "__main__":
+    print("\n" + "="*60)
+    print("PIPELINE DE DATOS - CANCUN TOURISM")
+    print("="*60 + "\n")
 
-# 1. Google Trends
-print("1/3: Google Trends...")
-try:
-    from src.extractors.trends_extractor import extract_trends
-    extract_trends()
-except Exception as e:
-    print(f"  Error (usando datos anteriores): {e}")
-print()
+    # --profile (cProfile) o --profile=pyinstrument: un perfil por etapa en data/processed/profiles
+    profile = next((arg.partition('=')[2] or 'cprofile' for arg in sys.argv if arg.startswith('--profile')), None)
+    report = run_pipeline(force='--force' in sys.argv, profile=profile)
 
-# 2. World Bank
-print("2/3: World Bank API...")
-try:
-    from src.extractors.worldbank_extractor import extract_tourism_data
-    extract_tourism_data()
-except Exception as e:
-    print(f"  Error (usando datos anteriores): {e}")
-print()
-
-# 3. Generar datos completos
-print("3/3: Generando datos actualizados...")
-from src.extractors.intelligent_generator import generate_current_data
-df = generate_current_data()
-print()
-
-print("="*60)
-print("EXTRACCION COMPLETADA")
-print(f"Datos generados para {df['country'].nunique()} paises")
-print(f"Anos: {df['year'].min()} - {df['year'].max()}")
-print("="*60 + "\n")
\ No newline at end of file
+    # Las extracciones opcionales pueden fallar: se usan los datos anteriores
+    failed = [name for name, r in report['stages'].items()
+              if r['status'] == 'blocked' or (r['status'] == 'failed' and not r['optional'])]
+    print("="*60)
+    print("PIPELINE COMPLETADO" if not failed else f"PIPELINE CON ERRORES: {', '.join(failed)}")
+    print("="*60 + "\n")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,3 @@
+"""
+Cancun tourism analytics - extraccion, modelos y dashboard
+"""
@@ -0,0 +1,111 @@
+"""
+Linea de comandos - corre etapas sueltas del pipeline, con plan (dry-run) y exportacion
+
+    python -m src.cli list
+    python -m src.cli run --stages predictor --horizon 365 --seed 7 --dry-run
+    python -m src.cli run --stages portfolio --properties props.csv --format csv --output exports/
+    python -m src.cli run --stages tourism_complete arrivals_forecast --markets markets.parquet --chunk-rows 200000
+"""
+import argparse
+from pathlib import Path
+import sys
+
+from config import PIPELINE_MAX_WORKERS, STORAGE_FORMAT
+from src.pipeline.dag import plan_stages, print_plan
+from src.pipeline.stages import STAGE_GROUPS, build_pipeline, expand_stages, run_pipeline
+from src.storage import EXTENSIONS, LAYERS, export_dataset
+
+
+def stage_datasets(stage):
+    """(dataset, capa) que escribe una etapa, sin repetir (CSV y Parquet son el mismo)"""
+    datasets = []
+    for path in map(Path, stage.outputs):
+        for layer, root in LAYERS.items():
+            entry = (path.stem if path.suffix else path.name, layer)
+            if path.parent == root and entry not in datasets:
+                datasets.append(entry)
+    return datasets
+
+
+def cmd_list(args):
+    stages = build_pipeline()
+    print(f"{'Etapa':<22}{'Depende de':<54}Estado")
+    for stage in stages:
+        print(f"{stage.name:<22}{', '.join(stage.deps) or '-':<54}{stage.stale_reason() or 'al dia'}")
+    print("\nGrupos: " + "; ".join(f"{name} = {', '.join(members)}" for name, members in STAGE_GROUPS.items()))
+    return 0
+
+
+def cmd_run(args):
+    stages = build_pipeline(seed=args.seed, days=args.horizon, months=args.months, years=args.years,
+                            n_paths=args.paths, properties=args.properties, chunk_rows=args.chunk_rows,
+                            markets=args.markets)
+    try:
+        targets = expand_stages(args.stages, stages) if args.stages else [stage.name for stage in stages]
+        plan = plan_stages(stages, targets, force=args.force)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    print_plan(plan)
+    if args.dry_run:
+        return 0
+
+    # Solo corren las etapas del plan; las dependencias al dia no se esperan
+    selected = [step['stage'] for step in plan if step['run']]
+    names = {stage.name for stage in selected}
+    for stage in selected:
+        stage.deps = [dep for dep in stage.deps if dep in names]
+    print()
+    report = run_pipeline(force=args.force, max_workers=args.workers, profile=args.profile, stages=selected)
+
+    failed = [name for name, r in report['stages'].items()
+              if r['status'] == 'blocked' or (r['status'] == 'failed' and not r['optional'])]
+    if failed:
+        print(f"Etapas con errores: {', '.join(failed)}", file=sys.stderr)
+        return 1
+
+    if args.output:
+        for stage in (step['stage'] for step in plan if step['stage'].name in targets):
+            for name, layer in stage_datasets(stage):
+                print(f"Exportado: {export_dataset(name, args.output, args.format, layer)}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="Pipeline de Cancun Tourism Analytics")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('list', help="Etapas, dependencias y si estan al dia").set_defaults(func=cmd_list)
+
+    run = commands.add_parser('run', help="Corre etapas (y sus dependencias desactualizadas)")
+    run.add_argument('--stages', nargs='+', metavar='ETAPA',
+                     help=f"Etapas o grupos ({', '.join(STAGE_GROUPS)}); por defecto todas")
+    run.add_argument('--dry-run', action='store_true', help="Solo muestra que se recalcularia")
+    run.add_argument('--force', action='store_true', help="Recalcula las etapas pedidas aunque esten al dia")
+    run.add_argument('--seed', type=int, help="Semilla de las etapas aleatorias")
+    run.add_argument('--horizon', type=int, metavar='DIAS', help="Horizonte diario (ocupacion, portafolio, escenarios)")
+    run.add_argument('--months', type=int, help="Horizonte mensual")
+    run.add_argument('--years', type=int, help="Horizonte del forecast de llegadas (anos)")
+    run.add_argument('--paths', type=int, help="Trayectorias Monte Carlo de los escenarios")
+    run.add_argument('--properties', type=Path, help="Archivo de propiedades del portafolio (CSV/Parquet)")
+    run.add_argument('--markets', type=Path,
+                     help="Mercados (country, base_arrivals, interest) para generar tourism_complete por bloques")
+    run.add_argument('--chunk-rows', type=int, metavar='FILAS',
+                     help="Procesa tourism_complete y arrivals_forecast por bloques de este tamano")
+    run.add_argument('--output', type=Path, metavar='DIR', help="Exporta los datasets de las etapas pedidas aqui")
+    run.add_argument('--format', choices=list(EXTENSIONS), default=STORAGE_FORMAT, help="Formato de exportacion")
+    run.add_argument('--workers', type=int, default=PIPELINE_MAX_WORKERS, help="Etapas en paralelo")
+    run.add_argument('--profile', nargs='?', const='cprofile', choices=['cprofile', 'pyinstrument'],
+                     help="Guarda un perfil por etapa en data/processed/profiles")
+    run.set_defaults(func=cmd_run)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,3 @@
+"""
+Datos y graficas del dashboard
+"""
@@ -0,0 +1,84 @@
+"""
+Graficas del dashboard - submuestreo en el servidor y WebGL para series largas
+"""
+import numpy as np
+
+from config import CHART_MAX_POINTS, CHART_GL_THRESHOLD
+
+
+def _as_float(x):
+    """Eje x como numeros (las fechas en nanosegundos) para calcular areas"""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype('int64').astype('float64')
+    return x.astype('float64')
+
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: indices de los `n_out` puntos que conservan la forma"""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x, y = _as_float(x), np.asarray(y, dtype='float64')
+    # Primer y ultimo punto fijos; el resto en n_out - 2 cubetas
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # Promedio de la cubeta siguiente (o el ultimo punto)
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        # Area del triangulo (a, candidato, promedio siguiente) para toda la cubeta a la vez
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y, n_out):
+    """Extremos de la serie + minimo y maximo de cada cubeta ((n_out - 2) // 2), totalmente vectorizado"""
+    y = np.asarray(y, dtype='float64')
+    n = len(y)
+    if n <= n_out or n_out < 4:
+        return np.arange(n)
+    n_buckets = (n_out - 2) // 2
+
+    # Las primeras `extra` cubetas llevan un punto mas: todas tienen datos
+    size, extra = divmod(n, n_buckets)
+    split = extra * (size + 1)
+    lows, highs = [], []
+    for offset, part, length in ((0, y[:split], size + 1), (split, y[split:], size)):
+        if len(part):
+            blocks = part.reshape(-1, length)
+            starts = offset + np.arange(len(blocks)) * length
+            lows.append(starts + blocks.argmin(axis=1))
+            highs.append(starts + blocks.argmax(axis=1))
+    return np.unique(np.concatenate([[0, n - 1], *lows, *highs]))
+
+
+def downsample(x, y, max_points=CHART_MAX_POINTS, method='lttb'):
+    """(x, y) con a lo mas `max_points` puntos ('lttb' o 'minmax')"""
+    x, y = np.asarray(x), np.asarray(y)
+    if len(y) <= max_points:
+        return x, y
+    idx = lttb_indices(x, y, max_points) if method == 'lttb' else minmax_indices(y, max_points)
+    return x[idx], y[idx]
+
+
+def scatter(x, y, max_points=CHART_MAX_POINTS, gl_threshold=CHART_GL_THRESHOLD, method='lttb', **kwargs):
+    """Traza de linea/puntos: submuestreada y en WebGL (Scattergl) si la serie es larga"""
+    import plotly.graph_objects as go
+
+    n = len(y)
+    x, y = downsample(x, y, max_points, method)
+    trace = go.Scattergl if n > gl_threshold else go.Scatter
+    return trace(x=x, y=y, **kwargs)
+
+
+def format_labels(values, fmt, scale=1.0):
+    """Etiquetas con formato printf ('%.1fM', '%.0fK', '%.1f%%') sin apply fila por fila"""
+    return np.char.mod(fmt, np.asarray(values, dtype='float64') / scale)
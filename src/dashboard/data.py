@@ -0,0 +1,80 @@
+"""
+Acceso a datos del dashboard - carga perezosa con cache invalidado por cambios de archivo
+"""
+from collections import OrderedDict
+import threading
+import time
+
+from config import DASHBOARD_CACHE_TTL, DASHBOARD_CACHE_MAX_ENTRIES
+from src.storage import dataset_version, read_dataset
+
+
+class DatasetCache:
+    """Cache LRU de datasets: una entrada vale mientras el archivo no cambie y no venza el TTL
+
+    Los DataFrames se comparten entre sesiones; quien los use no debe
+    modificarlos en su lugar (copiar antes de agregar columnas).
+    """
+
+    def __init__(self, ttl=DASHBOARD_CACHE_TTL, max_entries=DASHBOARD_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # clave -> (version, cargado_en, valor)
+        self._lock = threading.Lock()
+
+    def get(self, name, layer='processed', columns=None, optional=False):
+        """Dataset desde cache, o leido del disco si cambio, vencio o nunca se cargo"""
+        key = (name, layer, tuple(columns) if columns else None)
+        return self._cached(key, name, layer, optional, lambda: read_dataset(name, layer, columns))
+
+    def derive(self, name, builder, layer='processed', columns=None):
+        """Estructura derivada de un dataset (indices, diccionarios...), con la misma invalidacion"""
+        key = (name, layer, tuple(columns) if columns else None, builder.__name__)
+        return self._cached(key, name, layer, False, lambda: builder(self.get(name, layer, columns)))
+
+    def _cached(self, key, name, layer, optional, load):
+        try:
+            version = dataset_version(name, layer)
+        except FileNotFoundError:
+            if optional:
+                return None
+            raise
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == version and time.monotonic() - entry[1] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        # La lectura va fuera del lock para no frenar a las demas sesiones
+        value = load()
+        with self._lock:
+            self._entries[key] = (version, time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        """Descarta todo (boton de actualizar)"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def country_frames(tourism):
+    """Serie de cada pais ordenada por ano: {pais: DataFrame}, para buscar en O(1)"""
+    tourism = tourism.sort_values(['country', 'year'])
+    return {str(country): frame.reset_index(drop=True)
+            for country, frame in tourism.groupby('country', observed=True)}
+
+
+def country_lookup(country_kpis):
+    """KPIs por pais indexados por nombre (busqueda por hash con .loc)"""
+    return country_kpis.assign(country=country_kpis['country'].astype(str)).set_index('country')
@@ -0,0 +1,3 @@
+"""
+Extractores de datos (Google Trends, World Bank) y generador
+"""
@@ -0,0 +1,152 @@
+"""
+Cache de respuestas HTTP en disco - TTL, ETag/Last-Modified y eviccion LRU
+"""
+import pandas as pd
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from config import CACHE_DIR, CACHE_TTL_SECONDS, CACHE_MAX_BYTES
+from src.extractors.http_client import get_with_retry
+
+
+class CachedResponse:
+    """Respuesta servida desde el cache (misma interfaz basica que requests)"""
+
+    def __init__(self, body, meta):
+        self.status_code = 200
+        self.content = body
+        self.headers = meta.get('headers', {})
+        self.from_cache = True
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        pass
+
+
+class ResponseCache:
+    """Cache en disco: un archivo .body y un .json de metadatos por clave"""
+
+    def __init__(self, cache_dir=CACHE_DIR, ttl=CACHE_TTL_SECONDS, max_bytes=CACHE_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(url, params=None):
+        """Clave estable a partir de URL + parametros (sin importar el orden)"""
+        raw = url + '?' + json.dumps(sorted((params or {}).items()), default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _paths(self, key):
+        return self.cache_dir / f"{key}.body", self.cache_dir / f"{key}.json"
+
+    def get(self, key):
+        """Devuelve (meta, body) o None; marca la entrada como usada (LRU)"""
+        body_path, meta_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text())
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        os.utime(body_path)
+        return meta, body
+
+    def is_fresh(self, meta, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        return time.time() - meta['stored_at'] < ttl
+
+    def put(self, key, body, meta=None):
+        """Guarda la entrada de forma atomica y aplica el limite de tamano"""
+        body_path, meta_path = self._paths(key)
+        meta = {**(meta or {}), 'stored_at': time.time(), 'size': len(body)}
+
+        with self._lock:
+            tmp = body_path.with_suffix('.tmp')
+            tmp.write_bytes(body)
+            os.replace(tmp, body_path)
+            tmp = meta_path.with_suffix('.tmp')
+            tmp.write_text(json.dumps(meta))
+            os.replace(tmp, meta_path)
+            self._evict()
+
+    def touch(self, key, meta):
+        """Renueva el TTL de una entrada revalidada (304)"""
+        _, meta_path = self._paths(key)
+        meta_path.write_text(json.dumps({**meta, 'stored_at': time.time()}))
+
+    def _evict(self):
+        """Elimina las entradas menos usadas hasta quedar bajo max_bytes"""
+        bodies = sorted(self.cache_dir.glob('*.body'), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in bodies)
+        for body_path in bodies:
+            if total <= self.max_bytes:
+                break
+            total -= body_path.stat().st_size
+            body_path.unlink(missing_ok=True)
+            body_path.with_suffix('.json').unlink(missing_ok=True)
+
+
+def cached_get(session, url, params=None, cache=None, limiter=None, ttl=None):
+    """GET que sirve del cache si esta fresco y revalida con GET condicional si no"""
+    if cache is None:
+        return get_with_retry(session, url, params=params, limiter=limiter)
+
+    key = cache.make_key(url, params)
+    entry = cache.get(key)
+    headers = {}
+
+    if entry is not None:
+        meta, body = entry
+        if cache.is_fresh(meta, ttl):
+            return CachedResponse(body, meta)
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+    response = get_with_retry(session, url, params=params, limiter=limiter, headers=headers)
+
+    if response.status_code == 304 and entry is not None:
+        cache.touch(key, meta)
+        return CachedResponse(body, meta)
+
+    if response.status_code == 200:
+        cache.put(key, response.content, {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')
+        })
+
+    return response
+
+
+def cached_frame(cache, name, params, producer, ttl=None):
+    """Cachea un DataFrame producido por un cliente sin HTTP directo (ej. pytrends)
+
+    Se guarda en Parquet: una lectura del cache trae los mismos tipos (fechas
+    incluidas) que la respuesta original.
+    """
+    if cache is None:
+        return producer()
+
+    key = cache.make_key(name, params)
+    entry = cache.get(key)
+    # Las entradas viejas en CSV no se usan: perderian los tipos
+    if entry is not None and entry[0].get('format') == 'parquet' and cache.is_fresh(entry[0], ttl):
+        return pd.read_parquet(io.BytesIO(entry[1]))
+
+    df = producer()
+    if df is not None and not df.empty:
+        buffer = io.BytesIO()
+        df.to_parquet(buffer, index=False)
+        cache.put(key, buffer.getvalue(), {'url': name, 'format': 'parquet'})
+    return df
@@ -0,0 +1,117 @@
+"""
+Cliente HTTP compartido - Sesion con pool, rate limiting y reintentos
+"""
+import random
+import threading
+import time
+
+from config import HTTP_MAX_RETRIES, HTTP_BACKOFF
+
+# Codigos que vale la pena reintentar
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Limitador de peticiones por segundo (token bucket, thread-safe)"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Bloquea hasta que haya un token disponible"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveRateLimiter:
+    """Intervalo minimo entre peticiones: se multiplica con cada 429 y se recupera con cada exito
+
+    Misma interfaz `acquire()` que TokenBucket, mas `success()` y
+    `throttled(retry_after)` para que el llamador informe el resultado.
+    """
+
+    def __init__(self, min_interval, max_interval=60.0, backoff=2.0, recovery=0.8):
+        self.min_interval = float(min_interval)
+        self.max_interval = float(max_interval)
+        self.backoff = backoff
+        self.recovery = recovery
+        self.interval = self.min_interval
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Bloquea hasta que toque la siguiente peticion"""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._next - now)
+            self._next = max(now, self._next) + self.interval
+        if wait:
+            time.sleep(wait)
+
+    def success(self):
+        with self._lock:
+            self.interval = max(self.min_interval, self.interval * self.recovery)
+
+    def throttled(self, retry_after=None):
+        """429: alarga el intervalo y pausa al menos `retry_after` segundos"""
+        with self._lock:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+            self._next = time.monotonic() + max(self.interval, retry_after or 0.0)
+
+
+def create_session(pool_size=10):
+    """Sesion con keep-alive y pool de conexiones del tamano indicado"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _retry_after(response):
+    """Segundos indicados por el header Retry-After (si es numerico)"""
+    try:
+        return float(response.headers.get('Retry-After', 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def get_with_retry(session, url, params=None, limiter=None, headers=None,
+                   retries=HTTP_MAX_RETRIES, backoff=HTTP_BACKOFF, timeout=10):
+    """GET con rate limiting y reintentos con backoff exponencial + jitter"""
+    import requests
+
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            limiter.acquire()
+
+        wait = 0.0
+        try:
+            response = session.get(url, params=params, headers=headers, timeout=timeout)
+            if response.status_code not in RETRY_STATUS:
+                return response
+            error = requests.HTTPError(f"HTTP {response.status_code}", response=response)
+            wait = _retry_after(response)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            error = e
+
+        if attempt == retries:
+            raise error
+
+        # Jitter completo: evita que los workers reintenten todos a la vez
+        time.sleep(max(wait, random.uniform(0, backoff * 2 ** attempt)))
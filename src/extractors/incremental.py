@@ -0,0 +1,91 @@
+"""
+Utilidades de extraccion incremental - solo se piden los datos faltantes
+"""
+import pandas as pd
+import numpy as np
+from datetime import timedelta
+
+
+def missing_keys(existing, wanted, key_cols, final_mask=None, checked_empty=None):
+    """Claves de `wanted` que no estan en `existing` o que aun no son finales
+
+    `checked_empty` son claves ya consultadas que la API devolvio vacias: no se
+    vuelven a pedir.
+    """
+    known = [] if existing is None or existing.empty else [
+        existing if final_mask is None else existing[final_mask]
+    ]
+    if checked_empty is not None and not checked_empty.empty:
+        known.append(checked_empty)
+    if not known:
+        return wanted
+
+    present = pd.concat([df[key_cols] for df in known], ignore_index=True).drop_duplicates()
+    merged = wanted.merge(present.astype(wanted.dtypes[key_cols].to_dict()), on=key_cols,
+                          how='left', indicator=True)
+    return merged.loc[merged['_merge'] == 'left_only', key_cols].reset_index(drop=True)
+
+
+def merge_incremental(existing, new, key_cols, sort_cols=None):
+    """Une lo existente con lo nuevo; ante duplicados gana el dato nuevo"""
+    frames = [df for df in (existing, new) if df is not None and not df.empty]
+    if not frames:
+        return pd.DataFrame()
+
+    df = pd.concat(frames, ignore_index=True).drop_duplicates(key_cols, keep='last')
+    return df.sort_values(sort_cols or key_cols, ignore_index=True)
+
+
+def trends_watermark(df_time):
+    """Ultima semana completa (no parcial) de la serie de Trends"""
+    if df_time is None or df_time.empty:
+        return None
+
+    final = df_time[~df_time['isPartial'].astype(bool)]
+    return pd.to_datetime(final['date']).max() if not final.empty else None
+
+
+def trends_delta_timeframe(watermark, overlap_weeks, today=None):
+    """Timeframe de pytrends que cubre solo el solape y las semanas nuevas"""
+    today = today or pd.Timestamp.now().normalize()
+    start = watermark - timedelta(weeks=overlap_weeks)
+    return f"{start:%Y-%m-%d} {today:%Y-%m-%d}"
+
+
+def _to_weekly(df, keyword):
+    """Agrupa datos diarios en semanas que empiezan en domingo (como Trends)"""
+    df = df.assign(date=pd.to_datetime(df['date'])).set_index('date').sort_index()
+    if len(df) < 2 or (df.index[1] - df.index[0]).days >= 7:
+        return df[[keyword, 'isPartial']]
+
+    last_day = df.index.max()
+    weekly = df[[keyword]].resample('W-SAT').mean()
+    partial = df['isPartial'].astype(bool).resample('W-SAT').max()
+    # Semana incompleta si termina despues del ultimo dia disponible
+    partial |= weekly.index > last_day
+    weekly['isPartial'] = partial
+    weekly.index = weekly.index - timedelta(days=6)
+    return weekly
+
+
+def stitch_trends(existing, new, keyword, watermark):
+    """Reescala la ventana nueva con las semanas solapadas y agrega solo las nuevas"""
+    old = existing.assign(date=pd.to_datetime(existing['date'])).set_index('date')
+    new = _to_weekly(new, keyword)
+
+    # Trends normaliza 0-100 dentro de cada ventana: se alinea con el solape
+    overlap = old.index.intersection(new.index[new.index <= watermark])
+    scale = 1.0
+    if len(overlap) and new.loc[overlap, keyword].mean() > 0:
+        scale = old.loc[overlap, keyword].mean() / new.loc[overlap, keyword].mean()
+
+    appended = new[new.index > watermark].copy()
+    appended[keyword] = np.round(appended[keyword] * scale).astype(int)
+
+    # Las semanas parciales anteriores se reemplazan por las nuevas
+    kept = old[old.index <= watermark]
+    df = pd.concat([kept, appended]).sort_index()
+    df.index.name = 'date'
+    df = df.reset_index()
+    df['date'] = df['date'].dt.strftime('%Y-%m-%d')
+    return df[['date', keyword, 'isPartial']]
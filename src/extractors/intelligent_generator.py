@@ -3,81 +3,162 @@ Generador inteligente basado en datos reales
 """
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import sys
-from pathlib import Path
+from datetime import datetime
 
-sys.path.append(str(Path(__file__).parent.parent.parent))
-from config import DATA_RAW, DATA_PROCESSED, TARGET_COUNTRIES
+from config import PIPELINE_SEED, STREAM_CHUNK_ROWS
+from src.pipeline.instrument import instrument
+from src.pipeline.memo import memoize_stage
+from src.schema import apply_schema
+from src.storage import (dataset_path, dataset_paths, iter_path, read_dataset, read_manifest, read_optional,
+                         write_chunks, write_dataset)
 
-def generate_current_data():
+# Datos base de llegadas a Cancun (estimados realistas)
+CANCUN_BASE = {
+    'United States': 3500000,
+    'Canada': 1200000,
+    'United Kingdom': 450000,
+    'Germany': 280000,
+    'France': 220000,
+    'Spain': 180000,
+    'Brazil': 320000,
+    'Argentina': 250000,
+    'Colombia': 190000,
+    'Mexico': 800000
+}
+
+YEARS = [2020, 2021, 2022, 2023, 2024, 2025, 2026]
+
+# Factores fijos (COVID y recuperacion); los demas anos crecen con la tendencia
+YEAR_FACTORS = {2020: 0.35, 2021: 0.60, 2022: 0.85, 2023: 1.0}
+
+
+def generate_panel(base, trends, years=YEARS, segments=None, seed=None):
+    """Panel origen x ano (x segmento) en una sola pasada vectorizada"""
+    base = pd.Series(base, dtype='float64')
+    years = np.asarray(years)
+    rng = np.random.default_rng(seed)
+
+    # Interes de Google Trends: una sola busqueda indexada para todos los paises
+    interest = trends.drop_duplicates('country').set_index('country')['interest'].reindex(base.index)
+    has_trend = interest.notna().to_numpy()
+    trend_factor = np.where(has_trend, interest.to_numpy() / 50, 1.0)
+
+    # Factores de crecimiento: tabla fija por ano, o crecimiento con tendencia
+    fixed = np.array([YEAR_FACTORS.get(year, np.nan) for year in years])
+    growth = 1.0 + (years - 2023)[None, :] * 0.08 * trend_factor[:, None]
+    factor = np.where(np.isnan(fixed)[None, :], growth, fixed[None, :])
+
+    # Segmentos: reparto de las llegadas segun su participacion
+    segments = segments or {}
+    shares = np.array(list(segments.values()) or [1.0])
+    n_countries, n_years, n_segments = len(base), len(years), len(shares)
+
+    # Un solo sorteo de ruido, en el mismo orden pais -> ano -> segmento
+    volume = base.to_numpy()[:, None, None] * factor[:, :, None]
+    if segments:
+        volume = volume * shares[None, None, :]
+    noise = rng.uniform(0.95, 1.05, size=(n_countries, n_years, n_segments))
+    arrivals = (volume * noise).astype('int64')
+
+    # Columnas repetidas como categorias (codigos enteros, sin copiar strings)
+    rows_per_country = n_years * n_segments
+    country_codes = np.repeat(np.arange(n_countries), rows_per_country)
+    df = pd.DataFrame({
+        'country': pd.Categorical.from_codes(country_codes, categories=base.index),
+        'year': np.tile(np.repeat(years, n_segments), n_countries)
+    })
+    if segments:
+        df['segment'] = pd.Categorical.from_codes(
+            np.tile(np.arange(n_segments), n_countries * n_years), categories=list(segments)
+        )
+    df['arrivals'] = arrivals.ravel()
+    df['trend_interest'] = np.repeat(interest.fillna(50).astype('int64').to_numpy(), rows_per_country)
+    df['source'] = pd.Categorical.from_codes(
+        np.where(has_trend, 0, 1)[country_codes], categories=['real_trends', 'estimated']
+    )
+
+    return apply_schema(df, 'tourism_complete')
+
+
+@memoize_stage(
+    "tourism_complete",
+    inputs=dataset_paths("trends_real", 'raw') + dataset_paths("worldbank_tourism_real", 'raw'),
+    outputs=dataset_paths("tourism_complete")
+)
+@instrument
+def generate_current_data(seed=PIPELINE_SEED):
     """Genera datos actuales basados en tendencias reales"""
     print("Generando datos actualizados...")
-    
+
     # Cargar datos reales
-    trends = pd.read_csv(DATA_RAW / "trends_real.csv")
-    
-    try:
-        tourism_real = pd.read_csv(DATA_RAW / "worldbank_tourism_real.csv")
-    except:
+    trends = read_dataset("trends_real", 'raw', columns=['country', 'interest'])
+    tourism_real = read_optional("worldbank_tourism_real", 'raw')
+    if tourism_real is None:
         tourism_real = pd.DataFrame()
-    
-    # Datos base de llegadas a Cancun (estimados realistas)
-    cancun_base = {
-        'United States': 3500000,
-        'Canada': 1200000,
-        'United Kingdom': 450000,
-        'Germany': 280000,
-        'France': 220000,
-        'Spain': 180000,
-        'Brazil': 320000,
-        'Argentina': 250000,
-        'Colombia': 190000,
-        'Mexico': 800000
-    }
-    
+
     # Generar datos 2020-2026
-    all_data = []
-    years = [2020, 2021, 2022, 2023, 2024, 2025, 2026]
-    
-    for country, base in cancun_base.items():
-        # Obtener interes de Google Trends
-        trend_interest = trends[trends['country'] == country]['interest'].values
-        trend_factor = (trend_interest[0] / 50) if len(trend_interest) > 0 else 1.0
-        
-        for year in years:
-            # Factores de crecimiento
-            if year == 2020:
-                factor = 0.35  # COVID
-            elif year == 2021:
-                factor = 0.60
-            elif year == 2022:
-                factor = 0.85
-            elif year == 2023:
-                factor = 1.0
-            else:
-                # 2024-2026: crecimiento con tendencias
-                factor = 1.0 + (year - 2023) * 0.08 * trend_factor
-            
-            arrivals = int(base * factor * np.random.uniform(0.95, 1.05))
-            
-            all_data.append({
-                'country': country,
-                'year': year,
-                'arrivals': arrivals,
-                'trend_interest': trend_interest[0] if len(trend_interest) > 0 else 50,
-                'source': 'real_trends' if len(trend_interest) > 0 else 'estimated',
-                'extracted_at': datetime.now()
-            })
-    
-    df = pd.DataFrame(all_data)
-    
+    df = generate_panel(CANCUN_BASE, trends, YEARS, seed=seed)
+
     # Guardar
-    df.to_csv(DATA_PROCESSED / "tourism_complete.csv", index=False)
-    print(f"Guardado: {DATA_PROCESSED / 'tourism_complete.csv'}")
-    print(f"Total: {len(df)} registros ({len(years)} anos, {len(cancun_base)} paises)")
-    
+    path = write_dataset(df, "tourism_complete", metadata={'extracted_at': datetime.now(), 'seed': seed})
+    print(f"Guardado: {path}")
+    print(f"Total: {len(df)} registros ({len(YEARS)} anos, {len(CANCUN_BASE)} paises)")
+
     return df
 
+
+def generate_panel_chunks(markets, years=YEARS, segments=None, seed=None):
+    """generate_panel por bloques de mercados (country, base_arrivals, interest)
+
+    Un solo generador aleatorio recorre todos los bloques en orden, asi el
+    resultado concatenado es identico al de generate_panel con todo junto.
+    """
+    rng = np.random.default_rng(seed)
+    for chunk in markets:
+        base = pd.Series(chunk['base_arrivals'].to_numpy(), index=chunk['country'].astype(str))
+        trends = pd.DataFrame({'country': base.index, 'interest': chunk['interest'].to_numpy()}).dropna()
+        yield generate_panel(base, trends, years, segments, seed=rng)
+
+
+def _default_markets():
+    """Mercados base (CANCUN_BASE) con el interes de Google Trends"""
+    trends = read_dataset("trends_real", 'raw', columns=['country', 'interest'])
+    interest = trends.drop_duplicates('country').set_index('country')['interest']
+    return pd.DataFrame({'country': list(CANCUN_BASE), 'base_arrivals': list(CANCUN_BASE.values()),
+                         'interest': interest.reindex(list(CANCUN_BASE)).to_numpy()})
+
+
+def _streamed(name):
+    return lambda: (dataset_path(name), read_manifest(name).get('rows'))
+
+
+@memoize_stage(
+    "tourism_complete_stream",
+    inputs=dataset_paths("trends_real", 'raw') + dataset_paths("worldbank_tourism_real", 'raw'),
+    outputs=dataset_paths("tourism_complete"),
+    load=_streamed("tourism_complete")
+)
+@instrument
+def stream_current_data(markets=None, chunk_rows=STREAM_CHUNK_ROWS, seed=PIPELINE_SEED):
+    """Como generate_current_data, pero por bloques: la memoria no depende del numero de mercados
+
+    `markets` es un archivo (Parquet/Feather/CSV) con country, base_arrivals
+    e interest; por defecto, CANCUN_BASE con el interes de trends_real.
+    Devuelve (ruta, filas) en lugar del DataFrame.
+    """
+    print("Generando datos actualizados por bloques...")
+
+    # chunk_rows acota las filas de salida: cada mercado genera una fila por ano
+    markets_per_chunk = max(1, chunk_rows // len(YEARS))
+    chunks = (iter_path(markets, ['country', 'base_arrivals', 'interest'], markets_per_chunk)
+              if markets is not None else [_default_markets()])
+
+    path, rows = write_chunks(generate_panel_chunks(chunks, YEARS, seed=seed), "tourism_complete",
+                              metadata={'extracted_at': datetime.now(), 'seed': seed})
+    print(f"Guardado: {path}")
+    print(f"Total: {rows} registros ({len(YEARS)} anos, {rows // len(YEARS)} paises)")
+
+    return path, rows
+
 if __name__ == "__main__":
-    generate_current_data()
\ No newline at end of file
+    generate_current_data()
@@ -1,53 +1,280 @@
 """
 Extractor de Google Trends - DATOS REALES
 """
-from pytrends.request import TrendReq
 import pandas as pd
-from datetime import datetime
-import sys
-from pathlib import Path
+from datetime import date
+import hashlib
+import json
+import random
+import re
+import shutil
 import time
+from pathlib import Path
+
+from config import (TRENDS_CACHE_TTL_SECONDS, TRENDS_OVERLAP_WEEKS, TRENDS_KEYWORDS,
+                    TRENDS_BATCH_SIZE, TRENDS_TIMEFRAMES, TRENDS_GEO_RESOLUTIONS, TRENDS_MIN_INTERVAL,
+                    TRENDS_MAX_INTERVAL, TRENDS_MAX_RETRIES, TRENDS_CHECKPOINT_DIR, TRENDS_CHECKPOINT_MAX_AGE_DAYS,
+                    HTTP_BACKOFF)
+from src.extractors.http_cache import ResponseCache, cached_frame
+from src.extractors.http_client import AdaptiveRateLimiter, _retry_after
+from src.extractors.incremental import trends_watermark, trends_delta_timeframe, stitch_trends
+from src.pipeline.instrument import instrument
+from src.storage import read_optional, write_dataset
+
+
+def default_client():
+    """Cliente pytrends real (se importa solo si hay que consultar a Google)"""
+    from pytrends.request import TrendReq
+    return TrendReq(hl='en-US', tz=360)
+
+
+def trends_limiter():
+    return AdaptiveRateLimiter(TRENDS_MIN_INTERVAL, TRENDS_MAX_INTERVAL)
 
-sys.path.append(str(Path(__file__).parent.parent.parent))
-from config import DATA_RAW, TARGET_COUNTRIES
 
-def extract_trends():
+def _is_rate_limited(error):
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None) == 429 or type(error).__name__ == 'TooManyRequestsError'
+
+
+def call_with_backoff(call, limiter, retries=TRENDS_MAX_RETRIES):
+    """Llama a Google respetando el limitador; 429 alarga el intervalo, otros errores reintentan con backoff"""
+    for attempt in range(retries + 1):
+        limiter.acquire()
+        try:
+            result = call()
+        except Exception as e:
+            if attempt == retries:
+                raise
+            if _is_rate_limited(e):
+                response = getattr(e, 'response', None)
+                limiter.throttled(_retry_after(response) if response is not None else None)
+                print(f"  429 de Google: intervalo {limiter.interval:.0f}s")
+            else:
+                time.sleep(random.uniform(0, HTTP_BACKOFF * 2 ** attempt))
+            continue
+        limiter.success()
+        return result
+
+
+@instrument
+def extract_trends(use_cache=True, incremental=False, client_factory=default_client, limiter=None):
     """Extrae tendencias REALES de Google"""
     print("Extrayendo Google Trends REAL...")
-    
-    pytrends = TrendReq(hl='en-US', tz=360)
-    
+
+    cache = ResponseCache(ttl=TRENDS_CACHE_TTL_SECONDS) if use_cache else None
+    limiter = limiter or trends_limiter()
+    params = {'kw_list': ['Cancun'], 'timeframe': 'today 12-m'}
+    clients = {}
+
+    def pytrends(timeframe):
+        # El cliente solo se crea (y consulta a Google) si el cache no alcanza
+        if timeframe not in clients:
+            client = client_factory()
+            client.build_payload(params['kw_list'], timeframe=timeframe)
+            clients[timeframe] = client
+        return clients[timeframe]
+
+    # Marca de agua: ultima semana completa ya guardada
+    existing_time = read_optional("trends_time_real", 'raw') if incremental else None
+    watermark = trends_watermark(existing_time)
+
     try:
-        # Build payload
-        pytrends.build_payload(['Cancun'], timeframe='today 12-m')
-        
         # Interes por region
-        df_region = pytrends.interest_by_region(resolution='COUNTRY', inc_low_vol=True)
-        df_region = df_region.reset_index()
+        df_region = cached_frame(
+            cache, 'pytrends/interest_by_region', params,
+            lambda: call_with_backoff(lambda: pytrends(params['timeframe']).interest_by_region(
+                resolution='COUNTRY', inc_low_vol=True), limiter).reset_index()
+        )
         df_region.columns = ['country', 'interest']
         df_region = df_region[df_region['interest'] > 0]
-        df_region['extracted_at'] = datetime.now()
-        
+
         print(f"Obtenidos datos de {len(df_region)} paises")
-        
+
         # Guardar
-        df_region.to_csv(DATA_RAW / "trends_real.csv", index=False)
-        print(f"Guardado: {DATA_RAW / 'trends_real.csv'}")
-        
-        time.sleep(2)
-        
-        # Tendencia temporal
-        df_time = pytrends.interest_over_time()
+        path = write_dataset(df_region, "trends_real", 'raw', metadata={'source': 'Google Trends', **params})
+        print(f"Guardado: {path}")
+
+        # Tendencia temporal (incremental: solo el solape y las semanas nuevas)
+        time_params = dict(params)
+        if watermark is not None:
+            time_params['timeframe'] = trends_delta_timeframe(watermark, TRENDS_OVERLAP_WEEKS)
+
+        df_time = cached_frame(
+            cache, 'pytrends/interest_over_time', time_params,
+            lambda: call_with_backoff(lambda: pytrends(time_params['timeframe']).interest_over_time(),
+                                      limiter).reset_index()
+        )
+        if watermark is not None and not df_time.empty:
+            df_time = stitch_trends(existing_time, df_time, params['kw_list'][0], watermark)
+            print(f"  Incremental desde {watermark:%Y-%m-%d}: {(pd.to_datetime(df_time['date']) > watermark).sum()} semanas nuevas")
+
         if not df_time.empty:
-            df_time = df_time.reset_index()
-            df_time.to_csv(DATA_RAW / "trends_time_real.csv", index=False)
-            print(f"Guardado: {DATA_RAW / 'trends_time_real.csv'}")
-        
+            path = write_dataset(df_time, "trends_time_real", 'raw', metadata={'source': 'Google Trends', **time_params})
+            print(f"Guardado: {path}")
+
         return df_region
-        
+
     except Exception as e:
         print(f"Error: {e}")
         return None
 
+
+def keyword_batches(keywords, size=TRENDS_BATCH_SIZE):
+    """Lotes de hasta `size` palabras; con mas de un lote, todos llevan la primera como ancla"""
+    keywords = list(keywords)
+    if len(keywords) <= size:
+        return [keywords]
+    anchor, rest = keywords[0], keywords[1:]
+    return [[anchor] + rest[i:i + size - 1] for i in range(0, len(rest), size - 1)]
+
+
+def plan_batches(keywords=TRENDS_KEYWORDS, timeframes=TRENDS_TIMEFRAMES, geo_resolutions=TRENDS_GEO_RESOLUTIONS,
+                 batch_size=TRENDS_BATCH_SIZE):
+    """Consultas a hacer: serie temporal por (periodo, geo) y por region por (periodo, geo, resolucion)"""
+    batches = keyword_batches(keywords, batch_size)
+    geos = list(dict.fromkeys(geo for geo, _ in geo_resolutions))
+    tasks = []
+    for timeframe in timeframes:
+        for index, kw_list in enumerate(batches):
+            tasks += [{'kind': 'time', 'timeframe': timeframe, 'geo': geo, 'resolution': None,
+                       'batch': index, 'kw_list': kw_list} for geo in geos]
+            tasks += [{'kind': 'region', 'timeframe': timeframe, 'geo': geo, 'resolution': resolution,
+                       'batch': index, 'kw_list': kw_list} for geo, resolution in geo_resolutions]
+    return tasks
+
+
+def _task_file(task):
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', f"{task['kind']}_{task['timeframe']}_{task['geo'] or 'world'}_"
+                                          f"{task['resolution'] or 'all'}_{task['batch']}")
+    return f"{slug.strip('_')}.parquet"
+
+
+def _run_age_days(run_dir, today):
+    """Dias desde que se creo el checkpoint (None si no se sabe)"""
+    try:
+        created = json.loads((run_dir / "run.json").read_text())['created']
+        return (today - date.fromisoformat(created)).days
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def open_run_dir(checkpoint_dir, plan_id, max_age_days=TRENDS_CHECKPOINT_MAX_AGE_DAYS):
+    """Checkpoint del plan (uno por plan, sin importar el dia); borra los vencidos o sin fecha"""
+    root = Path(checkpoint_dir)
+    root.mkdir(parents=True, exist_ok=True)
+    today = date.today()
+    for run in root.iterdir():
+        age = _run_age_days(run, today) if run.is_dir() else 0
+        if age is None or age >= max_age_days:
+            shutil.rmtree(run, ignore_errors=True)
+
+    run_dir = root / plan_id
+    run_dir.mkdir(exist_ok=True)
+    marker = run_dir / "run.json"
+    if not marker.exists():
+        marker.write_text(json.dumps({'created': today.isoformat()}))
+    return run_dir
+
+
+def _fetch_task(task, client_factory, limiter, cache):
+    """Una consulta -> formato largo (una fila por palabra clave)"""
+    params = {key: task[key] for key in ('kw_list', 'timeframe', 'geo', 'resolution')}
+
+    def query():
+        client = client_factory()
+        client.build_payload(task['kw_list'], timeframe=task['timeframe'], geo=task['geo'])
+        if task['kind'] == 'time':
+            return client.interest_over_time().reset_index()
+        return client.interest_by_region(resolution=task['resolution'], inc_low_vol=True).reset_index()
+
+    df = cached_frame(cache, f"pytrends/batch/{task['kind']}", params, lambda: call_with_backoff(query, limiter))
+    geo = task['geo'] or 'WORLD'
+    if task['kind'] == 'time':
+        df = df.rename(columns={df.columns[0]: 'date'}).melt(
+            id_vars=['date', 'isPartial'], value_vars=task['kw_list'], var_name='keyword', value_name='interest')
+        return df.assign(timeframe=task['timeframe'], geo=geo, batch=task['batch'])
+
+    df = df.rename(columns={df.columns[0]: 'region'}).melt(
+        id_vars=['region'], value_vars=task['kw_list'], var_name='keyword', value_name='interest')
+    return df.assign(timeframe=task['timeframe'], geo=geo, resolution=task['resolution'], batch=task['batch'])
+
+
+def rescale_to_anchor(df, anchor, group_cols):
+    """Lleva los lotes 1..n a la escala del lote 0 usando la palabra ancla (comun a todos)"""
+    if df.empty or df['batch'].nunique() <= 1:
+        return df.drop(columns='batch')
+    keys = group_cols + ['batch']
+    means = (df[df['keyword'] == anchor].groupby(keys, observed=True)['interest'].mean()
+             .rename('anchor').reset_index())
+    reference = means[means['batch'] == 0].drop(columns='batch').rename(columns={'anchor': 'reference'})
+    means = means.merge(reference, on=group_cols, how='left')
+    means['factor'] = (means['reference'] / means['anchor']).where(means['anchor'] > 0)
+    df = df.merge(means[keys + ['factor']], on=keys, how='left')
+    df['interest'] = df['interest'] * df['factor'].fillna(1.0)
+    # El ancla se conserva solo del lote 0
+    df = df[(df['keyword'] != anchor) | (df['batch'] == 0)]
+    return df.drop(columns=['factor', 'batch'])
+
+
+@instrument
+def extract_trends_batched(keywords=TRENDS_KEYWORDS, timeframes=TRENDS_TIMEFRAMES,
+                           geo_resolutions=TRENDS_GEO_RESOLUTIONS, client_factory=default_client,
+                           limiter=None, use_cache=True, checkpoint_dir=TRENDS_CHECKPOINT_DIR):
+    """Varias palabras clave x periodos x resoluciones, con checkpoint por lote
+
+    Cada consulta terminada se guarda en `checkpoint_dir`; si la corrida se
+    interrumpe o un lote falla, la siguiente con el mismo plan retoma solo lo
+    que falta (hasta TRENDS_CHECKPOINT_MAX_AGE_DAYS despues). El checkpoint
+    se borra al completar todo.
+    """
+    print("Extrayendo Google Trends por lotes...")
+    tasks = plan_batches(keywords, timeframes, geo_resolutions)
+    plan_id = hashlib.sha256(json.dumps(tasks, sort_keys=True).encode()).hexdigest()[:12]
+    run_dir = open_run_dir(checkpoint_dir, plan_id)
+
+    cache = ResponseCache(ttl=TRENDS_CACHE_TTL_SECONDS) if use_cache else None
+    limiter = limiter or trends_limiter()
+    frames = {'time': [], 'region': []}
+    resumed, failed = 0, []
+
+    for task in tasks:
+        path = run_dir / _task_file(task)
+        if path.exists():
+            resumed += 1
+        else:
+            try:
+                df = _fetch_task(task, client_factory, limiter, cache)
+            except Exception as e:
+                failed.append(path.stem)
+                print(f"  Lote {path.stem} fallo: {e}")
+                continue
+            tmp = path.with_suffix('.tmp')
+            df.to_parquet(tmp, index=False)
+            tmp.replace(path)
+        frames[task['kind']].append(pd.read_parquet(path))
+
+    print(f"  {len(tasks)} consultas: {resumed} retomadas del checkpoint, {len(failed)} fallidas")
+    if len(failed) == len(tasks):
+        raise RuntimeError(f"Todas las consultas a Google Trends fallaron (checkpoint en {run_dir})")
+
+    anchor = keyword_batches(keywords)[0][0]
+    results = {}
+    for kind, name, group_cols in [('time', "trends_keywords_time", ['timeframe', 'geo']),
+                                   ('region', "trends_keywords_region", ['timeframe', 'geo', 'resolution'])]:
+        if frames[kind]:
+            df = rescale_to_anchor(pd.concat(frames[kind], ignore_index=True), anchor, group_cols)
+            path = write_dataset(df, name, 'raw', metadata={'source': 'Google Trends', 'keywords': list(keywords),
+                                                            'complete': not failed})
+            print(f"Guardado: {path}")
+            results[kind] = df
+
+    if not failed:
+        shutil.rmtree(run_dir, ignore_errors=True)
+    else:
+        print(f"  Faltan {len(failed)} consultas: se retoman en la proxima corrida ({run_dir})")
+    return results.get('time'), results.get('region')
+
+
 if __name__ == "__main__":
-    extract_trends()
\ No newline at end of file
+    extract_trends()
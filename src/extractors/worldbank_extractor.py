@@ -1,67 +1,282 @@
 """
 Extractor de World Bank API - Turismo internacional REAL
 """
-import requests
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import sys
-from pathlib import Path
-import time
 
-sys.path.append(str(Path(__file__).parent.parent.parent))
-from config import DATA_RAW, TARGET_COUNTRIES
+from config import (WORLDBANK_API_URL, WORLDBANK_MAX_WORKERS, WORLDBANK_RATE_LIMIT, WORLDBANK_DATE_RANGE,
+                    WORLDBANK_SOURCE, WORLDBANK_PER_PAGE, WORLDBANK_BATCH_COUNTRIES,
+                    TOURISM_INDICATORS, WORLDBANK_PROVISIONAL_YEARS)
+from src.extractors.http_client import TokenBucket, create_session
+from src.extractors.http_cache import ResponseCache, cached_get
+from src.extractors.incremental import missing_keys, merge_incremental
+from src.pipeline.instrument import instrument
+from src.storage import read_manifest, read_optional, write_dataset
 
-def extract_tourism_data():
+# Codigos ISO de paises
+COUNTRY_CODES = {
+    'United States': 'USA', 'Canada': 'CAN',
+    'United Kingdom': 'GBR', 'Germany': 'DEU',
+    'France': 'FRA', 'Spain': 'ESP',
+    'Brazil': 'BRA', 'Argentina': 'ARG',
+    'Colombia': 'COL', 'Mexico': 'MEX'
+}
+
+ARRIVALS_COLUMNS = ['country', 'country_code', 'year', 'arrivals']
+INDICATOR_COLUMNS = ['country', 'country_code', 'indicator', 'indicator_name', 'year', 'value']
+INDICATOR_KEY = ['country_code', 'indicator', 'year']
+
+
+def cache_ttl(date_range):
+    """TTL del cache para una consulta: 0 (revalidar siempre) si incluye anos preliminares"""
+    end = int(str(date_range).split(':')[-1])
+    return 0 if end > datetime.now().year - WORLDBANK_PROVISIONAL_YEARS else None
+
+
+def _fetch_country(session, limiter, country, code, base_url, cache=None):
+    """Descarga las llegadas de un pais"""
+    url = f"{base_url}/country/{code}/indicator/ST.INT.ARVL"
+    params = {
+        'format': 'json',
+        'date': WORLDBANK_DATE_RANGE,
+        'per_page': 100
+    }
+
+    rows = []
+    try:
+        response = cached_get(session, url, params=params, cache=cache, limiter=limiter,
+                              ttl=cache_ttl(WORLDBANK_DATE_RANGE))
+
+        if response.status_code == 200:
+            data = response.json()
+
+            if len(data) > 1 and data[1]:
+                for entry in data[1]:
+                    if entry['value']:
+                        rows.append({
+                            'country': country,
+                            'country_code': code,
+                            'year': int(entry['date']),
+                            'arrivals': int(entry['value'])
+                        })
+
+        print(f"  {country}: OK")
+
+    except Exception as e:
+        print(f"  {country}: Error - {e}")
+
+    return rows
+
+
+def fetch_arrivals(country_codes=None, max_workers=WORLDBANK_MAX_WORKERS,
+                   rate_limit=WORLDBANK_RATE_LIMIT, base_url=WORLDBANK_API_URL, cache=None):
+    """Descarga llegadas de todos los paises en paralelo (max_workers=1 es secuencial)"""
+    country_codes = country_codes or COUNTRY_CODES
+    limiter = TokenBucket(rate_limit)
+
+    # Una sola sesion con keep-alive compartida por todos los workers
+    with create_session(pool_size=max_workers) as session, \
+            ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(
+            lambda item: _fetch_country(session, limiter, item[0], item[1], base_url, cache),
+            country_codes.items()
+        )
+        all_data = [row for rows in results for row in rows]
+
+    return pd.DataFrame(all_data, columns=ARRIVALS_COLUMNS)
+
+
+def iter_indicator_pages(session, limiter, codes, indicators, date_range=WORLDBANK_DATE_RANGE,
+                         base_url=WORLDBANK_API_URL, per_page=WORLDBANK_PER_PAGE, cache=None):
+    """Genera las entradas de cada pagina de una consulta batch (paises x indicadores)"""
+    url = f"{base_url}/country/{';'.join(codes)}/indicator/{';'.join(indicators)}"
+    params = {
+        'format': 'json',
+        'date': date_range,
+        'per_page': per_page
+    }
+    if len(indicators) > 1:
+        params['source'] = WORLDBANK_SOURCE
+
+    # Los anos preliminares cambian entre corridas: esas consultas no se sirven del cache sin revalidar
+    ttl = cache_ttl(date_range)
+    page, pages = 1, 1
+    while page <= pages:
+        response = cached_get(session, url, params={**params, 'page': page}, cache=cache, limiter=limiter,
+                              ttl=ttl)
+        response.raise_for_status()
+        data = response.json()
+
+        # Los errores de la API llegan como [{"message": [...]}]
+        if len(data) < 2:
+            raise ValueError(f"Respuesta invalida de World Bank: {data}")
+
+        pages = int(data[0].get('pages') or 1)
+        yield data[1] or []
+        page += 1
+
+
+def _entries_to_frame(entries, names):
+    """Convierte una pagina de la API al formato largo"""
+    rows = [
+        {
+            'country': names.get(entry['countryiso3code'], entry['country']['value']),
+            'country_code': entry['countryiso3code'],
+            'indicator': entry['indicator']['id'],
+            'indicator_name': TOURISM_INDICATORS.get(entry['indicator']['id'], entry['indicator']['id']),
+            'year': int(entry['date']),
+            'value': float(entry['value'])
+        }
+        for entry in entries if entry['value'] is not None
+    ]
+    return pd.DataFrame(rows, columns=INDICATOR_COLUMNS)
+
+
+def fetch_indicators(indicators=None, country_codes=None, date_range=WORLDBANK_DATE_RANGE,
+                     max_workers=WORLDBANK_MAX_WORKERS, rate_limit=WORLDBANK_RATE_LIMIT,
+                     base_url=WORLDBANK_API_URL, batch_size=WORLDBANK_BATCH_COUNTRIES,
+                     per_page=WORLDBANK_PER_PAGE, cache=None):
+    """Descarga varios indicadores para varios paises en pocas peticiones paginadas"""
+    indicators = list(indicators or TOURISM_INDICATORS)
+    country_codes = country_codes or COUNTRY_CODES
+    names = {code: country for country, code in country_codes.items()}
+    codes = list(names)
+    batches = [codes[i:i + batch_size] for i in range(0, len(codes), batch_size)]
+    limiter = TokenBucket(rate_limit)
+
+    def fetch_batch(batch):
+        pages = iter_indicator_pages(session, limiter, batch, indicators, date_range, base_url, per_page, cache)
+        return [_entries_to_frame(entries, names) for entries in pages]
+
+    with create_session(pool_size=max_workers) as session, \
+            ThreadPoolExecutor(max_workers=max_workers) as executor:
+        frames = [frame for batch_frames in executor.map(fetch_batch, batches) for frame in batch_frames]
+
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=INDICATOR_COLUMNS)
+    print(f"  {len(batches)} consultas batch, {len(df)} valores")
+    return df
+
+
+def _load_existing_indicators():
+    """Tabla larga existente; si no hay, se arma desde el CSV de llegadas"""
+    existing = read_optional("worldbank_indicators_real", 'raw')
+    if existing is not None:
+        return existing
+
+    arrivals = read_optional("worldbank_tourism_real", 'raw')
+    if arrivals is None:
+        return None
+    return arrivals.rename(columns={'arrivals': 'value'}).assign(
+        indicator='ST.INT.ARVL', indicator_name=TOURISM_INDICATORS['ST.INT.ARVL']
+    )[INDICATOR_COLUMNS]
+
+
+def _wanted_keys(indicators, country_codes, date_range):
+    """Todas las claves (pais, indicador, ano) de una consulta"""
+    start, end = map(int, date_range.split(':'))
+    return pd.MultiIndex.from_product(
+        [list(country_codes.values()), indicators, range(start, end + 1)], names=INDICATOR_KEY
+    ).to_frame(index=False)
+
+
+def _load_empty_keys():
+    """Claves ya consultadas que la API devolvio vacias (del manifiesto)"""
+    keys = read_manifest("worldbank_indicators_real", 'raw').get('empty_keys', [])
+    return pd.DataFrame(keys, columns=INDICATOR_KEY).astype({'year': 'int64'})
+
+
+def _final_years(df):
+    """Filas de anos ya definitivos (fuera de la ventana preliminar)"""
+    return df['year'] <= datetime.now().year - WORLDBANK_PROVISIONAL_YEARS
+
+
+def plan_incremental(existing, indicators, country_codes, date_range=WORLDBANK_DATE_RANGE, empty=None):
+    """Agrupa los (pais, indicador, ano) faltantes o preliminares en consultas batch
+
+    Las claves de `empty` (consultadas y sin valor) no se piden de nuevo salvo
+    que sean de anos preliminares, que todavia pueden publicarse.
+    """
+    wanted = _wanted_keys(indicators, country_codes, date_range)
+    final = _final_years(existing) if existing is not None else None
+    if empty is not None:
+        empty = empty[_final_years(empty)]
+    missing = missing_keys(existing, wanted, INDICATOR_KEY, final, empty)
+
+    # Paises con el mismo rango de anos faltantes comparten consulta
+    spans = missing.groupby('country_code').agg(
+        start=('year', 'min'), end=('year', 'max'), indicators=('indicator', lambda s: tuple(sorted(set(s))))
+    )
+    names = {code: country for country, code in country_codes.items()}
+    return [
+        ({names[code]: code for code in group.index}, list(inds), f"{first}:{last}")
+        for (first, last, inds), group in spans.groupby(['start', 'end', 'indicators'])
+    ]
+
+
+@instrument
+def extract_indicators(indicators=None, country_codes=None, max_workers=WORLDBANK_MAX_WORKERS,
+                       use_cache=True, incremental=False):
+    """Extrae todos los indicadores de turismo en formato largo"""
+    print("Extrayendo indicadores de World Bank API...")
+
+    indicators = list(indicators or TOURISM_INDICATORS)
+    country_codes = country_codes or COUNTRY_CODES
+    cache = ResponseCache() if use_cache else None
+
+    if incremental:
+        existing = _load_existing_indicators()
+        empty = _load_empty_keys()
+        plan = plan_incremental(existing, indicators, country_codes, empty=empty)
+        if not plan:
+            print("  Sin datos faltantes, no se consulta la API")
+            return existing
+
+        new = [
+            fetch_indicators(inds, codes, date_range, max_workers=max_workers, cache=cache)
+            for codes, inds, date_range in plan
+        ]
+        df = merge_incremental(existing, pd.concat(new, ignore_index=True), INDICATOR_KEY)
+        requested = [empty] + [_wanted_keys(inds, codes, date_range) for codes, inds, date_range in plan]
+    else:
+        df = fetch_indicators(indicators, country_codes, max_workers=max_workers, cache=cache)
+        requested = [_wanted_keys(indicators, country_codes, WORLDBANK_DATE_RANGE)]
+
+    # Lo pedido que sigue sin valor queda registrado para no repetir la consulta
+    empty = missing_keys(df, pd.concat(requested, ignore_index=True).drop_duplicates(), INDICATOR_KEY)
+    empty = empty.sort_values(INDICATOR_KEY)
+    metadata = {'source': 'World Bank API', 'empty_keys': [list(key) for key in empty.itertuples(index=False)]}
+
+    if not df.empty:
+        path = write_dataset(df, "worldbank_indicators_real", 'raw', metadata=metadata)
+        print(f"Guardado: {path}")
+        return df
+    else:
+        print("No se obtuvieron indicadores")
+        return None
+
+
+@instrument
+def extract_tourism_data(max_workers=WORLDBANK_MAX_WORKERS, batched=True, use_cache=True,
+                         incremental=False):
     """Extrae datos REALES de turismo internacional"""
     print("Extrayendo datos de World Bank API...")
-    
-    # Codigos ISO de paises
-    country_codes = {
-        'United States': 'USA', 'Canada': 'CAN', 
-        'United Kingdom': 'GBR', 'Germany': 'DEU',
-        'France': 'FRA', 'Spain': 'ESP', 
-        'Brazil': 'BRA', 'Argentina': 'ARG',
-        'Colombia': 'COL', 'Mexico': 'MEX'
-    }
-    
-    all_data = []
-    
+
     # Indicador: ST.INT.ARVL (Llegadas turisticas internacionales)
-    for country, code in country_codes.items():
-        url = f"https://api.worldbank.org/v2/country/{code}/indicator/ST.INT.ARVL"
-        params = {
-            'format': 'json',
-            'date': '2019:2023',
-            'per_page': 100
-        }
-        
-        try:
-            response = requests.get(url, params=params, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                if len(data) > 1 and data[1]:
-                    for entry in data[1]:
-                        if entry['value']:
-                            all_data.append({
-                                'country': country,
-                                'country_code': code,
-                                'year': int(entry['date']),
-                                'arrivals': int(entry['value']),
-                                'extracted_at': datetime.now()
-                            })
-            
-            time.sleep(0.5)
-            print(f"  {country}: OK")
-            
-        except Exception as e:
-            print(f"  {country}: Error - {e}")
-    
-    if all_data:
-        df = pd.DataFrame(all_data)
-        df.to_csv(DATA_RAW / "worldbank_tourism_real.csv", index=False)
-        print(f"\nGuardado: {DATA_RAW / 'worldbank_tourism_real.csv'}")
+    if batched or incremental:
+        # Todos los indicadores en una consulta; las llegadas salen de la tabla larga
+        indicators = extract_indicators(max_workers=max_workers, use_cache=use_cache,
+                                        incremental=incremental)
+        df = pd.DataFrame(columns=ARRIVALS_COLUMNS)
+        if indicators is not None:
+            df = indicators[indicators['indicator'] == 'ST.INT.ARVL'].rename(columns={'value': 'arrivals'})
+            df = df.astype({'arrivals': 'int64'})[ARRIVALS_COLUMNS]
+    else:
+        df = fetch_arrivals(max_workers=max_workers, cache=ResponseCache() if use_cache else None)
+
+    if not df.empty:
+        path = write_dataset(df, "worldbank_tourism_real", 'raw', metadata={'source': 'World Bank API'})
+        print(f"\nGuardado: {path}")
         print(f"Total registros: {len(df)}")
         return df
     else:
@@ -69,4 +284,4 @@ def extract_tourism_data():
         return None
 
 if __name__ == "__main__":
-    extract_tourism_data()
\ No newline at end of file
+    extract_tourism_data()
@@ -0,0 +1,3 @@
+"""
+Modelos de ocupacion, llegadas, portafolio y escenarios
+"""
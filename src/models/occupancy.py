@@ -0,0 +1,124 @@
+"""
+Motor vectorizado de ocupacion - tablas de temporada y dia de semana
+"""
+import pandas as pd
+import numpy as np
+from datetime import date
+
+# Tablas indexadas por mes (1-12; la posicion 0 no se usa)
+MONTH_NAMES = np.array(['', 'January', 'February', 'March', 'April', 'May', 'June', 'July',
+                        'August', 'September', 'October', 'November', 'December'])
+# Invierno alta, verano media, primavera 0.65, otono baja
+MONTHLY_BASE_OCC = np.array([np.nan, 0.82, 0.82, 0.82, 0.65, 0.65, 0.70, 0.70, 0.70, 0.55, 0.55, 0.55, 0.82])
+SEASON_BY_MONTH = np.array(['', 'Alta', 'Alta', 'Alta', 'Baja', 'Baja', 'Media', 'Media', 'Media',
+                            'Baja', 'Baja', 'Baja', 'Alta'])
+HIGH_SEASON_MONTHS = [12, 1, 2, 3, 6, 7, 8]
+DAILY_BASE_OCC = np.where(np.isin(np.arange(13), HIGH_SEASON_MONTHS), 0.75, 0.58)
+
+# Tablas indexadas por dia de semana (lunes=0)
+DAY_NAMES = np.array(['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'])
+WEEKEND_BOOST = np.array([0, 0, 0, 0, 0, 0.12, 0.12])
+
+# Rangos de ruido y limites
+MONTHLY_NOISE = (-0.03, 0.03)
+MONTHLY_CLIP = (0.40, 0.92)
+DAILY_NOISE = (-0.04, 0.06)
+DAILY_CLIP = (0.35, 0.93)
+ANNUAL_GROWTH = 0.02
+
+# Ajuste de ocupacion por zona y por segmento (puntos sobre la base de Cancun)
+ZONE_OCC_ADJ = {
+    'Hotel Zone': 0.04,
+    'Costa Mujeres': 0.02,
+    'Riviera Maya': 0.02,
+    'Playa del Carmen': 0.0,
+    'Tulum': 0.01,
+    'Isla Mujeres': -0.03,
+    'Downtown': -0.06
+}
+SEGMENT_OCC_ADJ = {
+    'all-inclusive': 0.05,
+    'luxury': -0.03,
+    'upscale': 0.0,
+    'midscale': 0.02,
+    'economy': 0.03
+}
+
+HORIZON_UNITS = {'D': 'days', 'W': 'weeks', 'M': 'months', 'Y': 'years'}
+
+
+def horizon_periods(start, horizon, freq):
+    """Numero de periodos ('D' o 'M'): entero, o texto tipo '5Y', '18M', '8W', '90D'"""
+    if isinstance(horizon, (int, np.integer)):
+        return int(horizon)
+
+    start = pd.Timestamp(start)
+    end = start + pd.DateOffset(**{HORIZON_UNITS[horizon[-1].upper()]: int(horizon[:-1])})
+    if freq == 'D':
+        return (end - start).days
+    return (end.year - start.year) * 12 + end.month - start.month
+
+
+def month_periods(start=None, horizon=12):
+    """Meses calendario consecutivos desde el mes de `start` (sin deriva de 30 dias)"""
+    start = pd.Timestamp(start or date.today())
+    return pd.period_range(start=start, periods=horizon_periods(start, horizon, 'M'), freq='M')
+
+
+def day_range(start=None, horizon=60):
+    start = pd.Timestamp(start or date.today()).normalize()
+    return pd.date_range(start=start, periods=horizon_periods(start, horizon, 'D'), freq='D')
+
+
+def monthly_base(periods):
+    """Ocupacion esperada por mes: estacionalidad + tendencia de crecimiento"""
+    offset = np.arange(len(periods))
+    return MONTHLY_BASE_OCC[periods.month.to_numpy()] + ANNUAL_GROWTH * offset / 12
+
+
+def daily_base(dates):
+    """Ocupacion esperada por dia: temporada + impulso de fin de semana"""
+    return DAILY_BASE_OCC[dates.month.to_numpy()] + WEEKEND_BOOST[dates.weekday.to_numpy()]
+
+
+def monthly_frame(periods, occupancy, rooms=300, avg_rate=150):
+    """Arma la tabla mensual a partir de un vector de ocupacion"""
+    month = periods.month.to_numpy()
+    days = periods.days_in_month.to_numpy()
+    return pd.DataFrame({
+        'year': periods.year.to_numpy(),
+        'month': month,
+        'month_name': MONTH_NAMES[month],
+        'occupancy': np.round(occupancy, 3),
+        'occupancy_percent': np.round(occupancy * 100, 1),
+        'estimated_revenue': (occupancy * rooms * avg_rate * days).astype('int64'),
+        'season': SEASON_BY_MONTH[month]
+    })
+
+
+def daily_frame(dates, occupancy):
+    """Arma la tabla diaria a partir de un vector de ocupacion"""
+    weekday = dates.weekday.to_numpy()
+    return pd.DataFrame({
+        'date': dates,
+        'occupancy_percent': np.round(occupancy * 100, 1),
+        'is_weekend': weekday >= 5,
+        'day_name': DAY_NAMES[weekday],
+        'week': np.arange(len(dates)) // 7 + 1
+    })
+
+
+def monthly_occupancy(start=None, horizon=12, rng=None, rooms=300, avg_rate=150):
+    """Ocupacion e ingresos mensuales para cualquier horizonte, en una pasada"""
+    rng = rng or np.random.default_rng()
+    periods = month_periods(start, horizon)
+    occupancy = np.clip(monthly_base(periods) + rng.uniform(*MONTHLY_NOISE, size=len(periods)), *MONTHLY_CLIP)
+    return monthly_frame(periods, occupancy, rooms, avg_rate)
+
+
+def daily_occupancy(start=None, horizon=60, rng=None):
+    """Ocupacion diaria para cualquier horizonte, en una pasada"""
+    rng = rng or np.random.default_rng()
+    dates = day_range(start, horizon)
+    occupancy = np.clip(daily_base(dates) + rng.uniform(*DAILY_NOISE, size=len(dates)), *DAILY_CLIP)
+    return daily_frame(dates, occupancy)
@@ -0,0 +1,139 @@
+"""
+Forecast de portafolio - ocupacion e ingresos por propiedad en paralelo
+"""
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+import os
+
+from config import PROPERTIES_FILE, PORTFOLIO_MAX_WORKERS, PIPELINE_SEED
+from src.pipeline.instrument import instrument
+from src.pipeline.memo import memoize_stage
+from src.schema import apply_schema
+from src.storage import read_dataset, read_path, write_partitioned, LAYERS
+from src.models.occupancy import (month_periods, day_range, SEASON_BY_MONTH, MONTHLY_NOISE, DAILY_NOISE,
+                                  ZONE_OCC_ADJ, SEGMENT_OCC_ADJ)
+from src.models.registry import model_digests
+from src.models.scoring import OccupancyScorer
+
+# Columna de tarifa segun la temporada del mes
+SEASON_RATE_COLUMNS = {'Alta': 'rate_alta', 'Media': 'rate_media', 'Baja': 'rate_baja'}
+
+
+def load_properties(properties=None):
+    """Tabla de propiedades: DataFrame, ruta a CSV/Parquet o el archivo por defecto"""
+    if isinstance(properties, pd.DataFrame):
+        return properties.reset_index(drop=True)
+    return read_path(properties or PROPERTIES_FILE).reset_index(drop=True)
+
+
+def _rate_matrix(props, seasons):
+    """Tarifa (propiedades x periodos) segun la temporada de cada periodo"""
+    rate_card = props[list(SEASON_RATE_COLUMNS.values())].to_numpy(dtype='float64')
+    season_index = pd.Index(list(SEASON_RATE_COLUMNS)).get_indexer(seasons)
+    return rate_card[:, season_index]
+
+
+def _forecast_chunk(args):
+    """Calcula un bloque de propiedades (se ejecuta en un proceso del pool)
+
+    La base de ocupacion sale del OccupancyScorer (modelo de demanda, o las
+    tablas heuristicas si no hay modelo); zona, segmento y ruido se suman encima.
+    """
+    props, seeds, scorer, start, months, days = args
+    periods = month_periods(start, months)
+    dates = day_range(start, days)
+
+    adjust = (props['zone'].astype(object).map(ZONE_OCC_ADJ).fillna(0).to_numpy(dtype='float64')
+              + props['segment'].astype(object).map(SEGMENT_OCC_ADJ).fillna(0).to_numpy(dtype='float64'))[:, None]
+    rooms = props['rooms'].to_numpy(dtype='float64')[:, None]
+
+    # Un Generator por propiedad: mismo resultado sin importar como se reparta el trabajo
+    rngs = [np.random.default_rng(seed) for seed in seeds]
+    monthly_noise = np.stack([rng.uniform(*MONTHLY_NOISE, size=len(periods)) for rng in rngs])
+    daily_noise = np.stack([rng.uniform(*DAILY_NOISE, size=len(dates)) for rng in rngs])
+
+    # Mensual
+    month_seasons = SEASON_BY_MONTH[periods.month.to_numpy()]
+    occ_m = scorer.monthly_occupancy(periods, adjust + monthly_noise)
+    rate_m = _rate_matrix(props, month_seasons)
+    sold_m = occ_m * rooms * periods.days_in_month.to_numpy()[None, :]
+
+    # Diario
+    day_seasons = SEASON_BY_MONTH[dates.month.to_numpy()]
+    occ_d = scorer.occupancy(dates, adjust + daily_noise)
+    rate_d = _rate_matrix(props, day_seasons)
+    sold_d = occ_d * rooms
+
+    n_props = len(props)
+    ids = {column: np.repeat(props[column].to_numpy(), len(periods)) for column in ['property_id', 'zone', 'segment']}
+    monthly = pd.DataFrame({
+        **ids,
+        'year': np.tile(periods.year.to_numpy(), n_props),
+        'month': np.tile(periods.month.to_numpy(), n_props),
+        'season': np.tile(month_seasons, n_props),
+        'occupancy': occ_m.ravel(),
+        'rate': rate_m.ravel(),
+        'rooms_sold': sold_m.ravel().astype('int64'),
+        'revenue': (sold_m * rate_m).ravel()
+    })
+
+    ids = {column: np.repeat(props[column].to_numpy(), len(dates)) for column in ['property_id', 'zone', 'segment']}
+    daily = pd.DataFrame({
+        **ids,
+        'date': np.tile(dates.to_numpy(), n_props),
+        'occupancy': occ_d.ravel(),
+        'rate': rate_d.ravel(),
+        'rooms_sold': sold_d.ravel().astype('int64'),
+        'revenue': (sold_d * rate_d).ravel()
+    })
+    return monthly, daily
+
+
+@memoize_stage(
+    "portfolio",
+    inputs=[PROPERTIES_FILE],
+    outputs=[LAYERS['processed'] / "portfolio_monthly", LAYERS['processed'] / "portfolio_daily"],
+    volatile=lambda: {'as_of': pd.Timestamp.today().date().isoformat(), 'models': model_digests("demand")},
+    load=lambda: (read_dataset("portfolio_monthly"), read_dataset("portfolio_daily"))
+)
+@instrument
+def forecast_portfolio(properties=None, months=12, days=60, seed=PIPELINE_SEED,
+                       start=None, max_workers=PORTFOLIO_MAX_WORKERS):
+    """Ocupacion e ingresos mensuales y diarios para todas las propiedades"""
+    print("Generando forecast del portafolio...")
+
+    props = load_properties(properties)
+    scorer = OccupancyScorer()
+    seeds = np.random.SeedSequence(seed).spawn(len(props))
+    max_workers = max_workers or os.cpu_count() or 1
+
+    # Bloques de propiedades: pocos y grandes, para amortizar el costo del pool
+    n_chunks = min(len(props), max_workers * 4)
+    chunks = [
+        (props.iloc[idx], [seeds[i] for i in idx], scorer, start, months, days)
+        for idx in np.array_split(np.arange(len(props)), n_chunks)
+    ]
+
+    if max_workers == 1 or n_chunks == 1:
+        results = [_forecast_chunk(chunk) for chunk in chunks]
+    else:
+        # spawn: la etapa puede correr en un hilo del DAG y fork copiaria locks tomados por otros hilos
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=get_context('spawn')) as executor:
+            results = list(executor.map(_forecast_chunk, chunks))
+
+    monthly = apply_schema(pd.concat([r[0] for r in results], ignore_index=True), 'portfolio_monthly')
+    daily = apply_schema(pd.concat([r[1] for r in results], ignore_index=True), 'portfolio_daily')
+
+    meta = {'properties': len(props), 'seed': seed, 'months': months, 'days': days}
+    write_partitioned(monthly, "portfolio_monthly", ['zone'], metadata=meta)
+    path = write_partitioned(daily, "portfolio_daily", ['zone'], metadata=meta)
+    print(f"Guardado: {path.parent / 'portfolio_monthly'} y {path}")
+    print(f"Total: {len(props)} propiedades, {len(monthly)} filas mensuales, {len(daily)} diarias")
+
+    return monthly, daily
+
+
+if __name__ == "__main__":
+    forecast_portfolio()
@@ -3,136 +3,227 @@ Modelo predictivo mejorado - Predicciones mensuales
 """
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import sys
-from pathlib import Path
+from datetime import date
 
-sys.path.append(str(Path(__file__).parent.parent.parent))
-from config import DATA_PROCESSED, MODELS_DIR
+from config import PIPELINE_SEED, STREAM_CHUNK_ROWS
+from src.pipeline.instrument import instrument
+from src.pipeline.memo import memoize_stage
+from src.storage import (dataset_path, dataset_paths, iter_country_groups, iter_dataset, read_dataset, read_manifest,
+                         write_chunks, write_dataset)
+from src.models.occupancy import (monthly_occupancy, daily_occupancy, month_periods, day_range,
+                                  monthly_frame, daily_frame, MONTHLY_CLIP, DAILY_CLIP, WEEKEND_BOOST)
+from src.models.registry import iter_table, load_model, model_digests, model_entry
+from src.models.training import seasonal_features, train_models, TRAIN_FROM_YEAR
 
-def predict_occupancy_monthly():
-    """Predice ocupacion por mes (12 meses futuros)"""
+
+def _today():
+    """Las predicciones dependen de la fecha de corrida"""
+    return {'as_of': date.today().isoformat()}
+
+
+def _demand_context():
+    """Fecha de corrida y contenido del modelo de demanda (no su fecha de entrenamiento ni su version)"""
+    return {**_today(), 'models': model_digests("demand")}
+
+
+def _arrivals_context():
+    return {'models': model_digests("arrivals")}
+
+
+def demand_occupancy(dates):
+    """Ocupacion esperada segun el modelo de demanda (None si no hay modelo)"""
+    model, entry = load_model("demand")
+    if model is None:
+        return None
+    return model.predict(seasonal_features(dates, entry['origin']))
+
+
+def arrivals_growth(countries):
+    """Crecimiento anual por pais segun el modelo de llegadas (NaN si no lo conoce)"""
+    model, _ = load_model("arrivals")
+    countries = pd.Index(countries).astype(str)
+    if model is None:
+        return np.full(len(countries), np.nan)
+    # El modelo es una tabla de nivel y pendiente log-lineal por pais: basta un cruce
+    return np.exp(model['slope'].reindex(countries).to_numpy()) - 1
+
+@memoize_stage(
+    "occupancy_monthly",
+    outputs=dataset_paths("occupancy_monthly"),
+    volatile=_demand_context
+)
+@instrument
+def predict_occupancy_monthly(seed=PIPELINE_SEED, horizon=12, start=None, rooms=300, avg_rate=150):
+    """Predice ocupacion por mes (12 meses futuros por defecto)"""
     print("Generando predicciones mensuales...")
     
-    # Cargar datos
-    df = pd.read_csv(DATA_PROCESSED / "tourism_complete.csv")
-    
-    # Datos recientes
-    df_recent = df[df['year'].isin([2024, 2025, 2026])]
-    
-    # Predicciones mensuales
-    predictions = []
-    current_date = datetime.now()
+    # Meses calendario reales desde el mes actual, todo en una pasada
+    periods = month_periods(start, horizon)
+    occupancy = demand_occupancy(periods.to_timestamp() + pd.Timedelta(days=14))
+    if occupancy is not None:
+        df_pred = monthly_frame(periods, np.clip(occupancy, *MONTHLY_CLIP), rooms, avg_rate)
+    else:
+        # Sin modelo entrenado: motor heuristico
+        rng = np.random.default_rng(seed)
+        df_pred = monthly_occupancy(start, horizon, rng, rooms, avg_rate)
     
-    for month_offset in range(12):
-        target_date = current_date + timedelta(days=30*month_offset)
-        month = target_date.month
-        year = target_date.year
-        
-        # Estacionalidad
-        if month in [12, 1, 2, 3]:  # Invierno - temporada alta
-            base_occ = 0.82
-        elif month in [6, 7, 8]:  # Verano - temporada media
-            base_occ = 0.70
-        elif month in [4, 5]:  # Primavera
-            base_occ = 0.65
-        else:  # Otono - temporada baja
-            base_occ = 0.55
-        
-        # Tendencia de crecimiento
-        growth = 0.02 * month_offset / 12
-        
-        occupancy = base_occ + growth + np.random.uniform(-0.03, 0.03)
-        occupancy = np.clip(occupancy, 0.40, 0.92)
-        
-        # Calcular ingresos estimados
-        avg_rate = 150  # USD por noche promedio
-        rooms = 300  # Habitaciones del hotel
-        days = 30
-        
-        revenue = occupancy * rooms * avg_rate * days
-        
-        predictions.append({
-            'year': year,
-            'month': month,
-            'month_name': target_date.strftime('%B'),
-            'occupancy': round(occupancy, 3),
-            'occupancy_percent': round(occupancy * 100, 1),
-            'estimated_revenue': int(revenue),
-            'season': 'Alta' if month in [12,1,2,3] else 'Media' if month in [6,7,8] else 'Baja'
-        })
-    
-    df_pred = pd.DataFrame(predictions)
-    df_pred.to_csv(DATA_PROCESSED / "occupancy_monthly.csv", index=False)
-    print(f"Guardado: {DATA_PROCESSED / 'occupancy_monthly.csv'}")
+    path = write_dataset(df_pred, "occupancy_monthly")
+    print(f"Guardado: {path}")
     
     return df_pred
 
-def predict_daily_next_month():
-    """Predicciones diarias del proximo mes"""
+@memoize_stage(
+    "occupancy_daily",
+    outputs=dataset_paths("occupancy_daily"),
+    volatile=_demand_context
+)
+@instrument
+def predict_daily_next_month(seed=PIPELINE_SEED, horizon=60, start=None):
+    """Predicciones diarias (60 dias por defecto; acepta '5Y', '18M'...)"""
     print("Generando predicciones diarias...")
     
-    predictions = []
-    base_date = datetime.now()
-    
-    for i in range(60):  # 60 dias
-        date = base_date + timedelta(days=i)
-        
-        is_weekend = date.weekday() >= 5
-        month = date.month
-        high_season = month in [12, 1, 2, 3, 6, 7, 8]
-        
-        base_occ = 0.75 if high_season else 0.58
-        weekend_boost = 0.12 if is_weekend else 0
-        variation = np.random.uniform(-0.04, 0.06)
-        
-        occupancy = base_occ + weekend_boost + variation
-        occupancy = np.clip(occupancy, 0.35, 0.93)
-        
-        predictions.append({
-            'date': date.date(),
-            'occupancy_percent': round(occupancy * 100, 1),
-            'is_weekend': is_weekend,
-            'day_name': date.strftime('%A'),
-            'week': i // 7 + 1
-        })
+    dates = day_range(start, horizon)
+    occupancy = demand_occupancy(dates)
+    if occupancy is not None:
+        # Trends es semanal: el fin de semana se reparte sin cambiar la media
+        weekend = WEEKEND_BOOST[dates.weekday.to_numpy()] - WEEKEND_BOOST.mean()
+        df_daily = daily_frame(dates, np.clip(occupancy + weekend, *DAILY_CLIP))
+    else:
+        rng = np.random.default_rng(seed)
+        df_daily = daily_occupancy(start, horizon, rng)
     
-    df_daily = pd.DataFrame(predictions)
-    df_daily.to_csv(DATA_PROCESSED / "occupancy_daily.csv", index=False)
-    print(f"Guardado: {DATA_PROCESSED / 'occupancy_daily.csv'}")
+    path = write_dataset(df_daily, "occupancy_daily")
+    print(f"Guardado: {path}")
     
     return df_daily
 
-def forecast_arrivals_by_country():
-    """Forecast de llegadas por pais"""
+def country_growth(history, learned=None):
+    """Crecimiento anual y su dispersion (log) por pais: modelo entrenado o historia
+
+    `learned` (crecimiento del modelo por pais) evita cargar la tabla entera al procesar por bloques.
+    """
+    recent = history[history['year'] >= TRAIN_FROM_YEAR].sort_values(['country', 'year'])
+    countries = recent['country'].astype(str).to_numpy()
+
+    # Variacion anual en log dentro de cada pais, agregada por grupo sin bucles
+    log_arrivals = pd.Series(np.log(recent['arrivals'].to_numpy(dtype='float64')))
+    yoy = log_arrivals.groupby(countries).diff()
+    stats = yoy.groupby(countries).agg(['mean', 'std'])
+
+    learned = arrivals_growth(stats.index) if learned is None else learned.reindex(stats.index).to_numpy()
+    from_model = ~np.isnan(learned)
+    model_sd = (model_entry("arrivals") or {}).get('resid_std') or 0.0
+    return pd.DataFrame({
+        'growth': np.where(from_model, learned, np.exp(stats['mean'].fillna(0)) - 1),
+        'sd': np.where(from_model, model_sd, stats['std'].fillna(0)),
+        'source': np.where(from_model, 'model', 'history')
+    }, index=stats.index)
+
+
+def project_arrivals(history, horizon=3, base_year=None, learned=None):
+    """Proyeccion a `horizon` anos de todos los paises en una sola operacion (formato largo)"""
+    base_year = base_year or int(history['year'].max())
+    base = history[history['year'] == base_year].drop_duplicates('country')
+    countries = base['country'].astype(str).to_numpy()
+    growth = country_growth(history, learned).reindex(countries)
+
+    # paises x anos: llegadas_base * (1 + g) ** k
+    steps = np.arange(1, horizon + 1)
+    rate = growth['growth'].fillna(0).to_numpy()
+    arrivals = base['arrivals'].to_numpy(dtype='float64')[:, None] * (1 + rate[:, None]) ** steps[None, :]
+
+    return pd.DataFrame({
+        'country': np.repeat(countries, horizon),
+        'year': np.tile(base_year + steps, len(countries)),
+        'base_arrivals': np.repeat(base['arrivals'].to_numpy(), horizon),
+        'arrivals': arrivals.ravel().astype('int64'),
+        'growth_rate': np.repeat(np.round(rate * 100, 1), horizon),
+        'trend_interest': np.repeat(base['trend_interest'].to_numpy(), horizon),
+        'source': np.repeat(growth['source'].fillna('history').to_numpy(), horizon)
+    })
+
+@memoize_stage(
+    "arrivals_forecast",
+    inputs=dataset_paths("tourism_complete"),
+    outputs=dataset_paths("arrivals_forecast"),
+    volatile=_arrivals_context
+)
+@instrument
+def forecast_arrivals_by_country(horizon=3, base_year=None):
+    """Forecast de llegadas por pais (N anos despues del ultimo ano con datos)"""
     print("Generando forecast por pais...")
     
-    df = pd.read_csv(DATA_PROCESSED / "tourism_complete.csv")
-    
-    # Proyeccion 2027
-    df_2026 = df[df['year'] == 2026]
+    history = read_dataset("tourism_complete", columns=['country', 'year', 'arrivals', 'trend_interest'])
+    df_forecast = project_arrivals(history, horizon, base_year)
     
-    forecasts = []
-    for _, row in df_2026.iterrows():
-        growth_rate = 0.08 + np.random.uniform(-0.02, 0.04)
-        
-        forecast_2027 = int(row['arrivals'] * (1 + growth_rate))
-        
-        forecasts.append({
-            'country': row['country'],
-            'arrivals_2026': row['arrivals'],
-            'arrivals_2027_forecast': forecast_2027,
-            'growth_rate': round(growth_rate * 100, 1),
-            'trend_interest': row['trend_interest']
-        })
-    
-    df_forecast = pd.DataFrame(forecasts)
-    df_forecast.to_csv(DATA_PROCESSED / "arrivals_forecast_2027.csv", index=False)
-    print(f"Guardado: {DATA_PROCESSED / 'arrivals_forecast_2027.csv'}")
+    path = write_dataset(df_forecast, "arrivals_forecast")
+    print(f"Guardado: {path}")
+    print(f"Total: {df_forecast['country'].nunique()} paises x {horizon} anos")
     
     return df_forecast
 
+
+def _next_rows(chunks):
+    """Funcion que entrega las siguientes `k` filas de una secuencia de bloques"""
+    buffer = [pd.DataFrame()]
+
+    def take(k):
+        while len(buffer[0]) < k:
+            chunk = next(chunks, None)
+            if chunk is None:
+                break
+            buffer[0] = pd.concat([buffer[0], chunk], ignore_index=True)
+        rows, buffer[0] = buffer[0].iloc[:k], buffer[0].iloc[k:]
+        return rows
+    return take
+
+
+@memoize_stage(
+    "arrivals_forecast_stream",
+    inputs=dataset_paths("tourism_complete"),
+    outputs=dataset_paths("arrivals_forecast"),
+    volatile=_arrivals_context,
+    load=lambda: (dataset_path("arrivals_forecast"), read_manifest("arrivals_forecast").get('rows'))
+)
+@instrument
+def stream_arrivals_forecast(horizon=3, base_year=None, chunk_rows=STREAM_CHUNK_ROWS):
+    """Como forecast_arrivals_by_country, leyendo tourism_complete por bloques de paises completos
+
+    El resultado es el mismo; se escribe bloque a bloque y se devuelve (ruta, filas).
+    """
+    print("Generando forecast por pais por bloques...")
+
+    columns = ['country', 'year', 'arrivals', 'trend_interest']
+    if base_year is None:
+        # Primera pasada (solo la columna year) para fijar el mismo ano base en todos los bloques
+        base_year = max(int(chunk['year'].max()) for chunk in iter_dataset("tourism_complete", columns=['year'],
+                                                                           chunk_rows=chunk_rows))
+
+    groups = iter_country_groups(iter_dataset("tourism_complete", columns=columns, chunk_rows=chunk_rows))
+    coefficients = iter_table("arrivals", chunk_rows)
+    take = _next_rows(coefficients) if coefficients is not None else None
+
+    def forecasts():
+        for history in groups:
+            learned = None
+            if take is not None:
+                # El modelo se guardo en el mismo orden de paises: se avanza a la par
+                countries = pd.unique(history['country'].astype(str).to_numpy())
+                coefs = take(len(countries))
+                names = coefs['country'].astype(str).to_numpy() if len(coefs) else None
+                if names is None or not np.array_equal(names, countries):
+                    raise ValueError("El modelo de llegadas no corresponde a tourism_complete: reentrenar")
+                learned = pd.Series(np.exp(coefs['slope'].to_numpy()) - 1, index=countries)
+            yield project_arrivals(history, horizon, base_year, learned)
+
+    path, rows = write_chunks(forecasts(), "arrivals_forecast")
+    print(f"Guardado: {path}")
+    print(f"Total: {rows // horizon} paises x {horizon} anos")
+
+    return path, rows
+
 if __name__ == "__main__":
+    train_models()
     predict_occupancy_monthly()
     predict_daily_next_month()
     forecast_arrivals_by_country()
\ No newline at end of file
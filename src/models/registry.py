@@ -0,0 +1,147 @@
+"""
+Registro de modelos - artefactos joblib (o tablas Parquet) versionados en MODELS_DIR
+"""
+import hashlib
+import json
+from datetime import datetime
+
+from config import MODELS_DIR
+
+REGISTRY_FILE = MODELS_DIR / "registry.json"
+KEEP_VERSIONS = 3
+
+# Modelos ya deserializados, por (nombre, version)
+_loaded = {}
+
+
+def load_registry():
+    """Manifiesto de modelos: {nombre: {'current': version, 'versions': [...]}}"""
+    try:
+        return json.loads(REGISTRY_FILE.read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_model(name, model, metadata=None):
+    """Serializa el modelo como una version nueva y la marca como vigente
+
+    Si el modelo es identico al vigente (mismo digest) no se crea version:
+    el registro no cambia y las etapas que lo usan siguen al dia.
+    """
+    import joblib
+
+    def write(tmp):
+        joblib.dump(model, tmp)
+        return hashlib.sha256(tmp.read_bytes()).hexdigest()
+    return _register(name, '.joblib', write, metadata)
+
+
+def save_table(name, blocks, metadata=None):
+    """Guarda un modelo tabular (una fila por clave, la clave primero) bloque a bloque en Parquet
+
+    `blocks` puede ser un generador: la tabla no se junta en memoria. El
+    digest es del contenido, asi no depende de como se partio en bloques;
+    `metadata` puede ser una funcion, que se evalua al terminar los bloques.
+    """
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    def write(tmp):
+        h = hashlib.sha256()
+        writer = None
+        try:
+            for block in blocks:
+                h.update(pd.util.hash_pandas_object(block, index=False).to_numpy().tobytes())
+                table = pa.Table.from_pandas(block, schema=writer.schema if writer else None, preserve_index=False)
+                writer = writer or pq.ParquetWriter(tmp, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        if writer is None:
+            raise ValueError(f"{name}: tabla vacia")
+        return h.hexdigest()
+    return _register(name, '.parquet', write, metadata)
+
+
+def _register(name, suffix, write, metadata):
+    """Escribe el artefacto con `write(tmp)` (devuelve su digest) y lo registra como version vigente"""
+    MODELS_DIR.mkdir(parents=True, exist_ok=True)
+    registry = load_registry()
+    entry = registry.setdefault(name, {'current': None, 'versions': []})
+    version = max((v['version'] for v in entry['versions']), default=0) + 1
+
+    filename = f"{name}-v{version}{suffix}"
+    tmp = MODELS_DIR / f"{filename}.tmp"
+    digest = write(tmp)
+    metadata = metadata() if callable(metadata) else metadata
+
+    current = model_entry(name)
+    if current and current.get('digest') == digest and (MODELS_DIR / current['file']).exists():
+        tmp.unlink()
+        return current['version']
+    tmp.replace(MODELS_DIR / filename)
+
+    entry['versions'].append({
+        'version': version,
+        'file': filename,
+        'digest': digest,
+        'trained_at': datetime.now().isoformat(timespec='seconds'),
+        **(metadata or {})
+    })
+    entry['current'] = version
+
+    # Solo se conservan las ultimas versiones
+    for old in entry['versions'][:-KEEP_VERSIONS]:
+        (MODELS_DIR / old['file']).unlink(missing_ok=True)
+    entry['versions'] = entry['versions'][-KEEP_VERSIONS:]
+
+    REGISTRY_FILE.write_text(json.dumps(registry, indent=2, default=str))
+    return version
+
+
+def model_entry(name, version=None):
+    """Metadatos de una version (la vigente por defecto); None si no existe"""
+    entry = load_registry().get(name)
+    if not entry:
+        return None
+    version = version or entry['current']
+    return next((v for v in entry['versions'] if v['version'] == version), None)
+
+
+def model_digests(*names):
+    """Digest del contenido de los modelos vigentes (sin fechas ni numeros de version)"""
+    return {name: (model_entry(name) or {}).get('digest') for name in names}
+
+
+def load_model(name, version=None):
+    """(modelo, metadatos) de la version pedida; se deserializa una sola vez
+
+    Los modelos tabulares se devuelven como DataFrame indexado por su clave.
+    """
+    entry = model_entry(name, version)
+    if entry is None or not (MODELS_DIR / entry['file']).exists():
+        return None, None
+    key = (name, entry['version'])
+    if key not in _loaded:
+        path = MODELS_DIR / entry['file']
+        if path.suffix == '.parquet':
+            import pandas as pd
+            table = pd.read_parquet(path)
+            _loaded[key] = table.set_index(table.columns[0])
+        else:
+            import joblib  # Trae sklearn al deserializar: solo cuando hay modelo
+            _loaded[key] = joblib.load(path)
+    return _loaded[key], entry
+
+
+def iter_table(name, chunk_rows):
+    """Bloques del modelo tabular vigente, en el orden en que se guardo (None si no hay)"""
+    entry = model_entry(name)
+    if entry is None or not entry['file'].endswith('.parquet') or not (MODELS_DIR / entry['file']).exists():
+        return None
+    import pyarrow.parquet as pq
+
+    batches = pq.ParquetFile(MODELS_DIR / entry['file'], pre_buffer=False).iter_batches(batch_size=chunk_rows)
+    return (batch.to_pandas() for batch in batches)
@@ -0,0 +1,159 @@
+"""
+Motor de escenarios Monte Carlo - bandas P10/P50/P90 por bloques de trayectorias
+"""
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+import os
+
+from config import PIPELINE_SEED, SCENARIO_PATHS, SCENARIO_CHUNK_MB, SCENARIO_MAX_WORKERS
+from src.pipeline.instrument import instrument
+from src.pipeline.memo import memoize_stage
+from src.storage import dataset_paths, read_dataset, write_dataset
+from src.models.occupancy import (month_periods, day_range, monthly_base, daily_base, SEASON_BY_MONTH,
+                                  MONTHLY_NOISE, MONTHLY_CLIP, DAILY_NOISE, DAILY_CLIP, WEEKEND_BOOST)
+from src.models.predictor import demand_occupancy, country_growth, project_arrivals
+from src.models.registry import model_digests, model_entry
+
+QUANTILES = (0.10, 0.50, 0.90)
+BAND_LABELS = [f"p{round(q * 100)}" for q in QUANTILES]
+
+
+def _band_chunk(args):
+    """Simula un bloque del horizonte y devuelve sus cuantiles (cuantiles x bloque)"""
+    center, scale, noise, clip, n_paths, seed, quantiles = args
+    rng = np.random.default_rng(seed)
+    kind, a, b = noise
+    # Horizonte x trayectorias: cada cuantil se calcula sobre memoria contigua
+    size = (len(center), n_paths)
+    values = rng.normal(a, b, size=size) if kind == 'normal' else rng.uniform(a, b, size=size)
+    values *= scale[:, None]
+    values += center[:, None]
+    if clip is not None:
+        np.clip(values, *clip, out=values)
+    # Sin copia: la matriz es nuestra y el bloque ocupa a lo mas `chunk_mb`
+    return np.quantile(values, quantiles, axis=1, overwrite_input=True)
+
+
+def simulate_bands(center, noise, scale=1.0, n_paths=SCENARIO_PATHS, seed=PIPELINE_SEED, clip=None,
+                   quantiles=QUANTILES, max_workers=1, chunk_mb=SCENARIO_CHUNK_MB):
+    """Cuantiles (cuantiles x horizonte) de `n_paths` trayectorias center + scale * ruido
+
+    `noise` es ('normal', media, sd) o ('uniform', bajo, alto). El horizonte se
+    parte en bloques para que cada matriz bloque x trayectorias ocupe a lo
+    mas `chunk_mb` (al menos un periodo por bloque); cada bloque tiene su
+    propia semilla derivada, asi que el resultado no depende del numero de
+    procesos. Cada proceso tiene un bloque a la vez: el pico de memoria es
+    ~ max_workers x chunk_mb (max_workers=None usa todos los nucleos).
+    """
+    center = np.atleast_1d(np.asarray(center, dtype='float64'))
+    scale = np.broadcast_to(np.asarray(scale, dtype='float64'), center.shape)
+    cols = int(np.clip(int(chunk_mb * 1024 * 1024) // (8 * n_paths), 1, max(len(center), 1)))
+
+    starts = range(0, len(center), cols)
+    seeds = np.random.SeedSequence(seed).spawn(len(starts))
+    chunks = [(center[i:i + cols], scale[i:i + cols], noise, clip, n_paths, s, quantiles)
+              for i, s in zip(starts, seeds)]
+
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1 or len(chunks) == 1:
+        results = [_band_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+            results = list(executor.map(_band_chunk, chunks))
+    return np.hstack(results) if results else np.empty((len(quantiles), 0))
+
+
+def _demand_noise(heuristic):
+    """Ruido del modelo de demanda (residuos) o el rango heuristico"""
+    entry = model_entry("demand")
+    if entry is None:
+        return ('uniform', *heuristic)
+    return ('normal', 0.0, entry['resid_std'])
+
+
+def monthly_bands(horizon=12, start=None, **kwargs):
+    """Bandas de ocupacion mensual"""
+    periods = month_periods(start, horizon)
+    center = demand_occupancy(periods.to_timestamp() + pd.Timedelta(days=14))
+    noise = _demand_noise(MONTHLY_NOISE)
+    if center is None:
+        center = monthly_base(periods)
+    bands = simulate_bands(center, noise, clip=MONTHLY_CLIP, **kwargs)
+
+    df = pd.DataFrame({
+        'year': periods.year.to_numpy(),
+        'month': periods.month.to_numpy(),
+        'season': SEASON_BY_MONTH[periods.month.to_numpy()]
+    })
+    for label, band in zip(BAND_LABELS, bands):
+        df[f'occupancy_{label}'] = np.round(band, 4)
+    return df
+
+
+def daily_bands(horizon=60, start=None, **kwargs):
+    """Bandas de ocupacion diaria"""
+    dates = day_range(start, horizon)
+    center = demand_occupancy(dates)
+    noise = _demand_noise(DAILY_NOISE)
+    if center is None:
+        center = daily_base(dates)
+    else:
+        center = center + WEEKEND_BOOST[dates.weekday.to_numpy()] - WEEKEND_BOOST.mean()
+    bands = simulate_bands(center, noise, clip=DAILY_CLIP, **kwargs)
+
+    df = pd.DataFrame({'date': dates})
+    for label, band in zip(BAND_LABELS, bands):
+        df[f'occupancy_{label}'] = np.round(band, 4)
+    return df
+
+
+def arrivals_bands(history, horizon=3, **kwargs):
+    """Bandas de llegadas por pais y ano (la incertidumbre crece con la raiz del plazo)"""
+    forecast = project_arrivals(history, horizon)
+    growth = country_growth(history).reindex(forecast['country'])
+    steps = forecast['year'].to_numpy() - int(history['year'].max())
+
+    center = forecast['arrivals'].to_numpy(dtype='float64')
+    scale = center * growth['sd'].fillna(0).to_numpy() * np.sqrt(steps)
+    bands = simulate_bands(center, ('normal', 0.0, 1.0), scale=scale, **kwargs)
+
+    df = forecast[['country', 'year']].copy()
+    for label, band in zip(BAND_LABELS, bands):
+        df[f'arrivals_{label}'] = band.astype('int64')
+    return df
+
+
+@memoize_stage(
+    "scenarios",
+    inputs=dataset_paths("tourism_complete"),
+    outputs=(dataset_paths("occupancy_monthly_bands") + dataset_paths("occupancy_daily_bands")
+             + dataset_paths("arrivals_forecast_bands")),
+    volatile=lambda: {'as_of': date.today().isoformat(), 'models': model_digests("demand", "arrivals")},
+    load=lambda: tuple(read_dataset(name) for name in
+                       ("occupancy_monthly_bands", "occupancy_daily_bands", "arrivals_forecast_bands"))
+)
+@instrument
+def simulate_scenarios(n_paths=SCENARIO_PATHS, seed=PIPELINE_SEED, monthly_horizon=12, daily_horizon=60,
+                       arrivals_horizon=3, start=None, max_workers=SCENARIO_MAX_WORKERS):
+    """Bandas P10/P50/P90 de ocupacion mensual, diaria y llegadas por pais"""
+    print(f"Simulando {n_paths:,} escenarios...")
+    options = {'n_paths': n_paths, 'max_workers': max_workers}
+
+    monthly = monthly_bands(monthly_horizon, start, seed=seed, **options)
+    daily = daily_bands(daily_horizon, start, seed=seed + 1, **options)
+    history = read_dataset("tourism_complete", columns=['country', 'year', 'arrivals', 'trend_interest'])
+    arrivals = arrivals_bands(history, arrivals_horizon, seed=seed + 2, **options)
+
+    meta = {'paths': n_paths, 'seed': seed, 'quantiles': list(QUANTILES)}
+    for df, name in [(monthly, "occupancy_monthly_bands"), (daily, "occupancy_daily_bands"),
+                     (arrivals, "arrivals_forecast_bands")]:
+        path = write_dataset(df, name, metadata=meta)
+        print(f"Guardado: {path}")
+
+    return monthly, daily, arrivals
+
+
+if __name__ == "__main__":
+    simulate_scenarios()
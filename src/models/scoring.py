@@ -0,0 +1,96 @@
+"""
+Scoring en proceso - ocupacion e ingresos para escenarios ad-hoc, sin I/O por llamada
+"""
+import numpy as np
+
+from src.models.occupancy import (DAILY_BASE_OCC, DAILY_CLIP, MONTHLY_CLIP, WEEKEND_BOOST, ZONE_OCC_ADJ,
+                                  SEGMENT_OCC_ADJ, monthly_base)
+from src.models.registry import load_model
+from src.models.training import FOURIER_ORDER
+
+# Cambio relativo de ocupacion por cada 1.0 de cambio relativo de tarifa
+PRICE_ELASTICITY = -0.4
+DAYS_PER_YEAR = 365.25
+
+
+class OccupancyScorer:
+    """Modelo de demanda precargado en tablas numpy; `score` es puro calculo vectorial"""
+
+    def __init__(self, demand_model=None, metadata=None):
+        if demand_model is None:
+            demand_model, metadata = load_model("demand")
+
+        # Componente estacional por dia del ano (1..366), precalculado una vez
+        doy = np.arange(367)
+        if demand_model is not None:
+            angle = 2 * np.pi * doy / DAYS_PER_YEAR
+            harmonics = np.column_stack([f(k * angle) for k in range(1, FOURIER_ORDER + 1)
+                                         for f in (np.sin, np.cos)])
+            coef = np.asarray(demand_model.coef_, dtype='float64')
+            self.seasonal = demand_model.intercept_ + harmonics @ coef[1:]
+            metadata = metadata or {}
+            # Sin origen la tendencia no tiene punto de partida: se usa solo la estacionalidad
+            self.trend_per_year = float(coef[0]) if 'origin' in metadata else 0.0
+            self.origin = np.datetime64(metadata.get('origin', '1970-01-01'), 'D')
+            self.version = metadata.get('version')
+            # Impulso de fin de semana centrado (no cambia la media semanal)
+            self.weekend = WEEKEND_BOOST - WEEKEND_BOOST.mean()
+        else:
+            # Sin modelo: las mismas tablas que el motor heuristico diario (temporada por mes + fin de semana)
+            self.seasonal = None
+            self.trend_per_year = 0.0
+            self.origin = np.datetime64('1970-01-01', 'D')
+            self.version = None
+            self.weekend = WEEKEND_BOOST
+
+    def _model_base(self, days):
+        """Estacionalidad + tendencia del modelo por fecha (sin fin de semana)"""
+        doy = (days - days.astype('datetime64[Y]')).astype(int) + 1
+        years = (days - self.origin).astype(int) / DAYS_PER_YEAR
+        return self.seasonal[doy] + self.trend_per_year * years
+
+    def _base(self, dates):
+        """Ocupacion esperada por fecha, sin limites"""
+        days = np.asarray(dates, dtype='datetime64[D]')
+        weekday = (days.astype(int) + 3) % 7  # 1970-01-01 fue jueves
+        if self.seasonal is None:
+            month = days.astype('datetime64[M]').astype(int) % 12 + 1
+            return DAILY_BASE_OCC[month] + self.weekend[weekday]
+        return self._model_base(days) + self.weekend[weekday]
+
+    def monthly_occupancy(self, periods, demand_shift=0.0):
+        """Ocupacion esperada por mes (0-1) para meses de `month_periods`
+
+        Con modelo se evalua a mitad de mes, como predict_occupancy_monthly;
+        sin modelo, la tabla mensual heuristica.
+        """
+        if self.seasonal is None:
+            base = monthly_base(periods)
+        else:
+            base = self._model_base(np.asarray(periods.to_timestamp(), dtype='datetime64[D]') + 14)
+        return np.clip(base + demand_shift, *MONTHLY_CLIP)
+
+    def occupancy(self, dates, demand_shift=0.0):
+        """Ocupacion esperada por fecha (0-1)"""
+        return np.clip(self._base(dates) + demand_shift, *DAILY_CLIP)
+
+    def score(self, dates, rooms=300, rate=150.0, zone=None, segment=None,
+              demand_shift=0.0, price_change=0.0):
+        """Ocupacion, cuartos vendidos e ingresos por fecha/propiedad/escenario
+
+        Todos los argumentos aceptan escalares o arreglos (se combinan con
+        broadcasting); `price_change` es relativo (0.10 = tarifa +10%).
+        """
+        shift = np.asarray(demand_shift, dtype='float64')
+        if zone is not None:
+            shift = shift + np.vectorize(ZONE_OCC_ADJ.get, otypes=['float64'])(zone, 0.0)
+        if segment is not None:
+            shift = shift + np.vectorize(SEGMENT_OCC_ADJ.get, otypes=['float64'])(segment, 0.0)
+
+        price_change = np.asarray(price_change, dtype='float64')
+        occ = self._base(dates) * (1 + PRICE_ELASTICITY * price_change) + shift
+        occ = np.clip(occ, *DAILY_CLIP)
+
+        rooms_sold = occ * np.asarray(rooms, dtype='float64')
+        revenue = rooms_sold * np.asarray(rate, dtype='float64') * (1 + price_change)
+        return {'occupancy': occ, 'rooms_sold': rooms_sold, 'revenue': revenue}
@@ -0,0 +1,216 @@
+"""
+Entrenamiento de modelos - demanda estacional (Trends) y llegadas por pais
+"""
+import pandas as pd
+import numpy as np
+
+from src.pipeline.instrument import instrument
+from src.pipeline.memo import memoize_stage
+from src.storage import dataset_paths, iter_country_groups, iter_dataset, read_dataset
+from src.models.occupancy import MONTHLY_BASE_OCC
+from src.models.registry import REGISTRY_FILE, load_registry, model_entry, save_model, save_table
+
+# Armonicos anuales del modelo de demanda
+FOURIER_ORDER = 3
+# Ocupacion media anual: el indice de Trends se escala a este nivel
+OCC_LEVEL = float(np.nanmean(MONTHLY_BASE_OCC))
+# Semanas / anos finales reservados para medir el error fuera de muestra
+HOLDOUT_WEEKS = 8
+HOLDOUT_YEARS = 1
+# Las llegadas se ajustan desde la recuperacion post-COVID
+TRAIN_FROM_YEAR = 2022
+
+
+def seasonal_features(dates, origin):
+    """Tendencia lineal (anos desde `origin`) + armonicos del dia del ano"""
+    dates = pd.DatetimeIndex(dates)
+    trend = (dates - pd.Timestamp(origin)).days.to_numpy() / 365.25
+    angle = 2 * np.pi * dates.dayofyear.to_numpy() / 365.25
+    harmonics = [f(k * angle) for k in range(1, FOURIER_ORDER + 1) for f in (np.sin, np.cos)]
+    return np.column_stack([trend] + harmonics)
+
+
+def country_sums(history, split_year=None):
+    """Sumas por pais del ajuste log-lineal (n, x, y, xx, xy, yy), separadas en 'fit' y 'test' (anos > split_year)"""
+    recent = history[history['year'] >= TRAIN_FROM_YEAR]
+    x = recent['year'].to_numpy(dtype='float64') - TRAIN_FROM_YEAR
+    y = np.log(recent['arrivals'].to_numpy(dtype='float64'))
+    test = recent['year'].to_numpy() > split_year if split_year is not None else np.zeros(len(recent), dtype=bool)
+    terms = pd.DataFrame({'n': np.ones(len(y)), 'x': x, 'y': y, 'xx': x * x, 'xy': x * y, 'yy': y * y})
+    keys = [recent['country'].astype(str).to_numpy(), np.where(test, 'test', 'fit')]
+    return terms.groupby(keys).sum().rename_axis(['country', 'part'])
+
+
+def fit_trends(sums):
+    """Nivel y pendiente (log) por pais en forma cerrada: pendiente = cov(x, y) / var(x)"""
+    sxx = sums['xx'] - sums['x'] ** 2 / sums['n']
+    sxy = sums['xy'] - sums['x'] * sums['y'] / sums['n']
+    syy = sums['yy'] - sums['y'] ** 2 / sums['n']
+    # Un solo ano: sin pendiente, el nivel es la media
+    slope = (sxy / sxx).where(sxx > 1e-12, 0.0)
+    return pd.DataFrame({
+        'level': (sums['y'] - slope * sums['x']) / sums['n'],
+        'slope': slope,
+        'rows': sums['n'].astype('int64'),
+        'sse': (syy - slope * sxy).clip(lower=0)
+    })
+
+
+def _part(sums, part):
+    if part not in sums.index.get_level_values('part'):
+        return sums.iloc[:0].droplevel('part')
+    return sums.xs(part, level='part')
+
+
+def holdout_abs_error(history, coefs, split_year):
+    """(suma de |error|, filas) del ajuste sin los anos de prueba sobre los anos > split_year"""
+    test = history[history['year'] > split_year]
+    fitted = coefs.reindex(test['country'].astype(str).to_numpy())
+    offset = test['year'].to_numpy(dtype='float64') - TRAIN_FROM_YEAR
+    error = (np.log(test['arrivals'].to_numpy(dtype='float64'))
+             - fitted['level'].to_numpy() - fitted['slope'].to_numpy() * offset)
+    error = error[~np.isnan(error)]
+    return float(np.abs(error).sum()), len(error)
+
+
+def _holdout_sums(sums, history, split_year):
+    """Sumas escalares del error en los anos de prueba (ss_res, n, y, yy, |error|); se suman entre bloques"""
+    fit, test = _part(sums, 'fit'), _part(sums, 'test')
+    test = test[test.index.isin(fit.index)]
+    if test.empty:
+        return np.zeros(5)
+    coefs = fit_trends(fit)
+    a, b = coefs['level'].reindex(test.index), coefs['slope'].reindex(test.index)
+    ss_res = (test['yy'] - 2 * a * test['y'] - 2 * b * test['xy'] + a ** 2 * test['n']
+              + 2 * a * b * test['x'] + b ** 2 * test['xx']).sum()
+    total_abs, _ = holdout_abs_error(history, coefs, split_year)
+    return np.array([ss_res, test['n'].sum(), test['y'].sum(), test['yy'].sum(), total_abs])
+
+
+def _holdout_from_sums(ss_res, n, y, yy, total_abs):
+    """MAE y R2 fuera de muestra a partir de las sumas acumuladas"""
+    if not n:
+        return {}
+    ss_tot = yy - y ** 2 / n
+    return {'holdout_mae': round(float(total_abs / n), 4),
+            'holdout_r2': round(float(1 - ss_res / ss_tot), 4) if ss_tot > 0 else None}
+
+
+def _holdout_metrics(make_model, X, y, n_test):
+    """MAE y R2 de un ajuste sin las ultimas `n_test` observaciones"""
+    if n_test <= 0 or len(y) <= n_test + X.shape[1]:
+        return {}
+    from sklearn.metrics import mean_absolute_error, r2_score
+
+    model = make_model().fit(X[:-n_test], y[:-n_test])
+    pred = model.predict(X[-n_test:])
+    return {'holdout_mae': round(float(mean_absolute_error(y[-n_test:], pred)), 4),
+            'holdout_r2': round(float(r2_score(y[-n_test:], pred)), 4)}
+
+
+def train_demand_model(trends_time):
+    """Regresion estacional sobre el interes semanal, en unidades de ocupacion"""
+    from sklearn.linear_model import Ridge  # sklearn solo al entrenar (predictor y dashboard no lo cargan)
+
+    trends_time = trends_time.sort_values('date')
+    dates = pd.DatetimeIndex(trends_time['date'])
+    interest = trends_time['Cancun'].to_numpy(dtype='float64')
+    y = OCC_LEVEL * interest / interest.mean()
+
+    origin = dates.min().date().isoformat()
+    X = seasonal_features(dates, origin)
+    make_model = lambda: Ridge(alpha=1.0)
+    metrics = _holdout_metrics(make_model, X, y, HOLDOUT_WEEKS)
+
+    model = make_model().fit(X, y)
+    residuals = y - model.predict(X)
+    metadata = {
+        'origin': origin,
+        'fourier_order': FOURIER_ORDER,
+        'rows': len(y),
+        'trained_through': dates.max().date().isoformat(),
+        'resid_std': round(float(residuals.std()), 5),
+        'metrics': metrics
+    }
+    return model, metadata
+
+
+def fit_country_blocks(blocks, split_year):
+    """Ajusta bloques con paises completos; devuelve (generador de coeficientes, funcion de metricas)
+
+    Solo se acumulan sumas escalares: la memoria depende del tamano del
+    bloque, no del numero de paises. Los coeficientes salen en el orden en
+    que aparecen los paises (los que no tienen anos recientes, en NaN).
+    """
+    totals = {'sse': 0.0, 'rows': 0, 'countries': 0, 'holdout': np.zeros(5)}
+
+    def coefficients():
+        for block in blocks:
+            sums = country_sums(block, split_year)
+            fitted = fit_trends(sums.groupby(level='country').sum())
+            totals['sse'] += float(fitted['sse'].sum())
+            totals['rows'] += int(fitted['rows'].sum())
+            totals['countries'] += len(fitted)
+            totals['holdout'] += _holdout_sums(sums, block, split_year)
+            countries = pd.unique(block['country'].astype(str).to_numpy())
+            yield fitted[['level', 'slope']].reindex(countries).rename_axis('country').reset_index()
+
+    def metadata():
+        return {
+            'n_countries': totals['countries'],
+            'rows': totals['rows'],
+            'resid_std': round(float(np.sqrt(totals['sse'] / totals['rows'])), 5) if totals['rows'] else None,
+            'metrics': _holdout_from_sums(*totals['holdout'])
+        }
+    return coefficients(), metadata
+
+
+def train_arrivals_model(tourism):
+    """Crecimiento log-lineal por pais sobre los anos post-COVID
+
+    Cada pais tiene su propio nivel y pendiente, asi que el ajuste se
+    separa por pais y sale en forma cerrada de sumas por grupo: el costo
+    es lineal en filas y el modelo es una tabla de coeficientes.
+    """
+    trained_through = int(tourism['year'].max())
+    coefficients, metadata = fit_country_blocks([tourism], trained_through - HOLDOUT_YEARS)
+    model = pd.concat(coefficients, ignore_index=True).set_index('country')
+    return model, {**metadata(), 'trained_through': trained_through}
+
+
+@memoize_stage(
+    "training",
+    inputs=dataset_paths("trends_time_real", 'raw') + dataset_paths("tourism_complete"),
+    outputs=[REGISTRY_FILE],
+    load=load_registry
+)
+@instrument
+def train_models(chunk_rows=None):
+    """Entrena y registra los modelos de demanda y de llegadas (con `chunk_rows`, leyendo por bloques)"""
+    print("Entrenando modelos...")
+
+    trends_time = read_dataset("trends_time_real", 'raw', columns=['date', 'Cancun'])
+    model, metadata = train_demand_model(trends_time)
+    version = save_model("demand", model, metadata)
+    print(f"  demand v{version}: {metadata['rows']} semanas, {metadata['metrics']}")
+
+    # Llegadas: tabla de coeficientes por pais, guardada bloque a bloque
+    columns = ['country', 'year', 'arrivals']
+    if chunk_rows:
+        trained_through = max(int(chunk['year'].max()) for chunk in
+                              iter_dataset("tourism_complete", columns=['year'], chunk_rows=chunk_rows))
+        blocks = iter_country_groups(iter_dataset("tourism_complete", columns=columns, chunk_rows=chunk_rows))
+    else:
+        tourism = read_dataset("tourism_complete", columns=columns)
+        trained_through = int(tourism['year'].max())
+        blocks = [tourism]
+    coefficients, metadata = fit_country_blocks(blocks, trained_through - HOLDOUT_YEARS)
+    version = save_table("arrivals", coefficients, lambda: {**metadata(), 'trained_through': trained_through})
+    entry = model_entry("arrivals")
+    print(f"  arrivals v{version}: {entry['n_countries']} paises, {entry['metrics']}")
+
+    return load_registry()
+
+
+if __name__ == "__main__":
+    train_models()
@@ -0,0 +1,3 @@
+"""
+Pipeline - DAG de etapas, memoizacion e instrumentacion
+"""
@@ -0,0 +1,205 @@
+"""
+Ejecutor DAG - corre las etapas en cuanto sus dependencias terminan
+"""
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+import json
+import time
+import traceback
+from pathlib import Path
+
+from config import DATA_PROCESSED, PIPELINE_PROFILE
+from src.pipeline.instrument import stage_metrics
+from src.storage import EXTENSIONS
+
+RUN_FILE = DATA_PROCESSED / "pipeline_run.json"
+
+
+class Stage:
+    """Etapa del pipeline: funcion, dependencias y archivos que lee/escribe
+
+    Si la funcion esta decorada con memoize_stage, sus entradas y salidas
+    se toman del decorador y la etapa se salta sola cuando no cambiaron.
+    Una etapa `optional` que falla no bloquea a las que dependen de ella
+    (se usan los datos anteriores).
+    """
+
+    def __init__(self, name, func, deps=(), inputs=None, outputs=None, optional=False, **kwargs):
+        self.name = name
+        self.func = func
+        self.deps = list(deps)
+        self.inputs = list(inputs if inputs is not None else getattr(func, 'inputs', []))
+        self.outputs = list(outputs if outputs is not None else getattr(func, 'outputs', []))
+        self.optional = optional
+        self.kwargs = kwargs
+
+    @property
+    def memoized(self):
+        return hasattr(self.func, 'stage_name')
+
+    def stale_reason(self):
+        """Por que habria que recalcular la etapa (None si esta al dia)"""
+        if self.memoized:
+            return None if self.func.is_current(**self.kwargs) else "cambiaron entradas, parametros, codigo o salidas"
+        # Sin memoizacion: basta con que cada salida exista en algun formato
+        missing = [path.name for path in map(Path, self.outputs)
+                   if not any(path.with_suffix(ext).exists() for ext in EXTENSIONS.values())
+                   and not path.exists()]
+        return f"faltan {', '.join(missing)}" if missing else None
+
+    def run(self, force=False):
+        kwargs = dict(self.kwargs, force=True) if force and self.memoized else self.kwargs
+        return self.func(**kwargs)
+
+
+def topological_order(stages):
+    """Orden de ejecucion valido; falla si hay dependencias inexistentes o ciclos"""
+    by_name = {stage.name: stage for stage in stages}
+    for stage in stages:
+        missing = [dep for dep in stage.deps if dep not in by_name]
+        if missing:
+            raise ValueError(f"Etapa '{stage.name}' depende de etapas inexistentes: {missing}")
+
+    order, state = [], {}
+
+    def visit(name, path):
+        if state.get(name) == 'done':
+            return
+        if state.get(name) == 'visiting':
+            raise ValueError(f"Ciclo en el pipeline: {' -> '.join(path + [name])}")
+        state[name] = 'visiting'
+        for dep in by_name[name].deps:
+            visit(dep, path + [name])
+        state[name] = 'done'
+        order.append(by_name[name])
+
+    for stage in stages:
+        visit(stage.name, [])
+    return order
+
+
+def plan_stages(stages, targets, force=False):
+    """Plan para obtener `targets`: las etapas pedidas mas sus dependencias desactualizadas
+
+    Devuelve, en orden de ejecucion, {'stage', 'run', 'recompute', 'reason'}
+    por cada etapa de la clausura. Una dependencia al dia no se corre; una
+    etapa cuya dependencia se recalcula tambien se recalcula.
+    """
+    by_name = {stage.name: stage for stage in stages}
+    unknown = [name for name in targets if name not in by_name]
+    if unknown:
+        raise ValueError(f"Etapas inexistentes: {unknown}")
+
+    needed, pending = set(), list(targets)
+    while pending:
+        name = pending.pop()
+        if name not in needed:
+            needed.add(name)
+            pending.extend(by_name[name].deps)
+
+    plan, recompute = [], set()
+    for stage in topological_order([stage for stage in stages if stage.name in needed]):
+        upstream = [dep for dep in stage.deps if dep in recompute]
+        requested = stage.name in targets
+        if requested and force:
+            reason = "forzada"
+        elif upstream:
+            reason = f"se recalcula {', '.join(upstream)}"
+        else:
+            reason = stage.stale_reason()
+        # Las etapas sin memoizacion (extracciones) corren siempre que se piden
+        if requested and reason is None and not stage.memoized:
+            reason = "solicitada"
+        if reason is not None:
+            recompute.add(stage.name)
+        plan.append({'stage': stage, 'run': requested or reason is not None,
+                     'recompute': reason is not None, 'reason': reason or "al dia"})
+    return plan
+
+
+def print_plan(plan):
+    """Tabla del plan (dry-run)"""
+    print(f"{'Etapa':<22}{'Accion':<14}Motivo")
+    for step in plan:
+        action = 'recalcular' if step['recompute'] else ('reutilizar' if step['run'] else 'omitir')
+        print(f"{step['stage'].name:<22}{action:<14}{step['reason']}")
+
+
+def run_dag(stages, max_workers=4, force=False, run_file=RUN_FILE, profile=PIPELINE_PROFILE):
+    """Corre el DAG con etapas independientes en paralelo; devuelve el estado por etapa
+
+    Estados: 'ok', 'skipped' (memoizada sin cambios), 'failed' y 'blocked'
+    (una dependencia obligatoria fallo). Cada etapa lleva sus mediciones
+    (CPU, memoria, filas y bytes) en 'metrics'; con `profile` se guarda
+    ademas un perfil por etapa, y las etapas corren de a una (el perfilador
+    es uno por proceso).
+    """
+    stages = topological_order(stages)
+    pending = {stage.name: stage for stage in stages}
+    optional = {stage.name: stage.optional for stage in stages}
+    results = {}
+    started_at = datetime.now().isoformat(timespec='seconds')
+    started = time.perf_counter()
+
+    def execute(stage):
+        start = time.perf_counter()
+        with stage_metrics(stage.name, profile) as metrics:
+            try:
+                stage.run(force)
+                status, error = ('skipped' if stage.memoized and stage.func.skipped else 'ok'), None
+            except Exception as e:
+                traceback.print_exc()
+                status, error = 'failed', f"{type(e).__name__}: {e}"
+        return {'status': status, 'seconds': round(time.perf_counter() - start, 3), 'error': error,
+                'optional': stage.optional, 'metrics': metrics.as_dict()}
+
+    def blocked_by(stage):
+        return [dep for dep in stage.deps
+                if results[dep]['status'] in ('failed', 'blocked') and not optional[dep]]
+
+    with ThreadPoolExecutor(max_workers=1 if profile else max_workers) as executor:
+        running = {}
+        while pending or running:
+            # Lanzar todo lo que ya tiene sus dependencias resueltas
+            for name, stage in list(pending.items()):
+                if not all(dep in results for dep in stage.deps):
+                    continue
+                del pending[name]
+                blockers = blocked_by(stage)
+                if blockers:
+                    results[name] = {'status': 'blocked', 'seconds': 0.0, 'error': f"depende de {blockers}",
+                                     'optional': stage.optional}
+                    continue
+                print(f"[{datetime.now():%H:%M:%S}] >> {name}")
+                running[executor.submit(execute, stage)] = name
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name] = future.result()
+                print(f"[{datetime.now():%H:%M:%S}] << {name}: {results[name]['status']} "
+                      f"({results[name]['seconds']:.2f}s)")
+
+    report = {
+        'started_at': started_at,
+        'total_seconds': round(time.perf_counter() - started, 3),
+        'stages': {stage.name: results[stage.name] for stage in stages}
+    }
+    if run_file is not None:
+        Path(run_file).parent.mkdir(parents=True, exist_ok=True)
+        Path(run_file).write_text(json.dumps(report, indent=2))
+    return report
+
+
+def print_summary(report):
+    """Tabla de tiempos, CPU, memoria y filas escritas por etapa"""
+    print(f"{'Etapa':<22}{'Estado':<10}{'Segundos':>10}{'CPU':>10}{'RSS MB':>10}{'Filas':>12}")
+    for name, result in report['stages'].items():
+        metrics = result.get('metrics') or {}
+        cpu = f"{metrics['cpu_seconds']:.2f}" if metrics.get('cpu_seconds') is not None else '-'
+        rss = f"{metrics['rss_peak_mb']:.0f}" if metrics.get('rss_peak_mb') is not None else '-'
+        rows = f"{metrics['rows_out']:,}" if metrics else '-'
+        print(f"{name:<22}{result['status']:<10}{result['seconds']:>10.2f}{cpu:>10}{rss:>10}{rows:>12}")
+    print(f"{'Total (reloj)':<32}{report['total_seconds']:>10.2f}")
@@ -0,0 +1,178 @@
+"""
+Instrumentacion del pipeline - tiempo, CPU, memoria, filas y bytes por etapa
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+import cProfile
+import functools
+import os
+import time
+import sys
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows: sin getrusage, no se reporta la memoria
+    resource = None
+
+from config import PIPELINE_PROFILE, PROFILE_DIR
+
+# Mediciones abiertas en el hilo actual (la mas interna al final)
+_active = ContextVar('instrument_active', default=())
+
+
+def _peak_rss_mb(who=None):
+    """Pico de memoria residente del proceso (o de sus hijos) en MB"""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF if who is None else who)
+    # Linux reporta KB; macOS, bytes
+    return usage.ru_maxrss / (1024 ** 2 if sys.platform == 'darwin' else 1024)
+
+
+def _children_cpu():
+    times = os.times()
+    return times.children_user + times.children_system
+
+
+def _size(path):
+    path = Path(path)
+    try:
+        if path.is_dir():
+            return sum(p.stat().st_size for p in path.rglob('*') if p.is_file())
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+class StageMetrics:
+    """Mediciones de una etapa o funcion; las llamadas anidadas quedan en `children`
+
+    El CPU es el del hilo de la etapa mas el de los procesos hijos que
+    terminaron durante ella (pools); el pico de RSS es el del proceso, asi que
+    con etapas en paralelo `rss_growth_mb` se atribuye a la que lo alcanzo.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.rows_in = self.rows_out = 0
+        self.bytes_in = self.bytes_out = 0
+        self.children = []
+        self.profile = None
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+        self._children_cpu = _children_cpu()
+        self._rss = _peak_rss_mb()
+        self.wall_seconds = self.cpu_seconds = None
+        self.rss_peak_mb = self.rss_growth_mb = self.children_rss_peak_mb = None
+
+    def finish(self):
+        self.wall_seconds = time.perf_counter() - self._wall
+        self.cpu_seconds = time.thread_time() - self._cpu + _children_cpu() - self._children_cpu
+        if resource is not None:
+            self.rss_peak_mb = _peak_rss_mb()
+            self.rss_growth_mb = self.rss_peak_mb - self._rss
+            self.children_rss_peak_mb = _peak_rss_mb(resource.RUSAGE_CHILDREN)
+
+    def as_dict(self):
+        round_ = lambda value, digits: None if value is None else round(value, digits)
+        return {
+            'name': self.name,
+            'wall_seconds': round_(self.wall_seconds, 3),
+            'cpu_seconds': round_(self.cpu_seconds, 3),
+            'rss_peak_mb': round_(self.rss_peak_mb, 1),
+            'rss_growth_mb': round_(self.rss_growth_mb, 1),
+            'children_rss_peak_mb': round_(self.children_rss_peak_mb, 1),
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'profile': self.profile,
+            'children': [child.as_dict() for child in self.children]
+        }
+
+
+def _start_profiler(mode):
+    """Perfilador iniciado, o None si ya hay otro activo (Python 3.12+ admite uno por proceso)"""
+    if mode == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print("  pyinstrument no esta instalado; se usa cProfile")
+        else:
+            profiler = Profiler()
+            profiler.start()
+            return profiler
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as e:
+        print(f"  Sin perfil: {e}")
+        return None
+    return profiler
+
+
+def _dump_profiler(profiler, name):
+    """Guarda el perfil en PROFILE_DIR (.prof para cProfile, .html para pyinstrument)"""
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    if isinstance(profiler, cProfile.Profile):
+        profiler.disable()
+        path = PROFILE_DIR / f"{name}.prof"
+        profiler.dump_stats(path)
+    else:
+        profiler.stop()
+        path = PROFILE_DIR / f"{name}.html"
+        path.write_text(profiler.output_html())
+    return str(path)
+
+
+@contextmanager
+def stage_metrics(name, profile=PIPELINE_PROFILE):
+    """Mide el bloque; `profile` ('cprofile' o 'pyinstrument') solo aplica al nivel mas externo"""
+    stack = _active.get()
+    metrics = StageMetrics(name)
+    profiler = _start_profiler(profile) if profile and not stack else None
+    token = _active.set(stack + (metrics,))
+    try:
+        yield metrics
+    finally:
+        _active.reset(token)
+        if profiler is not None:
+            metrics.profile = _dump_profiler(profiler, name)
+        metrics.finish()
+        if stack:
+            stack[-1].children.append(metrics)
+
+
+def instrument(func=None, *, name=None):
+    """Decorador: mide cada llamada con stage_metrics"""
+    if func is None:
+        return functools.partial(instrument, name=name)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with stage_metrics(name or func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def track_read(path, rows, size=None):
+    """Registra una lectura en todas las mediciones abiertas del hilo (`size` por defecto: el archivo)"""
+    stack = _active.get()
+    if not stack:
+        return
+    size = _size(path) if size is None else size
+    for metrics in stack:
+        metrics.rows_in += rows
+        metrics.bytes_in += size
+
+
+def track_write(paths, rows):
+    """Registra una escritura (todos los archivos del dataset) en las mediciones abiertas"""
+    stack = _active.get()
+    if not stack:
+        return
+    size = sum(_size(path) for path in paths)
+    for metrics in stack:
+        metrics.rows_out += rows
+        metrics.bytes_out += size
@@ -0,0 +1,167 @@
+"""
+Memoizacion por hash de contenido - se salta una etapa si sus entradas no cambiaron
+"""
+import pandas as pd
+from datetime import datetime
+import ast
+import functools
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import threading
+from pathlib import Path
+
+from config import DATA_PROCESSED, PROJECT_ROOT
+from src.storage import read_path
+
+STATE_FILE = DATA_PROCESSED / "stage_state.json"
+_lock = threading.Lock()
+
+
+def file_digest(path):
+    """SHA-256 del contenido de un archivo o directorio (None si no existe)"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    # Directorios (datasets particionados): hash de todos sus archivos
+    files = sorted(p for p in path.rglob('*') if p.is_file()) if path.is_dir() else [path]
+    h = hashlib.sha256()
+    for file in files:
+        h.update(str(file.relative_to(path.parent)).encode())
+        with open(file, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+    return h.hexdigest()
+
+
+def _param_repr(value):
+    """Representacion estable de un parametro (DataFrames y archivos por contenido)"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return hashlib.sha256(pd.util.hash_pandas_object(value).to_numpy().tobytes()).hexdigest()
+    if isinstance(value, (str, Path)) and os.path.isfile(value):
+        return file_digest(value)
+    return str(value)
+
+
+def stage_fingerprint(inputs, params, code_files):
+    """Hash de las entradas (contenido), parametros y codigo de una etapa"""
+    h = hashlib.sha256()
+    for path in inputs:
+        h.update(f"{Path(path).name}:{file_digest(path)}".encode())
+    h.update(json.dumps(params, sort_keys=True, default=_param_repr).encode())
+    for path in code_files:
+        h.update(f"{Path(path).name}:{file_digest(path)}".encode())
+    return h.hexdigest()
+
+
+def _imported_modules(path):
+    """Modulos del proyecto (src.*, config) que importa un archivo, incluso dentro de funciones"""
+    names = set()
+    for node in ast.walk(ast.parse(Path(path).read_text())):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            # `from src.models import registry` importa un modulo, no un nombre
+            names.add(node.module)
+            names.update(f"{node.module}.{alias.name}" for alias in node.names)
+    return [name for name in names if name == 'config' or name.startswith('src.')]
+
+
+@functools.lru_cache(maxsize=None)
+def code_files(path):
+    """El archivo de una etapa y todo el codigo del proyecto del que depende (importaciones transitivas)"""
+    files, pending = set(), [Path(path).resolve()]
+    while pending:
+        file = pending.pop()
+        if file in files:
+            continue
+        files.add(file)
+        for name in _imported_modules(file):
+            try:
+                spec = importlib.util.find_spec(name)
+            except (ImportError, ValueError):
+                continue
+            origin = Path(spec.origin).resolve() if spec and spec.origin else None
+            if origin and origin.suffix == '.py' and origin.is_relative_to(PROJECT_ROOT.resolve()):
+                pending.append(origin)
+    return sorted(files)
+
+
+def load_state():
+    try:
+        return json.loads(STATE_FILE.read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def is_current(name, fingerprint, outputs):
+    """La etapa ya corrio con este fingerprint y sus salidas siguen intactas"""
+    entry = load_state().get(name)
+    if not entry or entry['fingerprint'] != fingerprint:
+        return False
+    return all(file_digest(path) == entry['outputs'].get(Path(path).name) for path in outputs)
+
+
+def record(name, fingerprint, outputs):
+    """Guarda el fingerprint y el hash de las salidas recien escritas"""
+    with _lock:
+        state = load_state()
+        entry = {'fingerprint': fingerprint, 'outputs': {Path(path).name: file_digest(path) for path in outputs}}
+        # Recalcular sin cambios no toca el estado (el archivo se commitea en cada actualizacion)
+        previous = state.get(name, {})
+        unchanged = all(previous.get(key) == value for key, value in entry.items())
+        entry['updated_at'] = (previous.get('updated_at') if unchanged else None) or \
+            datetime.now().isoformat(timespec='seconds')
+        state[name] = entry
+        STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        STATE_FILE.write_text(json.dumps(state, indent=2, sort_keys=True))
+
+
+def memoize_stage(name, inputs=(), outputs=(), volatile=None, load=None):
+    """Decorador: reutiliza las salidas si entradas, parametros y codigo no cambiaron
+
+    El codigo es el archivo de la etapa mas los modulos del proyecto que
+    importa (directa o indirectamente): cambiar schema.py o occupancy.py
+    tambien invalida las etapas que los usan.
+
+    `volatile` devuelve parametros implicitos (ej. la fecha de hoy) que
+    tambien invalidan la etapa; `load` reconstruye el resultado cuando se
+    salta (por defecto lee la primera salida). Con force=True siempre se
+    recalcula.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        source = inspect.getfile(inspect.unwrap(func))
+
+        def fingerprint_of(args, kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            if volatile is not None:
+                params.update(volatile())
+            return stage_fingerprint(inputs, params, code_files(source))
+
+        @functools.wraps(func)
+        def wrapper(*args, force=False, **kwargs):
+            fingerprint = fingerprint_of(args, kwargs)
+
+            if not force and is_current(name, fingerprint, outputs):
+                print(f"  {name}: sin cambios, se reutiliza {Path(outputs[0]).name}")
+                wrapper.skipped = True
+                return load() if load is not None else read_path(outputs[0])
+
+            result = func(*args, **kwargs)
+            record(name, fingerprint, outputs)
+            wrapper.skipped = False
+            return result
+
+        # Para planificar sin correr: la llamada con estos argumentos se saltaria?
+        wrapper.is_current = lambda *args, **kwargs: is_current(name, fingerprint_of(args, kwargs), outputs)
+        wrapper.stage_name = name
+        wrapper.inputs = list(inputs)
+        wrapper.outputs = list(outputs)
+        wrapper.skipped = None
+        return wrapper
+    return decorator
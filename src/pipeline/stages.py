@@ -0,0 +1,97 @@
+"""
+Definicion del pipeline - etapas de extraccion, generacion y modelos
+"""
+
+from config import PIPELINE_MAX_WORKERS, PIPELINE_PROFILE, STREAM_CHUNK_ROWS
+from src.pipeline.dag import Stage, run_dag, print_summary
+from src.storage import dataset_paths
+from src.extractors.trends_extractor import extract_trends, extract_trends_batched
+from src.extractors.worldbank_extractor import extract_tourism_data
+from src.extractors.intelligent_generator import generate_current_data, stream_current_data
+from src.models.training import train_models
+from src.models.predictor import (predict_occupancy_monthly, predict_daily_next_month, forecast_arrivals_by_country,
+                                  stream_arrivals_forecast)
+from src.models.portfolio import forecast_portfolio
+from src.models.scenarios import simulate_scenarios
+from src.processors.aggregates import build_aggregates
+
+
+# Alias de grupos para --stages
+STAGE_GROUPS = {
+    'extract': ["trends", "trends_keywords", "worldbank"],
+    'predictor': ["occupancy_monthly", "occupancy_daily", "arrivals_forecast"],
+    'forecasts': ["occupancy_monthly", "occupancy_daily", "arrivals_forecast", "portfolio", "scenarios"]
+}
+
+
+def _options(**kwargs):
+    """Solo los parametros indicados: los demas quedan con el default de cada funcion"""
+    return {key: value for key, value in kwargs.items() if value is not None}
+
+
+def build_pipeline(seed=None, days=None, months=None, years=None, n_paths=None, properties=None,
+                   chunk_rows=None, markets=None):
+    """Etapas y dependencias: trends y worldbank corren en paralelo
+
+    Los parametros (semilla, horizontes en dias/meses/anos, trayectorias y
+    archivo de propiedades) se pasan a las etapas que los usan. Con
+    `chunk_rows` o un archivo de mercados, tourism_complete, training y
+    arrivals_forecast se procesan por bloques (memoria acotada).
+    """
+    if chunk_rows or markets is not None:
+        tourism = Stage("tourism_complete", stream_current_data, deps=["trends", "worldbank"],
+                        **_options(markets=markets, chunk_rows=chunk_rows, seed=seed))
+        training = Stage("training", train_models, deps=["tourism_complete"],
+                         chunk_rows=chunk_rows or STREAM_CHUNK_ROWS)
+        forecast = Stage("arrivals_forecast", stream_arrivals_forecast, deps=["training"],
+                         **_options(horizon=years, chunk_rows=chunk_rows))
+    else:
+        tourism = Stage("tourism_complete", generate_current_data, deps=["trends", "worldbank"],
+                        **_options(seed=seed))
+        training = Stage("training", train_models, deps=["tourism_complete"])
+        forecast = Stage("arrivals_forecast", forecast_arrivals_by_country, deps=["training"],
+                         **_options(horizon=years))
+
+    return [
+        Stage("trends", extract_trends, optional=True, incremental=True,
+              outputs=dataset_paths("trends_real", 'raw') + dataset_paths("trends_time_real", 'raw')),
+        Stage("trends_keywords", extract_trends_batched, optional=True,
+              outputs=dataset_paths("trends_keywords_time", 'raw') + dataset_paths("trends_keywords_region", 'raw')),
+        Stage("worldbank", extract_tourism_data, optional=True, incremental=True,
+              outputs=dataset_paths("worldbank_tourism_real", 'raw')),
+        tourism,
+        training,
+        Stage("occupancy_monthly", predict_occupancy_monthly, deps=["training"],
+              **_options(seed=seed, horizon=months)),
+        Stage("occupancy_daily", predict_daily_next_month, deps=["training"], **_options(seed=seed, horizon=days)),
+        forecast,
+        Stage("portfolio", forecast_portfolio, deps=["training"],
+              **_options(properties=properties, months=months, days=days, seed=seed)),
+        Stage("scenarios", simulate_scenarios, deps=["training"],
+              **_options(n_paths=n_paths, seed=seed, monthly_horizon=months, daily_horizon=days,
+                         arrivals_horizon=years)),
+        Stage("aggregates", build_aggregates, deps=["tourism_complete", "occupancy_monthly", "occupancy_daily"])
+    ]
+
+
+def expand_stages(names, stages):
+    """Nombres de etapa o de grupo -> nombres de etapa, sin repetir"""
+    known = {stage.name for stage in stages}
+    expanded = []
+    for name in names:
+        for stage in STAGE_GROUPS.get(name, [name]):
+            if stage not in known:
+                raise ValueError(f"Etapa desconocida: {stage} (disponibles: {', '.join(sorted(known))}; "
+                                 f"grupos: {', '.join(STAGE_GROUPS)})")
+            if stage not in expanded:
+                expanded.append(stage)
+    return expanded
+
+
+def run_pipeline(force=False, max_workers=PIPELINE_MAX_WORKERS, profile=PIPELINE_PROFILE, stages=None):
+    """Corre el pipeline completo, o solo `stages` y sus dependencias desactualizadas"""
+    stages = stages if stages is not None else build_pipeline()
+    report = run_dag(stages, max_workers=max_workers, force=force, profile=profile)
+    print()
+    print_summary(report)
+    return report
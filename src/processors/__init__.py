@@ -0,0 +1,3 @@
+"""
+Agregados materializados para el dashboard
+"""
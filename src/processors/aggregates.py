@@ -0,0 +1,107 @@
+"""
+Agregados materializados - KPIs y resumenes que el dashboard lee ya calculados
+"""
+import pandas as pd
+import numpy as np
+
+from src.pipeline.instrument import instrument
+from src.pipeline.memo import memoize_stage
+from src.storage import dataset_paths, read_dataset, write_dataset
+
+AGGREGATES = ['agg_kpis', 'agg_yearly', 'agg_country', 'agg_season_mix', 'agg_weekly']
+
+
+def yearly_totals(tourism):
+    """Llegadas totales por ano y crecimiento interanual (%)"""
+    yearly = tourism.groupby('year', observed=True)['arrivals'].sum().sort_index()
+    return pd.DataFrame({
+        'year': yearly.index,
+        'arrivals': yearly.to_numpy(),
+        'yoy_growth': np.round(yearly.pct_change().to_numpy() * 100, 1)
+    })
+
+
+def country_kpis(tourism):
+    """Llegadas del ultimo ano, crecimiento y ranking por pais (ordenado por llegadas)"""
+    latest = int(tourism['year'].max())
+    wide = tourism.pivot_table(index='country', columns='year', values='arrivals', aggfunc='sum', observed=True)
+    interest = tourism.groupby('country', observed=True)['trend_interest'].first()
+
+    df = pd.DataFrame({
+        'country': wide.index.astype(str),
+        'year': latest,
+        'arrivals': wide[latest].to_numpy(),
+        'prev_arrivals': wide[latest - 1].to_numpy() if latest - 1 in wide else np.nan,
+        'trend_interest': interest.reindex(wide.index).to_numpy()
+    })
+    df['growth'] = np.round((df['arrivals'] / df['prev_arrivals'] - 1) * 100, 1)
+    df = df.sort_values('arrivals', ascending=False, ignore_index=True)
+    df['rank'] = np.arange(1, len(df) + 1)
+    return df
+
+
+def season_mix(occ_monthly):
+    """Ocupacion promedio e ingresos por temporada"""
+    mix = occ_monthly.groupby('season', observed=True).agg(
+        occupancy_percent=('occupancy_percent', 'mean'),
+        estimated_revenue=('estimated_revenue', 'sum'),
+        months=('occupancy_percent', 'size')
+    ).reset_index()
+    mix['occupancy_percent'] = mix['occupancy_percent'].astype('float64').round(2)
+    return mix
+
+
+def weekly_stats(occ_daily):
+    """Ocupacion promedio, minima y maxima por semana del horizonte"""
+    weekly = occ_daily.groupby('week')['occupancy_percent'].agg(['mean', 'min', 'max'])
+    return weekly.astype('float64').round(2).reset_index()
+
+
+def headline_kpis(yearly, countries, occ_monthly, occ_daily):
+    """Una fila con los KPIs de la portada"""
+    weekend = occ_daily.groupby('is_weekend')['occupancy_percent'].mean()
+    return pd.DataFrame([{
+        'year': int(yearly['year'].iloc[-1]),
+        'total_arrivals': int(yearly['arrivals'].iloc[-1]),
+        'yoy_growth': float(yearly['yoy_growth'].iloc[-1]),
+        'top_country': countries['country'].iloc[0],
+        'avg_occupancy': round(float(occ_monthly['occupancy_percent'].mean()), 2),
+        'total_revenue': float(occ_monthly['estimated_revenue'].sum()),
+        'weekday_occupancy': round(float(weekend.get(False, np.nan)), 2),
+        'weekend_occupancy': round(float(weekend.get(True, np.nan)), 2)
+    }])
+
+
+@memoize_stage(
+    "aggregates",
+    inputs=dataset_paths("tourism_complete") + dataset_paths("occupancy_monthly") + dataset_paths("occupancy_daily"),
+    outputs=[path for name in AGGREGATES for path in dataset_paths(name)],
+    load=lambda: {name: read_dataset(name) for name in AGGREGATES}
+)
+@instrument
+def build_aggregates():
+    """Calcula y guarda todos los agregados del dashboard"""
+    print("Calculando agregados...")
+
+    tourism = read_dataset("tourism_complete", columns=['country', 'year', 'arrivals', 'trend_interest'])
+    occ_monthly = read_dataset("occupancy_monthly", columns=['occupancy_percent', 'estimated_revenue', 'season'])
+    occ_daily = read_dataset("occupancy_daily", columns=['occupancy_percent', 'is_weekend', 'week'])
+
+    yearly = yearly_totals(tourism)
+    countries = country_kpis(tourism)
+    aggregates = {
+        'agg_kpis': headline_kpis(yearly, countries, occ_monthly, occ_daily),
+        'agg_yearly': yearly,
+        'agg_country': countries,
+        'agg_season_mix': season_mix(occ_monthly),
+        'agg_weekly': weekly_stats(occ_daily)
+    }
+    for name, df in aggregates.items():
+        write_dataset(df, name)
+    print(f"Guardado: {len(aggregates)} agregados en {dataset_paths('agg_kpis')[0].parent}")
+
+    return aggregates
+
+
+if __name__ == "__main__":
+    build_aggregates()
@@ -0,0 +1,128 @@
+"""
+Esquemas de los datasets - tipos canonicos y metadatos de corrida
+"""
+import numpy as np
+import pandas as pd
+
+# Tipos por dataset (se aplican al generar y al cargar)
+SCHEMAS = {
+    'trends_real': {
+        'country': 'category', 'interest': 'int16'
+    },
+    'trends_time_real': {
+        'date': 'datetime64[ns]', 'Cancun': 'int16', 'isPartial': 'bool'
+    },
+    'trends_keywords_time': {
+        'date': 'datetime64[ns]', 'keyword': 'category', 'timeframe': 'category', 'geo': 'category',
+        'interest': 'float32', 'isPartial': 'bool'
+    },
+    'trends_keywords_region': {
+        'keyword': 'category', 'timeframe': 'category', 'geo': 'category', 'resolution': 'category',
+        'region': 'category', 'interest': 'float32'
+    },
+    'worldbank_tourism_real': {
+        'country': 'category', 'country_code': 'category', 'year': 'int16', 'arrivals': 'int32'
+    },
+    'worldbank_indicators_real': {
+        'country': 'category', 'country_code': 'category', 'indicator': 'category',
+        'indicator_name': 'category', 'year': 'int16', 'value': 'float64'
+    },
+    'tourism_complete': {
+        'country': 'category', 'year': 'int16', 'arrivals': 'int32',
+        'trend_interest': 'int16', 'source': 'category'
+    },
+    'occupancy_monthly': {
+        'year': 'int16', 'month': 'int8', 'month_name': 'category', 'occupancy': 'float32',
+        'occupancy_percent': 'float32', 'estimated_revenue': 'int32', 'season': 'category'
+    },
+    'occupancy_daily': {
+        'date': 'datetime64[ns]', 'occupancy_percent': 'float32', 'is_weekend': 'bool',
+        'day_name': 'category', 'week': 'int16'
+    },
+    'arrivals_forecast': {
+        'country': 'category', 'year': 'int16', 'base_arrivals': 'int32', 'arrivals': 'int32',
+        'growth_rate': 'float32', 'trend_interest': 'int16', 'source': 'category'
+    },
+    'occupancy_monthly_bands': {
+        'year': 'int16', 'month': 'int8', 'season': 'category',
+        'occupancy_p10': 'float32', 'occupancy_p50': 'float32', 'occupancy_p90': 'float32'
+    },
+    'occupancy_daily_bands': {
+        'date': 'datetime64[ns]', 'occupancy_p10': 'float32', 'occupancy_p50': 'float32',
+        'occupancy_p90': 'float32'
+    },
+    'arrivals_forecast_bands': {
+        'country': 'category', 'year': 'int16', 'arrivals_p10': 'int32',
+        'arrivals_p50': 'int32', 'arrivals_p90': 'int32'
+    },
+    'properties': {
+        'property_id': 'str', 'name': 'str', 'zone': 'category', 'segment': 'category',
+        'rooms': 'int32', 'rate_alta': 'float32', 'rate_media': 'float32', 'rate_baja': 'float32'
+    },
+    'portfolio_monthly': {
+        'property_id': 'category', 'zone': 'category', 'segment': 'category', 'year': 'int16',
+        'month': 'int8', 'occupancy': 'float32', 'rate': 'float32', 'rooms_sold': 'int32',
+        'revenue': 'float64', 'season': 'category'
+    },
+    'portfolio_daily': {
+        'property_id': 'category', 'zone': 'category', 'segment': 'category',
+        'date': 'datetime64[ns]', 'occupancy': 'float32', 'rate': 'float32',
+        'rooms_sold': 'int32', 'revenue': 'float64'
+    },
+    # Agregados del dashboard: los totales suman miles de mercados y no caben en int32
+    'agg_kpis': {
+        'year': 'int16', 'total_arrivals': 'int64', 'yoy_growth': 'float64', 'top_country': 'str',
+        'avg_occupancy': 'float64', 'total_revenue': 'float64'
+    },
+    'agg_yearly': {
+        'year': 'int16', 'arrivals': 'int64', 'yoy_growth': 'float64'
+    },
+    'agg_country': {
+        'country': 'category', 'year': 'int16', 'arrivals': 'int64', 'prev_arrivals': 'float64',
+        'trend_interest': 'int16', 'growth': 'float64', 'rank': 'int32'
+    },
+    'agg_season_mix': {
+        'season': 'category', 'occupancy_percent': 'float64', 'estimated_revenue': 'int64', 'months': 'int16'
+    },
+    'agg_weekly': {
+        'week': 'int16'
+    }
+}
+
+# Tipos para columnas de datasets sin esquema propio
+DEFAULT_DTYPES = {
+    'country': 'category', 'country_code': 'category', 'source': 'category',
+    'season': 'category', 'year': 'int16', 'month': 'int8', 'arrivals': 'int32',
+    'trend_interest': 'int16', 'occupancy': 'float32', 'date': 'datetime64[ns]'
+}
+
+# Metadatos de corrida: van al manifiesto, no a cada fila
+RUN_METADATA_COLUMNS = ['extracted_at']
+
+
+def apply_schema(df, name):
+    """Convierte las columnas presentes a los tipos canonicos del dataset"""
+    df = df.drop(columns=[c for c in RUN_METADATA_COLUMNS if c in df.columns])
+    for column, dtype in SCHEMAS.get(name, DEFAULT_DTYPES).items():
+        if column not in df.columns or df[column].dtype == dtype:
+            continue
+        if dtype.startswith('datetime'):
+            df[column] = pd.to_datetime(df[column])
+        # Enteros con faltantes se dejan como estan
+        elif dtype.startswith('int') and df[column].isna().any():
+            continue
+        else:
+            _check_range(df[column], dtype, f"{name}.{column}")
+            df[column] = df[column].astype(dtype)
+    return df
+
+
+def _check_range(values, dtype, label):
+    """Un entero que no cabe en el tipo destino daria la vuelta sin error: se rechaza"""
+    if not dtype.startswith('int') or not len(values) or not pd.api.types.is_numeric_dtype(values) \
+            or pd.api.types.is_bool_dtype(values):
+        return
+    info = np.iinfo(dtype)
+    low, high = values.min(), values.max()
+    if low < info.min or high > info.max:
+        raise ValueError(f"{label}: valores entre {low} y {high} no caben en {dtype}")
@@ -0,0 +1,325 @@
+"""
+Almacenamiento de datasets - Parquet/Feather con tipos compactos y CSV opcional
+"""
+import numpy as np
+import pandas as pd
+from datetime import datetime
+import hashlib
+import json
+import operator
+import shutil
+from pathlib import Path
+
+from config import DATA_RAW, DATA_PROCESSED, STORAGE_FORMAT, EXPORT_CSV, STREAM_CHUNK_ROWS
+from src.pipeline.instrument import track_read, track_write
+from src.schema import apply_schema
+
+LAYERS = {'raw': DATA_RAW, 'processed': DATA_PROCESSED}
+EXTENSIONS = {'parquet': '.parquet', 'feather': '.feather', 'csv': '.csv'}
+
+_OPS = {
+    '==': operator.eq, '=': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+    'in': lambda s, v: s.isin(v), 'not in': lambda s, v: ~s.isin(v)
+}
+
+
+def dataset_path(name, layer='processed', fmt=STORAGE_FORMAT):
+    return LAYERS[layer] / f"{name}{EXTENSIONS[fmt]}"
+
+
+def dataset_paths(name, layer='processed'):
+    """Todos los archivos que se escriben para un dataset (el principal primero)"""
+    formats = [STORAGE_FORMAT] + (['csv'] if EXPORT_CSV and STORAGE_FORMAT != 'csv' else [])
+    return [dataset_path(name, layer, fmt) for fmt in formats]
+
+
+def manifest_path(name, layer='processed'):
+    return LAYERS[layer] / f"{name}.manifest.json"
+
+
+def read_manifest(name, layer='processed'):
+    """Metadatos de la ultima escritura del dataset ({} si no hay)"""
+    try:
+        return json.loads(manifest_path(name, layer).read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _write_file(df, path):
+    """Un archivo en el formato que indica su extension"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == '.parquet':
+        df.to_parquet(path, index=False)
+    elif path.suffix == '.feather':
+        df.reset_index(drop=True).to_feather(path)
+    else:
+        df.to_csv(path, index=False)
+
+
+def write_dataset(df, name, layer='processed', metadata=None):
+    """Escribe el dataset en el formato principal (y CSV si EXPORT_CSV)
+
+    Los metadatos de corrida (extracted_at, fuentes...) se guardan en un
+    manifiesto aparte en lugar de repetirse en cada fila.
+    """
+    extracted_at = metadata.get('extracted_at') if metadata else None
+    if extracted_at is None and 'extracted_at' in df.columns and len(df):
+        extracted_at = pd.to_datetime(df['extracted_at']).max()
+
+    df = apply_schema(df, name)
+    paths = dataset_paths(name, layer)
+    for path in paths:
+        _write_file(df, path)
+    track_write(paths, len(df))
+    _write_manifest(name, layer, len(df), df.dtypes, paths, _content_digest([df]), metadata, extracted_at)
+    return paths[0]
+
+
+def _content_digest(frames):
+    """Hash del contenido (valores por fila), sin importar el formato ni como se partio en bloques"""
+    h = hashlib.sha256()
+    for df in frames:
+        h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _save_manifest(name, layer, manifest, digest, extracted_at=None):
+    """Guarda el manifiesto; si el contenido no cambio se conserva la fecha de extraccion anterior
+
+    Asi reescribir los mismos datos deja el manifiesto identico (sin cambios que commitear).
+    """
+    previous = read_manifest(name, layer)
+    if previous.get('digest') == digest and previous.get('extracted_at'):
+        extracted_at = previous['extracted_at']
+    manifest = {**manifest, 'digest': digest, 'extracted_at': str(extracted_at or datetime.now())}
+    manifest_path(name, layer).write_text(json.dumps(manifest, indent=2, default=str))
+
+
+def _write_manifest(name, layer, rows, dtypes, paths, digest, metadata=None, extracted_at=None):
+    manifest = {
+        **{key: value for key, value in (metadata or {}).items() if key != 'extracted_at'},
+        'dataset': name,
+        'rows': rows,
+        'columns': {column: str(dtype) for column, dtype in dtypes.items()},
+        'files': [path.name for path in paths]
+    }
+    _save_manifest(name, layer, manifest, digest, extracted_at)
+
+
+def _plain_values(df):
+    """Categorias -> sus valores: cada bloque trae categorias distintas y el archivo necesita un solo esquema"""
+    categorical = [column for column, dtype in df.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)]
+    if not categorical:
+        return df
+    return df.assign(**{column: df[column].astype(df[column].cat.categories.dtype) for column in categorical})
+
+
+def write_chunks(chunks, name, layer='processed', metadata=None):
+    """Escribe un dataset desde un iterable de bloques sin juntarlos en memoria; devuelve (ruta, filas)
+
+    Cada formato se escribe a un temporal y se reemplaza al final, asi una
+    corrida interrumpida no deja un archivo a medias.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    paths = dataset_paths(name, layer)
+    temps = [path.with_name(path.name + '.tmp') for path in paths]
+    writers, schema, dtypes, rows = {}, None, None, 0
+    digest = hashlib.sha256()
+    try:
+        for chunk in chunks:
+            chunk = apply_schema(chunk, name)
+            if dtypes is None:
+                dtypes = chunk.dtypes
+            plain = _plain_values(chunk)
+            digest.update(pd.util.hash_pandas_object(plain, index=False).to_numpy().tobytes())
+            table = pa.Table.from_pandas(plain, schema=schema, preserve_index=False)
+            schema = table.schema
+            for path, tmp in zip(paths, temps):
+                if path.suffix == '.csv':
+                    plain.to_csv(tmp, mode='a' if rows else 'w', header=not rows, index=False)
+                    continue
+                if tmp not in writers:
+                    tmp.parent.mkdir(parents=True, exist_ok=True)
+                    writers[tmp] = (pq.ParquetWriter(tmp, schema) if path.suffix == '.parquet'
+                                    else pa.ipc.new_file(tmp, schema))
+                writers[tmp].write_table(table)
+            rows += len(chunk)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    if dtypes is None:
+        raise ValueError(f"{name}: no se recibio ningun bloque")
+    for path, tmp in zip(paths, temps):
+        tmp.replace(path)
+    track_write(paths, rows)
+    _write_manifest(name, layer, rows, dtypes, paths, digest.hexdigest(), {**(metadata or {}), 'chunked': True},
+                    (metadata or {}).get('extracted_at'))
+    return paths[0], rows
+
+
+def write_partitioned(df, name, partition_cols, layer='processed', metadata=None):
+    """Escribe un dataset Parquet particionado (un directorio por valor de particion)"""
+    df = apply_schema(df, name)
+    path = LAYERS[layer] / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Se reemplaza completo para no dejar particiones viejas
+    shutil.rmtree(path, ignore_errors=True)
+    df.to_parquet(path, index=False, partition_cols=partition_cols, basename_template='part-{i}.parquet')
+    track_write([path], len(df))
+
+    manifest = {
+        **(metadata or {}),
+        'dataset': name,
+        'rows': len(df),
+        'partition_cols': partition_cols,
+        'columns': {column: str(dtype) for column, dtype in df.dtypes.items()}
+    }
+    _save_manifest(name, layer, manifest, _content_digest([df]))
+    return path
+
+
+def export_dataset(name, directory, fmt=STORAGE_FORMAT, layer='processed'):
+    """Copia el dataset a `directory` en el formato pedido (los particionados quedan en un archivo)"""
+    path = Path(directory) / f"{name}{EXTENSIONS[fmt]}"
+    _write_file(read_dataset(name, layer), path)
+    return path
+
+
+def _apply_filters(df, filters):
+    """Filtros estilo pyarrow [(columna, op, valor), ...] sobre un DataFrame"""
+    mask = pd.Series(True, index=df.index)
+    for column, op, value in filters:
+        mask &= _OPS[op](df[column], value)
+    return df[mask]
+
+
+def _newest(name, layer):
+    """Formato principal, salvo que otro formato sea claramente mas reciente"""
+    if (LAYERS[layer] / name).is_dir():
+        return LAYERS[layer] / name
+
+    candidates = [dataset_path(name, layer, fmt) for fmt in EXTENSIONS]
+    existing = [path for path in candidates if path.exists()]
+    if not existing:
+        raise FileNotFoundError(f"No existe el dataset {name} en {LAYERS[layer]}")
+
+    newest = max(existing, key=lambda path: path.stat().st_mtime)
+    primary = dataset_path(name, layer)
+    # Tolerancia: ambos se escriben en la misma llamada (o llegan juntos por git)
+    if primary.exists() and newest.stat().st_mtime - primary.stat().st_mtime < 60:
+        return primary
+    return newest
+
+
+def dataset_version(name, layer='processed'):
+    """Marca de cambio del dataset: (archivo, mtime_ns, bytes) de lo que leeria read_dataset"""
+    path = _newest(name, layer)
+    files = [p for p in path.rglob('*') if p.is_file()] if path.is_dir() else [path]
+    stats = [f.stat() for f in files]
+    return (str(path), max((st.st_mtime_ns for st in stats), default=0), sum(st.st_size for st in stats))
+
+
+def read_path(path, columns=None, filters=None):
+    """Lee un archivo con proyeccion de columnas y filtro de filas"""
+    path = Path(path)
+    name = path.stem
+    if path.suffix == '.parquet' or path.is_dir():
+        # pyarrow aplica el filtro al leer (salta row groups completos)
+        df = apply_schema(pd.read_parquet(path, columns=columns, filters=filters or None), name)
+        track_read(path, len(df))
+        return df
+
+    # Sin filtros nativos: se leen tambien las columnas filtradas y luego se proyecta
+    read_columns = columns
+    if columns is not None and filters:
+        read_columns = list(columns) + [f[0] for f in filters if f[0] not in columns]
+
+    if path.suffix == '.feather':
+        df = pd.read_feather(path, columns=read_columns)
+    else:
+        df = pd.read_csv(path, usecols=read_columns)
+    df = apply_schema(df, name)
+    if filters:
+        df = _apply_filters(df, filters)
+    track_read(path, len(df))
+    return df if columns is None else df[list(columns)]
+
+
+def _arrow_batches(path, columns, chunk_rows):
+    """Bloques de Arrow leidos a demanda: el siguiente se lee solo cuando se pide"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if path.suffix == '.feather':
+        reader = pa.ipc.open_file(pa.memory_map(str(path)))
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            batch = batch.select(columns) if columns is not None else batch
+            for start in range(0, batch.num_rows, chunk_rows):
+                yield batch.slice(start, chunk_rows)
+    elif path.is_dir():
+        import pyarrow.dataset as ds
+        # Particionado: el escaneo de pyarrow agrega las columnas de particion
+        yield from ds.dataset(path, partitioning='hive').to_batches(columns=columns, batch_size=chunk_rows)
+    else:
+        # Sin pre_buffer: pyarrow no adelanta los row groups siguientes
+        yield from pq.ParquetFile(path, pre_buffer=False).iter_batches(batch_size=chunk_rows, columns=columns)
+
+
+def iter_path(path, columns=None, chunk_rows=STREAM_CHUNK_ROWS):
+    """Lee un archivo por bloques de a lo mas `chunk_rows` filas (la memoria no depende del tamano)"""
+    path = Path(path)
+    name = path.stem
+    if path.suffix == '.csv':
+        blocks = pd.read_csv(path, usecols=columns, chunksize=chunk_rows)
+    else:
+        blocks = (batch.to_pandas() for batch in _arrow_batches(path, columns, chunk_rows) if batch.num_rows)
+
+    first = True
+    for chunk in blocks:
+        # El tamano del archivo se cuenta una sola vez
+        track_read(path, len(chunk), size=None if first else 0)
+        first = False
+        yield apply_schema(chunk, name)
+
+
+def iter_dataset(name, layer='processed', columns=None, chunk_rows=STREAM_CHUNK_ROWS):
+    """Igual que read_dataset, pero por bloques"""
+    return iter_path(_newest(name, layer), columns, chunk_rows)
+
+
+def iter_country_groups(chunks, key='country'):
+    """Rearma los bloques para que ningun pais quede partido entre dos (la entrada va agrupada por pais)"""
+    carry = None
+    for chunk in chunks:
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        keys = chunk[key].astype(str).to_numpy()
+        # Cada pais debe formar un solo tramo contiguo dentro del bloque
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        if len(set(keys[starts])) != len(starts):
+            raise ValueError(f"La entrada no esta agrupada por {key}: no se puede procesar por bloques")
+        # El ultimo pais puede seguir en el proximo bloque
+        last = starts[-1]
+        carry = chunk.iloc[last:]
+        if last:
+            yield chunk.iloc[:last]
+    if carry is not None and len(carry):
+        yield carry
+
+
+def read_dataset(name, layer='processed', columns=None, filters=None):
+    """Lee un dataset desde el formato mas reciente disponible"""
+    return read_path(_newest(name, layer), columns, filters)
+
+
+def read_optional(name, layer='processed', columns=None, filters=None):
+    """Igual que read_dataset, pero devuelve None si no existe o esta vacio"""
+    try:
+        return read_dataset(name, layer, columns, filters)
+    except (FileNotFoundError, pd.errors.EmptyDataError):
+        return None
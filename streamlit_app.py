@@ -3,10 +3,12 @@ Dashboard Cancun Tourism Analytics - Version Completa
 """
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from pathlib import Path
+import numpy as np
+
+from src.dashboard.data import DatasetCache, country_frames, country_lookup
+from src.dashboard.charts import scatter, format_labels
+from src.models.scoring import OccupancyScorer
+from src.models.portfolio import ZONE_OCC_ADJ, SEGMENT_OCC_ADJ
 
 st.set_page_config(
     page_title="Cancun Tourism Analytics",
@@ -24,27 +26,32 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Rutas
-PROCESSED = Path("data/processed")
+# Cache de datos compartido por todas las sesiones: cada dataset se lee la
+# primera vez que una pagina lo pide y se vuelve a leer si el pipeline lo reescribe
+@st.cache_resource
+def get_cache():
+    return DatasetCache()
 
-# Cargar datos
-@st.cache_data
-def load_data():
-    tourism = pd.read_csv(PROCESSED / "tourism_complete.csv")
-    occ_monthly = pd.read_csv(PROCESSED / "occupancy_monthly.csv")
-    occ_daily = pd.read_csv(PROCESSED / "occupancy_daily.csv")
-    forecast_2027 = pd.read_csv(PROCESSED / "arrivals_forecast_2027.csv")
-    
-    occ_daily['date'] = pd.to_datetime(occ_daily['date'])
-    
-    return tourism, occ_monthly, occ_daily, forecast_2027
+def dataset(name, columns=None, optional=False):
+    return get_cache().get(name, columns=columns, optional=optional)
 
-tourism, occ_monthly, occ_daily, forecast_2027 = load_data()
+def derived(name, builder, columns=None):
+    return get_cache().derive(name, builder, columns=columns)
+
+# Modelo de scoring: se carga una vez por proceso y responde escenarios al vuelo
+@st.cache_resource
+def get_scorer():
+    return OccupancyScorer()
 
 # Sidebar
 st.sidebar.title("Menu de Navegacion")
 page = st.sidebar.radio("Selecciona una seccion:", 
-    ["Dashboard Principal", "Predicciones Detalladas", "Analisis por Pais", "Forecast 2027"])
+    ["Dashboard Principal", "Predicciones Detalladas", "Analisis por Pais", "Forecast de Llegadas"])
+
+# Actualizar: descarta datos y modelo cacheados (el resto se detecta solo)
+if st.sidebar.button("🔄 Actualizar datos"):
+    get_cache().clear()
+    get_scorer.clear()
 
 st.sidebar.markdown("---")
 st.sidebar.info("""
@@ -59,32 +66,32 @@ st.sidebar.info("""
 # ============================================
 # PAGINA 1: DASHBOARD PRINCIPAL
 # ============================================
+# plotly se importa dentro de cada pagina: el primer render no espera a cargarlo
 if page == "Dashboard Principal":
+    import plotly.express as px
+    import plotly.graph_objects as go
+
     st.markdown('<p class="main-header">✈️ Cancun Tourism Analytics</p>', unsafe_allow_html=True)
     st.markdown('<p class="sub-header">Dashboard Integral de Analisis Turistico</p>', unsafe_allow_html=True)
     st.markdown("---")
     
+    kpis = dataset("agg_kpis").iloc[0]
+    occ_monthly = dataset("occupancy_monthly", columns=['month_name', 'occupancy_percent', 'estimated_revenue', 'season'])
+    
     # KPIs Principales
-    st.subheader("Metricas Clave 2026")
+    st.subheader(f"Metricas Clave {kpis['year']}")
     col1, col2, col3, col4, col5 = st.columns(5)
     
-    tourism_2026 = tourism[tourism['year'] == 2026]
-    total_arrivals = tourism_2026['arrivals'].sum()
-    avg_occupancy = occ_monthly['occupancy_percent'].mean()
-    top_country = tourism_2026.nlargest(1, 'arrivals')['country'].values[0]
-    total_revenue = occ_monthly['estimated_revenue'].sum()
-    
     with col1:
-        st.metric("Llegadas 2026", f"{total_arrivals/1e6:.2f}M")
+        st.metric(f"Llegadas {kpis['year']}", f"{kpis['total_arrivals']/1e6:.2f}M")
     with col2:
-        st.metric("Ocupacion Promedio", f"{avg_occupancy:.1f}%")
+        st.metric("Ocupacion Promedio", f"{kpis['avg_occupancy']:.1f}%")
     with col3:
-        st.metric("Pais Principal", top_country)
+        st.metric("Pais Principal", kpis['top_country'])
     with col4:
-        growth = ((tourism_2026['arrivals'].sum() - tourism[tourism['year']==2025]['arrivals'].sum()) / tourism[tourism['year']==2025]['arrivals'].sum() * 100)
-        st.metric("Crecimiento Anual", f"+{growth:.1f}%")
+        st.metric("Crecimiento Anual", f"{kpis['yoy_growth']:+.1f}%")
     with col5:
-        st.metric("Revenue Anual", f"${total_revenue/1e6:.1f}M")
+        st.metric("Revenue Anual", f"${kpis['total_revenue']/1e6:.1f}M")
     
     st.markdown("---")
     
@@ -92,8 +99,8 @@ if page == "Dashboard Principal":
     col1, col2 = st.columns(2)
     
     with col1:
-        st.subheader("Top 10 Paises por Llegadas 2026")
-        top10 = tourism_2026.nlargest(10, 'arrivals').sort_values('arrivals', ascending=True)
+        st.subheader(f"Top 10 Paises por Llegadas {kpis['year']}")
+        top10 = dataset("agg_country").head(10).iloc[::-1]
         fig = px.bar(
             top10,
             y='country',
@@ -108,8 +115,8 @@ if page == "Dashboard Principal":
         st.plotly_chart(fig, width='stretch')
     
     with col2:
-        st.subheader("Tendencia Historica 2020-2026")
-        yearly = tourism.groupby('year')['arrivals'].sum().reset_index()
+        yearly = dataset("agg_yearly")
+        st.subheader(f"Tendencia Historica {yearly['year'].min()}-{yearly['year'].max()}")
         fig = px.line(
             yearly,
             x='year',
@@ -121,7 +128,7 @@ if page == "Dashboard Principal":
             x=yearly['year'], 
             y=yearly['arrivals'],
             mode='markers+text',
-            text=yearly['arrivals'].apply(lambda x: f'{x/1e6:.1f}M'),
+            text=format_labels(yearly['arrivals'], '%.1fM', 1e6),
             textposition='top center',
             showlegend=False
         )
@@ -136,7 +143,7 @@ if page == "Dashboard Principal":
     fig.add_trace(go.Bar(
         x=occ_monthly['month_name'],
         y=occ_monthly['occupancy_percent'],
-        text=occ_monthly['occupancy_percent'].apply(lambda x: f'{x:.1f}%'),
+        text=format_labels(occ_monthly['occupancy_percent'], '%.1f%%'),
         textposition='outside',
         marker_color=occ_monthly['occupancy_percent'],
         marker=dict(
@@ -170,7 +177,7 @@ if page == "Dashboard Principal":
     
     with col2:
         st.subheader("Distribucion por Temporada")
-        season_data = occ_monthly.groupby('season')['occupancy_percent'].mean().reset_index()
+        season_data = dataset("agg_season_mix")
         fig = px.pie(
             season_data,
             names='season',
@@ -184,18 +191,38 @@ if page == "Dashboard Principal":
 # PAGINA 2: PREDICCIONES DETALLADAS
 # ============================================
 elif page == "Predicciones Detalladas":
+    import plotly.express as px
+    import plotly.graph_objects as go
+
     st.markdown('<p class="main-header">📊 Predicciones Detalladas</p>', unsafe_allow_html=True)
     st.markdown("---")
     
+    occ_daily = dataset("occupancy_daily")
+    kpis = dataset("agg_kpis").iloc[0]
+    
     # Predicciones diarias (proximos 60 dias)
-    st.subheader("Prediccion Diaria de Ocupacion - Proximos 60 Dias")
+    st.subheader(f"Prediccion Diaria de Ocupacion - Proximos {len(occ_daily)} Dias")
     
+    # Series largas: submuestreo en el servidor y WebGL (src/dashboard/charts.py)
     fig = go.Figure()
     
+    # Banda P10-P90 de los escenarios simulados
+    bands = dataset("occupancy_daily_bands", optional=True)
+    if bands is not None:
+        fig.add_trace(scatter(
+            bands['date'], bands['occupancy_p90'] * 100,
+            mode='lines', line=dict(width=0), showlegend=False, hoverinfo='skip'
+        ))
+        fig.add_trace(scatter(
+            bands['date'], bands['occupancy_p10'] * 100,
+            mode='lines', line=dict(width=0), fill='tonexty',
+            fillcolor='rgba(31, 119, 180, 0.2)', name='Rango P10-P90'
+        ))
+    
     # Linea principal
-    fig.add_trace(go.Scatter(
-        x=occ_daily['date'],
-        y=occ_daily['occupancy_percent'],
+    fig.add_trace(scatter(
+        occ_daily['date'],
+        occ_daily['occupancy_percent'],
         mode='lines',
         name='Ocupacion',
         line=dict(color='blue', width=2)
@@ -203,9 +230,9 @@ elif page == "Predicciones Detalladas":
     
     # Resaltar fines de semana
     weekends = occ_daily[occ_daily['is_weekend']]
-    fig.add_trace(go.Scatter(
-        x=weekends['date'],
-        y=weekends['occupancy_percent'],
+    fig.add_trace(scatter(
+        weekends['date'],
+        weekends['occupancy_percent'],
         mode='markers',
         name='Fines de Semana',
         marker=dict(color='red', size=8, symbol='diamond')
@@ -223,7 +250,7 @@ elif page == "Predicciones Detalladas":
     st.markdown("---")
     st.subheader("Ocupacion Promedio por Semana")
     
-    weekly = occ_daily.groupby('week')['occupancy_percent'].agg(['mean', 'min', 'max']).reset_index()
+    weekly = dataset("agg_weekly").copy()
     weekly['week'] = 'Semana ' + weekly['week'].astype(str)
     
     fig = go.Figure()
@@ -250,12 +277,9 @@ elif page == "Predicciones Detalladas":
     
     with col1:
         st.subheader("Ocupacion: Dias de Semana vs Fin de Semana")
-        weekday_avg = occ_daily[~occ_daily['is_weekend']]['occupancy_percent'].mean()
-        weekend_avg = occ_daily[occ_daily['is_weekend']]['occupancy_percent'].mean()
-        
         comparison = pd.DataFrame({
             'Tipo': ['Dias de Semana', 'Fin de Semana'],
-            'Ocupacion': [weekday_avg, weekend_avg]
+            'Ocupacion': [kpis['weekday_occupancy'], kpis['weekend_occupancy']]
         })
         
         fig = px.bar(
@@ -272,46 +296,95 @@ elif page == "Predicciones Detalladas":
     
     with col2:
         st.subheader("Proximos 7 Dias")
-        next_7 = occ_daily.head(7)[['date', 'day_name', 'occupancy_percent', 'is_weekend']]
-        next_7['Dia'] = next_7['date'].dt.strftime('%d/%m') + ' - ' + next_7['day_name']
-        next_7['Ocupacion (%)'] = next_7['occupancy_percent']
-        next_7['Tipo'] = next_7['is_weekend'].apply(lambda x: '🔴 Fin de Semana' if x else '🔵 Entre Semana')
+        # assign devuelve una tabla nueva: el DataFrame del cache no se modifica
+        week = occ_daily.head(7)
+        next_7 = week.assign(**{
+            'Dia': week['date'].dt.strftime('%d/%m') + ' - ' + week['day_name'].astype(str),
+            'Ocupacion (%)': week['occupancy_percent'],
+            'Tipo': np.where(week['is_weekend'], '🔴 Fin de Semana', '🔵 Entre Semana')
+        })
         
         st.dataframe(
             next_7[['Dia', 'Ocupacion (%)', 'Tipo']],
             width='stretch',
             hide_index=True
         )
+    
+    # Simulador what-if (se calcula en proceso, sin leer archivos)
+    st.markdown("---")
+    st.subheader("Simulador de Escenarios")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        start_date = st.date_input("Fecha inicial", value=occ_daily['date'].min().date())
+        n_days = st.slider("Dias", 7, 365, 60)
+    with col2:
+        rooms = st.number_input("Cuartos", min_value=10, max_value=5000, value=300, step=10)
+        rate = st.number_input("Tarifa promedio (USD)", min_value=20, max_value=2000, value=150, step=10)
+    with col3:
+        zone = st.selectbox("Zona", ['Todas'] + list(ZONE_OCC_ADJ))
+        segment = st.selectbox("Segmento", ['Todos'] + list(SEGMENT_OCC_ADJ))
+    with col4:
+        price_change = st.slider("Cambio de tarifa (%)", -30, 30, 0)
+        demand_shift = st.slider("Ajuste de demanda (pts)", -15, 15, 0)
+    
+    scorer = get_scorer()
+    dates = pd.date_range(start_date, periods=n_days, freq='D').to_numpy()
+    scenario = dict(rooms=rooms, rate=rate,
+                    zone=None if zone == 'Todas' else zone,
+                    segment=None if segment == 'Todos' else segment)
+    base = scorer.score(dates, **scenario)
+    what_if = scorer.score(dates, demand_shift=demand_shift / 100, price_change=price_change / 100, **scenario)
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Ocupacion promedio", f"{what_if['occupancy'].mean() * 100:.1f}%",
+                  f"{(what_if['occupancy'].mean() - base['occupancy'].mean()) * 100:+.1f} pts")
+    with col2:
+        st.metric("Ingresos del periodo", f"${what_if['revenue'].sum() / 1e6:.2f}M",
+                  f"{(what_if['revenue'].sum() / base['revenue'].sum() - 1) * 100:+.1f}%")
+    with col3:
+        st.metric("Cuartos vendidos", f"{what_if['rooms_sold'].sum():,.0f}")
+    
+    fig = go.Figure()
+    fig.add_trace(scatter(dates, base['occupancy'] * 100, mode='lines', name='Base',
+                          line=dict(color='gray', dash='dot')))
+    fig.add_trace(scatter(dates, what_if['occupancy'] * 100, mode='lines', name='Escenario',
+                          line=dict(color='blue', width=2)))
+    fig.update_layout(xaxis_title='Fecha', yaxis_title='Ocupacion (%)', hovermode='x unified', height=400)
+    st.plotly_chart(fig, width='stretch')
 
 # ============================================
 # PAGINA 3: ANALISIS POR PAIS
 # ============================================
 elif page == "Analisis por Pais":
+    import plotly.express as px
+
     st.markdown('<p class="main-header">🌍 Analisis por Pais</p>', unsafe_allow_html=True)
     st.markdown("---")
     
     # Selector de pais
-    countries = sorted(tourism['country'].unique())
+    # Indices precalculados (se rehacen solo si cambian los datos): elegir un pais es O(1)
+    by_country = derived("tourism_complete", country_frames, columns=['country', 'year', 'arrivals'])
+    country_kpis = derived("agg_country", country_lookup)
+    countries = sorted(by_country)
     selected_country = st.selectbox("Selecciona un pais:", countries, index=0)
     
     # Datos del pais
-    country_data = tourism[tourism['country'] == selected_country]
+    country_data = by_country[selected_country]
+    selected_kpis = country_kpis.loc[selected_country]
+    latest_year = int(selected_kpis['year'])
     
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        arrivals_2026 = country_data[country_data['year'] == 2026]['arrivals'].values[0]
-        st.metric("Llegadas 2026", f"{arrivals_2026:,}")
+        st.metric(f"Llegadas {latest_year}", f"{int(selected_kpis['arrivals']):,}")
     
     with col2:
-        growth = ((country_data[country_data['year']==2026]['arrivals'].values[0] - 
-                  country_data[country_data['year']==2025]['arrivals'].values[0]) / 
-                 country_data[country_data['year']==2025]['arrivals'].values[0] * 100)
-        st.metric("Crecimiento 2025-2026", f"{growth:+.1f}%")
+        st.metric(f"Crecimiento {latest_year - 1}-{latest_year}", f"{selected_kpis['growth']:+.1f}%")
     
     with col3:
-        trend = country_data['trend_interest'].values[0]
-        st.metric("Interes Google Trends", f"{trend}/100")
+        st.metric("Interes Google Trends", f"{int(selected_kpis['trend_interest'])}/100")
     
     st.markdown("---")
     
@@ -329,7 +402,7 @@ elif page == "Analisis por Pais":
         x=country_data['year'],
         y=country_data['arrivals'],
         mode='markers+text',
-        text=country_data['arrivals'].apply(lambda x: f'{x/1000:.0f}K'),
+        text=format_labels(country_data['arrivals'], '%.0fK', 1000),
         textposition='top center',
         showlegend=False
     )
@@ -338,12 +411,12 @@ elif page == "Analisis por Pais":
     
     # Comparacion con otros paises
     st.markdown("---")
-    st.subheader("Comparacion con Otros Mercados (2026)")
+    st.subheader(f"Comparacion con Otros Mercados ({latest_year})")
     
-    comparison = tourism[tourism['year'] == 2026][['country', 'arrivals', 'trend_interest']].sort_values('arrivals', ascending=False)
+    comparison = country_kpis[['arrivals', 'trend_interest']].reset_index()
     
-    # Resaltar pais seleccionado
-    comparison['color'] = comparison['country'].apply(lambda x: 'Seleccionado' if x == selected_country else 'Otros')
+    # Resaltar pais seleccionado (mascara vectorizada)
+    comparison['color'] = np.where(comparison['country'].to_numpy() == selected_country, 'Seleccionado', 'Otros')
     
     fig = px.bar(
         comparison,
@@ -357,44 +430,51 @@ elif page == "Analisis por Pais":
     st.plotly_chart(fig, width='stretch')
 
 # ============================================
-# PAGINA 4: FORECAST 2027
+# PAGINA 4: FORECAST DE LLEGADAS
 # ============================================
 else:
-    st.markdown('<p class="main-header">🔮 Forecast 2027</p>', unsafe_allow_html=True)
+    import plotly.graph_objects as go
+
+    st.markdown('<p class="main-header">🔮 Forecast de Llegadas</p>', unsafe_allow_html=True)
     st.markdown("---")
     
+    forecast = dataset("arrivals_forecast")
+    
+    # Ano objetivo (el forecast viene en formato largo pais x ano)
+    years = sorted(forecast['year'].unique())
+    base_year = int(years[0]) - 1
+    target_year = st.selectbox("Ano de proyeccion:", years, index=0)
+    selected = forecast[forecast['year'] == target_year]
+    
     # KPIs Forecast
     col1, col2, col3 = st.columns(3)
     
-    total_2027 = forecast_2027['arrivals_2027_forecast'].sum()
-    avg_growth = forecast_2027['growth_rate'].mean()
-    
     with col1:
-        st.metric("Proyeccion Total 2027", f"{total_2027/1e6:.2f}M")
+        st.metric(f"Proyeccion Total {target_year}", f"{selected['arrivals'].sum()/1e6:.2f}M")
     with col2:
-        st.metric("Crecimiento Promedio", f"+{avg_growth:.1f}%")
+        st.metric("Crecimiento Anual Promedio", f"{selected['growth_rate'].mean():+.1f}%")
     with col3:
-        top_growth = forecast_2027.nlargest(1, 'growth_rate')
-        st.metric("Mayor Crecimiento", f"{top_growth['country'].values[0]} (+{top_growth['growth_rate'].values[0]:.1f}%)")
+        top_growth = selected.nlargest(1, 'growth_rate')
+        st.metric("Mayor Crecimiento", f"{top_growth['country'].values[0]} ({top_growth['growth_rate'].values[0]:+.1f}%)")
     
     st.markdown("---")
     
-    # Comparativa 2026 vs 2027
-    st.subheader("Comparativa 2026 vs 2027 (Forecast)")
+    # Comparativa ano base vs ano proyectado
+    st.subheader(f"Comparativa {base_year} vs {target_year} (Forecast)")
     
     fig = go.Figure()
     
     fig.add_trace(go.Bar(
-        x=forecast_2027['country'],
-        y=forecast_2027['arrivals_2026'],
-        name='2026 (Real)',
+        x=selected['country'],
+        y=selected['base_arrivals'],
+        name=f'{base_year} (Real)',
         marker_color='lightblue'
     ))
     
     fig.add_trace(go.Bar(
-        x=forecast_2027['country'],
-        y=forecast_2027['arrivals_2027_forecast'],
-        name='2027 (Forecast)',
+        x=selected['country'],
+        y=selected['arrivals'],
+        name=f'{target_year} (Forecast)',
         marker_color='darkblue'
     ))
     
@@ -406,21 +486,42 @@ else:
     )
     st.plotly_chart(fig, width='stretch')
     
+    # Historia + proyeccion total
+    st.subheader("Llegadas Totales: Historia y Proyeccion")
+    history_total = dataset("agg_yearly").set_index('year')['arrivals']
+    forecast_total = forecast.groupby('year')['arrivals'].sum()
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=history_total.index, y=history_total.values, mode='lines+markers',
+                             name='Historia', line=dict(color='lightblue', width=3)))
+    fig.add_trace(go.Scatter(x=[base_year] + list(forecast_total.index),
+                             y=[history_total.get(base_year, None)] + list(forecast_total.values),
+                             mode='lines+markers', name='Forecast', line=dict(color='darkblue', dash='dash')))
+    fig.update_layout(xaxis_title='Ano', yaxis_title='Turistas', height=400)
+    st.plotly_chart(fig, width='stretch')
+    
     # Tabla detallada
     st.markdown("---")
     st.subheader("Detalle por Pais")
     
-    display = forecast_2027.copy()
-    display['Pais'] = display['country']
-    display['Llegadas 2026'] = display['arrivals_2026'].apply(lambda x: f'{x:,}')
-    display['Forecast 2027'] = display['arrivals_2027_forecast'].apply(lambda x: f'{x:,}')
-    display['Crecimiento (%)'] = display['growth_rate'].apply(lambda x: f'+{x:.1f}%')
-    display['Interes Google'] = display['trend_interest']
+    # Columnas numericas: el formato lo aplica la tabla (y se ordenan como numeros)
+    display = selected[['country', 'base_arrivals', 'arrivals', 'growth_rate', 'trend_interest']].rename(columns={
+        'country': 'Pais',
+        'base_arrivals': f'Llegadas {base_year}',
+        'arrivals': f'Forecast {target_year}',
+        'growth_rate': 'Crecimiento anual (%)',
+        'trend_interest': 'Interes Google'
+    })
     
     st.dataframe(
-        display[['Pais', 'Llegadas 2026', 'Forecast 2027', 'Crecimiento (%)', 'Interes Google']],
+        display,
         width='stretch',
-        hide_index=True
+        hide_index=True,
+        column_config={
+            f'Llegadas {base_year}': st.column_config.NumberColumn(format='localized'),
+            f'Forecast {target_year}': st.column_config.NumberColumn(format='localized'),
+            'Crecimiento anual (%)': st.column_config.NumberColumn(format='%+.1f%%')
+        }
     )
 
 # Footer
@@ -0,0 +1,34 @@
+"""
+Configuracion de pytest - datos y modelos en un directorio temporal
+"""
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# Antes de importar config: las rutas se fijan al importar
+TMP_ROOT = Path(tempfile.mkdtemp(prefix='cancun-tests-'))
+atexit.register(shutil.rmtree, TMP_ROOT, ignore_errors=True)
+os.environ['CANCUN_DATA_DIR'] = str(TMP_ROOT / 'data')
+os.environ['CANCUN_MODELS_DIR'] = str(TMP_ROOT / 'models')
+
+
+@pytest.fixture
+def data_dir():
+    """Directorio de datos limpio con los datos crudos del repo (sin modelos ni procesados)"""
+    from config import DATA_DIR, DATA_RAW, MODELS_DIR
+    from src.models import registry
+
+    shutil.rmtree(DATA_DIR, ignore_errors=True)
+    shutil.rmtree(MODELS_DIR, ignore_errors=True)
+    shutil.copytree(PROJECT_ROOT / 'data' / 'raw', DATA_RAW)
+    registry._loaded.clear()
+    yield DATA_DIR
+    registry._loaded.clear()
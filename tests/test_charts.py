@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.dashboard.charts import downsample, lttb_indices, minmax_indices
+
+
+def _series(kind, n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    if kind == 'random_walk':
+        return np.cumsum(rng.normal(size=n))
+    if kind == 'spikes':
+        # Seno suave con un pico y un valle aislados: lo primero que se perderia al submuestrear
+        y = np.sin(np.linspace(0, 20, n))
+        y[1234], y[3777] = 9.0, -7.0
+        return y
+    return np.repeat(rng.normal(size=n // 50), 50)  # escalones con valores repetidos
+
+
+SERIES = ['random_walk', 'spikes', 'steps']
+TARGETS = [4, 5, 100, 999]
+
+
+@pytest.mark.parametrize('kind', SERIES)
+@pytest.mark.parametrize('n_out', TARGETS)
+def test_lttb_keeps_endpoints_and_target_length(kind, n_out):
+    y = _series(kind)
+    idx = lttb_indices(np.arange(len(y)), y, n_out)
+
+    assert len(idx) == n_out
+    assert idx[0] == 0 and idx[-1] == len(y) - 1
+    assert (np.diff(idx) > 0).all()
+
+
+@pytest.mark.parametrize('n_out', [100, 999])
+def test_lttb_keeps_isolated_extremes(n_out):
+    y = _series('spikes')
+    idx = lttb_indices(np.arange(len(y)), y, n_out)
+    assert {int(y.argmax()), int(y.argmin())} <= set(idx)
+
+
+def test_lttb_accepts_datetimes():
+    y = _series('random_walk', n=1000)
+    x = pd.date_range('2020-01-01', periods=len(y), freq='h').to_numpy()
+    np.testing.assert_array_equal(lttb_indices(x, y, 50), lttb_indices(np.arange(len(y)) * 3600, y, 50))
+
+
+@pytest.mark.parametrize('kind', SERIES)
+@pytest.mark.parametrize('n_out', TARGETS)
+def test_minmax_keeps_endpoints_and_global_extremes(kind, n_out):
+    y = _series(kind)
+    idx = minmax_indices(y, n_out)
+
+    assert len(idx) <= n_out
+    if kind != 'steps':
+        # Sin valores repetidos cada cubeta aporta dos puntos (salvo los que coinciden con los extremos)
+        assert len(idx) >= n_out - 3
+    assert idx[0] == 0 and idx[-1] == len(y) - 1
+    assert {int(y.argmax()), int(y.argmin())} <= set(idx)
+    assert (np.diff(idx) > 0).all()
+
+
+@pytest.mark.parametrize('func', [lambda y, n: lttb_indices(np.arange(len(y)), y, n), minmax_indices])
+def test_short_series_are_not_downsampled(func):
+    y = _series('random_walk', n=50)
+    np.testing.assert_array_equal(func(y, 50), np.arange(50))
+    np.testing.assert_array_equal(func(y, 2), np.arange(50))
+
+
+@pytest.mark.parametrize('method', ['lttb', 'minmax'])
+def test_downsample_returns_matching_points(method):
+    y = _series('spikes')
+    x = np.arange(len(y)) * 2
+    xs, ys = downsample(x, y, max_points=200, method=method)
+    assert len(xs) == len(ys) <= 200
+    np.testing.assert_array_equal(ys, y[xs // 2])
@@ -0,0 +1,81 @@
+import pytest
+
+from src.cli import main
+from src.pipeline.dag import Stage, plan_stages
+from src.pipeline.stages import build_pipeline
+from src.storage import dataset_paths
+
+
+def _memoized(current):
+    """Funcion con la interfaz de memoize_stage, al dia o no"""
+    def func(**kwargs):
+        pass
+    func.stage_name = 'fake'
+    func.is_current = lambda **kwargs: current
+    return func
+
+
+def _diamond(current):
+    """a -> (b, c) -> d, declaradas fuera de orden; `current` = etapas memoizadas al dia"""
+    return [
+        Stage("d", _memoized("d" in current), deps=["b", "c"]),
+        Stage("c", _memoized("c" in current), deps=["a"]),
+        Stage("b", _memoized("b" in current), deps=["a"]),
+        Stage("a", _memoized("a" in current)),
+        Stage("other", _memoized(False)),
+    ]
+
+
+def _assert_dependency_order(plan):
+    position = {step['stage'].name: i for i, step in enumerate(plan)}
+    for step in plan:
+        assert all(position[dep] < position[step['stage'].name] for dep in step['stage'].deps)
+
+
+@pytest.mark.parametrize('targets, current, force, recompute, reused', [
+    # Nada al dia: toda la clausura se recalcula, en orden de dependencias
+    (["d"], set(), False, {"a", "b", "c", "d"}, set()),
+    # Dependencias al dia: se reportan sin correr
+    (["d"], {"a", "b", "c"}, False, {"d"}, {"a", "b", "c"}),
+    # Si una dependencia se recalcula, lo que depende de ella tambien
+    (["d"], {"b", "c", "d"}, False, {"a", "b", "c", "d"}, set()),
+    (["d"], {"a", "c"}, False, {"b", "d"}, {"a", "c"}),
+    # Pedida y al dia: corre pero se salta sola (memoizada)
+    (["b"], {"a", "b"}, False, set(), {"a"}),
+    # force solo recalcula lo pedido
+    (["b"], {"a", "b"}, True, {"b"}, {"a"}),
+])
+def test_plan_follows_dependencies_and_reports_memoized_stages(targets, current, force, recompute, reused):
+    plan = plan_stages(_diamond(current), targets, force=force)
+
+    _assert_dependency_order(plan)
+    assert "other" not in {step['stage'].name for step in plan}
+    assert {step['stage'].name for step in plan if step['recompute']} == recompute
+    skipped = [step for step in plan if not step['run']]
+    assert {step['stage'].name for step in skipped} == reused
+    assert all(step['reason'] == "al dia" for step in skipped)
+
+
+def test_plan_rejects_unknown_stages_and_cycles():
+    with pytest.raises(ValueError, match="inexistentes"):
+        plan_stages(_diamond(set()), ["missing"])
+    cycle = [Stage("x", _memoized(False), deps=["y"]), Stage("y", _memoized(False), deps=["x"])]
+    with pytest.raises(ValueError, match="Ciclo"):
+        plan_stages(cycle, ["x"])
+
+
+def test_dry_run_reports_memoized_stages_as_skipped(data_dir, capsys):
+    stages = build_pipeline()
+    plan = plan_stages(stages, ["arrivals_forecast"])
+    _assert_dependency_order(plan)
+    assert [step['stage'].name for step in plan][-3:] == ["tourism_complete", "training", "arrivals_forecast"]
+
+    assert main(['run', '--stages', 'tourism_complete', 'training']) == 0
+    capsys.readouterr()
+
+    assert main(['run', '--stages', 'arrivals_forecast', '--dry-run']) == 0
+    actions = {line.split()[0]: line.split()[1] for line in capsys.readouterr().out.splitlines()[1:] if line.strip()}
+    assert actions['tourism_complete'] == actions['training'] == 'omitir'
+    assert actions['arrivals_forecast'] == 'recalcular'
+    # El dry-run no corre nada
+    assert not any(path.exists() for path in dataset_paths("arrivals_forecast"))
@@ -0,0 +1,88 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.dashboard import data
+from src.dashboard.data import DatasetCache
+from src.storage import dataset_paths, write_dataset
+
+
+class FakeClock:
+    now = 0.0
+
+    @classmethod
+    def monotonic(cls):
+        return cls.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    FakeClock.now = 0.0
+    monkeypatch.setattr(data, 'time', FakeClock)
+    return FakeClock
+
+
+def _write(name, values):
+    write_dataset(pd.DataFrame({'value': values}), name)
+
+
+def test_rewritten_dataset_is_reloaded(data_dir, clock):
+    cache = DatasetCache(ttl=600)
+    _write("cache_a", [1, 2, 3])
+    first = cache.get("cache_a")
+    assert cache.get("cache_a") is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Mismo tamano, solo cambia el mtime: tambien invalida
+    _write("cache_a", [4, 5, 6])
+    path = dataset_paths("cache_a")[0]
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1_000_000_000))
+    reloaded = cache.get("cache_a")
+    assert reloaded is not first
+    assert reloaded['value'].tolist() == [4, 5, 6]
+    assert cache.misses == 2
+
+    # Las estructuras derivadas se invalidan con su dataset
+    def total(df):
+        return int(df['value'].sum())
+
+    assert cache.derive("cache_a", total) == 15
+    _write("cache_a", [10])
+    assert cache.derive("cache_a", total) == 10
+
+
+def test_entries_expire_after_ttl(data_dir, clock):
+    cache = DatasetCache(ttl=60)
+    _write("cache_a", [1])
+    first = cache.get("cache_a")
+
+    clock.now = 59.0
+    assert cache.get("cache_a") is first
+    clock.now = 60.0
+    assert cache.get("cache_a") is not first
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_least_recently_used_entry_is_evicted(data_dir, clock):
+    cache = DatasetCache(max_entries=2)
+    for name in ("cache_a", "cache_b", "cache_c"):
+        _write(name, [1])
+
+    a = cache.get("cache_a")
+    cache.get("cache_b")
+    assert cache.get("cache_a") is a  # a pasa a ser la mas reciente
+    cache.get("cache_c")  # sale b
+
+    assert len(cache) == 2
+    misses = cache.misses
+    assert cache.get("cache_a") is a
+    cache.get("cache_b")
+    assert cache.misses == misses + 1
+
+
+def test_missing_optional_dataset(data_dir, clock):
+    cache = DatasetCache()
+    assert cache.get("cache_missing", optional=True) is None
+    with pytest.raises(FileNotFoundError):
+        cache.get("cache_missing")
@@ -0,0 +1,76 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from src.extractors.http_cache import ResponseCache, cached_frame, cached_get
+from src.extractors.worldbank_extractor import cache_ttl
+
+URL = 'https://api.example.org/indicator'
+
+
+class StubResponse:
+    def __init__(self, status_code, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+class StubSession:
+    """Devuelve las respuestas en orden y guarda los headers de cada GET"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.requests.append(headers or {})
+        return self.responses.pop(0)
+
+
+def test_provisional_years_are_always_revalidated(tmp_path):
+    year = datetime.now().year
+    assert cache_ttl(f"2010:{year - 5}") is None
+    assert cache_ttl(f"2010:{year}") == 0
+
+    cache = ResponseCache(tmp_path)
+    session = StubSession(StubResponse(200, b'[1]', {'ETag': '"v1"'}), StubResponse(200, b'[2]'))
+    cached_get(session, URL, cache=cache)
+    # Entrada recien guardada (fresca con el TTL normal), pero con anos preliminares se vuelve a pedir
+    assert cached_get(session, URL, cache=cache).from_cache
+    response = cached_get(session, URL, cache=cache, ttl=cache_ttl(f"2010:{year}"))
+    assert response.content == b'[2]'
+    assert session.requests[-1] == {'If-None-Match': '"v1"'}
+
+
+def test_not_modified_reuses_the_body_and_refreshes_the_ttl(tmp_path, monkeypatch):
+    cache = ResponseCache(tmp_path, ttl=60)
+    session = StubSession(StubResponse(200, b'{"a": 1}', {'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024'}),
+                          StubResponse(304))
+    cached_get(session, URL, params={'page': 1}, cache=cache)
+    key = cache.make_key(URL, {'page': 1})
+
+    # Vence el TTL: se pide de nuevo con GET condicional
+    stored_at = cache.get(key)[0]['stored_at']
+    monkeypatch.setattr('time.time', lambda: stored_at + 120)
+    response = cached_get(session, URL, params={'page': 1}, cache=cache)
+
+    assert session.requests[-1] == {'If-None-Match': '"v1"', 'If-Modified-Since': 'Mon, 01 Jan 2024'}
+    assert response.from_cache and response.json() == {'a': 1}
+    meta, body = cache.get(key)
+    assert body == b'{"a": 1}' and meta['etag'] == '"v1"'
+    assert meta['stored_at'] == stored_at + 120 and cache.is_fresh(meta)
+
+    # Ya revalidada: no hay otra peticion
+    assert cached_get(session, URL, params={'page': 1}, cache=cache).from_cache
+    assert len(session.requests) == 2
+
+
+def test_cached_frames_keep_their_dtypes(tmp_path):
+    cache = ResponseCache(tmp_path)
+    df = pd.DataFrame({'date': pd.date_range('2026-01-04', periods=3, freq='W'), 'Cancun': [50, 60, 70],
+                       'isPartial': [False, False, True]})
+    cold = cached_frame(cache, 'pytrends/demo', {'kw': 'Cancun'}, lambda: df)
+    warm = cached_frame(cache, 'pytrends/demo', {'kw': 'Cancun'}, lambda: pytest.fail("deberia salir del cache"))
+    pd.testing.assert_frame_equal(warm, cold)
+    assert pd.api.types.is_datetime64_any_dtype(warm['date'])
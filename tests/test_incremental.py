@@ -0,0 +1,152 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from src.extractors import worldbank_extractor
+from src.extractors.incremental import _to_weekly, missing_keys, stitch_trends
+from src.extractors.worldbank_extractor import (INDICATOR_COLUMNS, INDICATOR_KEY, extract_indicators,
+                                                plan_incremental)
+from src.storage import read_manifest
+
+NOW = datetime.now().year
+FINAL = NOW - 4  # Ano definitivo (fuera de la ventana preliminar)
+PROVISIONAL = NOW - 1
+CODES = {'United States': 'USA', 'Canada': 'CAN'}
+KEY = ['code', 'year']
+
+
+def keys(*rows, columns=KEY):
+    return pd.DataFrame(list(rows), columns=columns)
+
+
+@pytest.mark.parametrize('existing, final, empty, expected', [
+    (None, None, None, [('A', 1), ('A', 2), ('B', 1)]),
+    (keys(('A', 1)), None, None, [('A', 2), ('B', 1)]),
+    # Lo presente pero no final se vuelve a pedir
+    (keys(('A', 1), ('A', 2)), [True, False], None, [('A', 2), ('B', 1)]),
+    # Lo consultado y vacio no se vuelve a pedir
+    (None, None, keys(('B', 1)), [('A', 1), ('A', 2)]),
+    (keys(('A', 1)), None, keys(('B', 1)), [('A', 2)]),
+    (keys(('A', 1), ('A', 2), ('B', 1)), None, None, []),
+])
+def test_missing_keys(existing, final, empty, expected):
+    wanted = keys(('A', 1), ('A', 2), ('B', 1))
+    final_mask = pd.Series(final, index=existing.index) if final is not None else None
+
+    out = missing_keys(existing, wanted, KEY, final_mask, empty)
+
+    assert list(out.itertuples(index=False, name=None)) == expected
+    assert list(out.columns) == KEY
+
+
+def indicator_rows(*rows):
+    return keys(*rows, columns=INDICATOR_KEY)
+
+
+@pytest.mark.parametrize('existing, empty, expected', [
+    # Sin datos: una consulta con todo
+    (None, None, [({'USA', 'CAN'}, ['A', 'B'], f"{FINAL}:{PROVISIONAL}")]),
+    # Anos definitivos completos: solo se piden los preliminares
+    (indicator_rows(*[(c, i, FINAL) for c in ('USA', 'CAN') for i in 'AB']), None,
+     [({'USA', 'CAN'}, ['A', 'B'], f"{NOW - 3}:{PROVISIONAL}")]),
+    # Un pais completo en definitivos y el otro sin datos: consultas separadas
+    (indicator_rows(('USA', 'A', FINAL), ('USA', 'B', FINAL)), None,
+     [({'CAN'}, ['A', 'B'], f"{FINAL}:{PROVISIONAL}"), ({'USA'}, ['A', 'B'], f"{NOW - 3}:{PROVISIONAL}")]),
+    # Una clave definitiva sin valor en la API no se vuelve a pedir
+    (indicator_rows(('USA', 'A', FINAL), ('CAN', 'A', FINAL), ('CAN', 'B', FINAL)),
+     indicator_rows(('USA', 'B', FINAL)),
+     [({'USA', 'CAN'}, ['A', 'B'], f"{NOW - 3}:{PROVISIONAL}")]),
+    # Una clave preliminar vacia si se vuelve a pedir: aun puede publicarse
+    (None, indicator_rows(('USA', 'A', PROVISIONAL), ('USA', 'B', PROVISIONAL)),
+     [({'USA', 'CAN'}, ['A', 'B'], f"{FINAL}:{PROVISIONAL}")]),
+])
+def test_plan_incremental(existing, empty, expected):
+    plan = plan_incremental(existing, ['A', 'B'], CODES, f"{FINAL}:{PROVISIONAL}", empty=empty)
+
+    assert [(set(codes.values()), inds, span) for codes, inds, span in plan] == expected
+    for codes, _, _ in plan:
+        assert all(CODES[country] == code for country, code in codes.items())
+
+
+def test_plan_incremental_is_empty_when_only_empty_final_keys_are_missing():
+    existing = indicator_rows(('USA', 'A', FINAL), ('CAN', 'A', FINAL))
+    empty = indicator_rows(('USA', 'B', FINAL), ('CAN', 'B', FINAL))
+
+    assert plan_incremental(existing, ['A', 'B'], CODES, f"{FINAL}:{FINAL}", empty=empty) == []
+
+
+def test_extract_indicators_skips_keys_the_api_returned_empty(data_dir, monkeypatch):
+    requests = []
+
+    def fake_fetch(indicators, country_codes, date_range='2019:2023', **kwargs):
+        requests.append((sorted(country_codes.values()), list(indicators), date_range))
+        start, end = map(int, date_range.split(':'))
+        # Canada nunca publica el indicador B
+        rows = [
+            (country, code, ind, ind, year, 1.0)
+            for country, code in country_codes.items() for ind in indicators
+            for year in range(start, end + 1) if not (code == 'CAN' and ind == 'B')
+        ]
+        return pd.DataFrame(rows, columns=INDICATOR_COLUMNS)
+
+    monkeypatch.setattr(worldbank_extractor, 'fetch_indicators', fake_fetch)
+
+    extract_indicators(['A', 'B'], CODES, use_cache=False)
+    manifest = read_manifest("worldbank_indicators_real", 'raw')
+    assert manifest['empty_keys'] == [['CAN', 'B', year] for year in range(2019, 2024)]
+
+    # La segunda corrida incremental no consulta la API por la clave vacia
+    requests.clear()
+    extract_indicators(['A', 'B'], CODES, use_cache=False, incremental=True)
+    assert requests == []
+
+
+@pytest.mark.parametrize('days, values, partial, expected', [
+    # Diario: semanas de domingo a sabado; la ultima queda incompleta
+    (10, list(range(10)), [False] * 9 + [True],
+     [('2026-01-04', 3.0, False), ('2026-01-11', 8.0, True)]),
+    # Semana completa sin partial: no se marca
+    (7, [7] * 7, [False] * 7, [('2026-01-04', 7.0, False)]),
+    # Un dia parcial marca toda su semana
+    (7, [1] * 7, [False] * 6 + [True], [('2026-01-04', 1.0, True)]),
+])
+def test_to_weekly(days, values, partial, expected):
+    df = pd.DataFrame({'date': pd.date_range('2026-01-04', periods=days).strftime('%Y-%m-%d'),
+                       'kw': values, 'isPartial': partial})
+
+    out = _to_weekly(df, 'kw')
+
+    assert [(f"{date:%Y-%m-%d}", row.kw, bool(row.isPartial)) for date, row in out.iterrows()] == expected
+
+
+def test_to_weekly_keeps_weekly_input():
+    df = pd.DataFrame({'date': ['2026-01-04', '2026-01-11'], 'kw': [5, 6], 'isPartial': [False, True]})
+    out = _to_weekly(df, 'kw')
+    assert out['kw'].tolist() == [5, 6]
+    assert out.index.tolist() == list(pd.to_datetime(df['date']))
+
+
+def weekly(dates, values, partial=None):
+    return pd.DataFrame({'date': dates, 'kw': values, 'isPartial': partial or [False] * len(dates)})
+
+
+@pytest.mark.parametrize('new, expected', [
+    # Misma escala en el solape: se agregan las semanas nuevas tal cual
+    (weekly(['2026-01-11', '2026-01-18', '2026-01-25'], [20, 30, 40]),
+     [('2026-01-04', 10), ('2026-01-11', 20), ('2026-01-18', 30), ('2026-01-25', 40)]),
+    # La ventana nueva viene a escala doble: se reescala con el solape
+    (weekly(['2026-01-11', '2026-01-18', '2026-01-25'], [40, 60, 80]),
+     [('2026-01-04', 10), ('2026-01-11', 20), ('2026-01-18', 30), ('2026-01-25', 40)]),
+    # Sin solape: no se reescala
+    (weekly(['2026-01-25'], [7]),
+     [('2026-01-04', 10), ('2026-01-11', 20), ('2026-01-25', 7)]),
+])
+def test_stitch_trends(new, expected):
+    existing = weekly(['2026-01-04', '2026-01-11', '2026-01-18'], [10, 20, 99], [False, False, True])
+
+    out = stitch_trends(existing, new, 'kw', pd.Timestamp('2026-01-11'))
+
+    # La semana parcial vieja (01-18) se reemplaza por la nueva
+    assert list(out[['date', 'kw']].itertuples(index=False, name=None)) == expected
+    assert list(out.columns) == ['date', 'kw', 'isPartial']
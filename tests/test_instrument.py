@@ -0,0 +1,22 @@
+import cProfile
+
+from src.pipeline.dag import Stage, run_dag
+from src.pipeline.instrument import stage_metrics
+
+
+def test_busy_profiler_falls_back_to_plain_metrics(monkeypatch):
+    # Python 3.12+: "Another profiling tool is already active"
+    def busy(self):
+        raise ValueError("Another profiling tool is already active")
+    monkeypatch.setattr(cProfile.Profile, 'enable', busy)
+
+    with stage_metrics('etapa', profile='cprofile') as metrics:
+        sum(range(1000))
+    assert metrics.profile is None
+    assert metrics.wall_seconds is not None
+
+
+def test_profiled_run_profiles_every_stage():
+    stages = [Stage(name, lambda: sum(range(1000))) for name in ('a', 'b', 'c')]
+    report = run_dag(stages, max_workers=3, run_file=None, profile='cprofile')
+    assert all(result['status'] == 'ok' and result['metrics']['profile'] for result in report['stages'].values())
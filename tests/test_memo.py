@@ -0,0 +1,26 @@
+from pathlib import Path
+
+from src.pipeline import memo
+from src.models.predictor import predict_occupancy_monthly
+import src.models.predictor as predictor
+
+SRC = Path(predictor.__file__).resolve().parents[1]
+
+
+def test_code_files_follow_project_imports():
+    files = memo.code_files(predictor.__file__)
+    for module in ['models/predictor.py', 'models/occupancy.py', 'models/training.py', 'schema.py', 'storage.py']:
+        assert SRC / module in files
+    # Las dependencias externas no cuentan
+    assert all(SRC.parent in file.parents for file in files)
+
+
+def test_editing_an_imported_module_invalidates_the_stage(data_dir, monkeypatch):
+    predict_occupancy_monthly()
+    assert predict_occupancy_monthly.is_current()
+
+    digest = memo.file_digest
+    occupancy = SRC / 'models' / 'occupancy.py'
+    monkeypatch.setattr(memo, 'file_digest',
+                        lambda path: 'editado' if Path(path).resolve() == occupancy else digest(path))
+    assert not predict_occupancy_monthly.is_current()
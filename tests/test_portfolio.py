@@ -0,0 +1,31 @@
+import pandas as pd
+import pytest
+
+from src.cli import main
+from src.models.occupancy import DAILY_NOISE, SEGMENT_OCC_ADJ, ZONE_OCC_ADJ
+from src.models.portfolio import forecast_portfolio
+from src.models.scoring import OccupancyScorer
+
+
+@pytest.fixture
+def trained(data_dir):
+    assert main(['run', '--stages', 'tourism_complete', 'training']) == 0
+    return data_dir
+
+
+def test_worker_count_does_not_change_results(trained):
+    serial = forecast_portfolio(start='2026-01-01', max_workers=1, force=True)
+    parallel = forecast_portfolio(start='2026-01-01', max_workers=3, force=True)
+    for left, right in zip(serial, parallel):
+        pd.testing.assert_frame_equal(left, right)
+
+
+def test_daily_occupancy_comes_from_the_demand_model(trained):
+    scorer = OccupancyScorer()
+    assert scorer.version is not None
+
+    _, daily = forecast_portfolio(start='2026-01-01', days=90, max_workers=1, force=True)
+    adjust = (daily['zone'].astype(object).map(ZONE_OCC_ADJ) + daily['segment'].astype(object).map(SEGMENT_OCC_ADJ))
+    # Solo el ruido por propiedad separa el portafolio del scorer
+    low, high = (scorer.occupancy(daily['date'].to_numpy(), adjust.to_numpy() + noise) for noise in DAILY_NOISE)
+    assert ((daily['occupancy'] >= low - 1e-6) & (daily['occupancy'] <= high + 1e-6)).all()
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.predictor import project_arrivals
+from src.models.scenarios import arrivals_bands
+
+BASE_YEAR = 2026
+# Crecimiento anual de cada pais (el ruido le da dispersion a la historia)
+GROWTH = {'Up': 0.08, 'Flat': 0.0, 'Down': -0.05}
+
+
+def _history(seed=0):
+    rng = np.random.default_rng(seed)
+    years = np.arange(2020, BASE_YEAR + 1)
+    rows = [
+        {'country': country, 'year': year, 'trend_interest': 50,
+         'arrivals': int(1_000_000 * (1 + g) ** (year - 2020) * rng.uniform(0.98, 1.02))}
+        for country, g in GROWTH.items() for year in years
+    ]
+    return pd.DataFrame(rows)
+
+
+@pytest.mark.parametrize('horizon', [1, 3, 5, 10])
+def test_multi_year_projection_shape_and_direction(data_dir, horizon):
+    forecast = project_arrivals(_history(), horizon)
+
+    assert len(forecast) == len(GROWTH) * horizon
+    for country, group in forecast.groupby('country'):
+        assert len(group) == horizon
+        assert group['year'].tolist() == list(range(BASE_YEAR + 1, BASE_YEAR + horizon + 1))
+        assert (group['base_arrivals'] == group['base_arrivals'].iloc[0]).all()
+        # Crecimiento compuesto: la serie va en la direccion del crecimiento del pais
+        path = np.concatenate([[group['base_arrivals'].iloc[0]], group['arrivals']])
+        if GROWTH[country]:
+            assert (np.sign(np.diff(path)) == np.sign(GROWTH[country])).all()
+    assert (forecast['source'] == 'history').all()
+
+
+@pytest.mark.parametrize('horizon', [3, 10])
+def test_multi_year_bands_are_ordered_and_widen(data_dir, horizon):
+    history = _history()
+    bands = arrivals_bands(history, horizon, n_paths=20_000, seed=0)
+    forecast = project_arrivals(history, horizon)
+
+    assert len(bands) == len(forecast)
+    assert (bands[['country', 'year']].to_numpy() == forecast[['country', 'year']].to_numpy()).all()
+    assert ((bands['arrivals_p10'] <= bands['arrivals_p50']) & (bands['arrivals_p50'] <= bands['arrivals_p90'])).all()
+    np.testing.assert_allclose(bands['arrivals_p50'], forecast['arrivals'], rtol=0.01)
+
+    # Ancho relativo de la banda ~ raiz del plazo
+    bands['relative'] = (bands['arrivals_p90'] - bands['arrivals_p10']) / bands['arrivals_p50']
+    for _, group in bands.groupby('country'):
+        steps = group['year'].to_numpy() - BASE_YEAR
+        assert (np.diff(group['relative']) > 0).all()
+        np.testing.assert_allclose(group['relative'] / np.sqrt(steps), group['relative'].iloc[0], rtol=0.05)
@@ -0,0 +1,34 @@
+import json
+import shutil
+
+from config import MODELS_DIR
+from src.extractors.intelligent_generator import generate_current_data
+from src.models.predictor import forecast_arrivals_by_country, predict_occupancy_monthly
+from src.models.registry import REGISTRY_FILE, load_registry, model_digests
+from src.models.training import train_models
+
+
+def test_identical_retrain_keeps_the_registry(data_dir):
+    generate_current_data()
+    train_models()
+    before = REGISTRY_FILE.read_bytes()
+
+    train_models(force=True)
+    assert REGISTRY_FILE.read_bytes() == before
+    assert all(entry['current'] == 1 for entry in load_registry().values())
+
+
+def test_forecasts_stay_current_after_retraining_from_scratch(data_dir):
+    generate_current_data()
+    train_models()
+    predict_occupancy_monthly()
+    forecast_arrivals_by_country()
+    digests = model_digests("demand", "arrivals")
+
+    # Sin modelos (como en CI): se reentrena con otra fecha, pero el contenido es el mismo
+    shutil.rmtree(MODELS_DIR)
+    train_models()
+    assert model_digests("demand", "arrivals") == digests
+    assert json.loads(REGISTRY_FILE.read_text())['arrivals']['current'] == 1
+    assert predict_occupancy_monthly.is_current()
+    assert forecast_arrivals_by_country.is_current()
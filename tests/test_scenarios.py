@@ -0,0 +1,30 @@
+import numpy as np
+
+from src.models.scenarios import simulate_bands
+
+NOISE = ('normal', 0.0, 0.05)
+
+
+def test_one_period_per_chunk():
+    center = np.linspace(0.5, 0.7, 6)
+    # Una sola columna de 20k trayectorias ya pasa el limite: un periodo por bloque
+    bands = simulate_bands(center, NOISE, n_paths=20_000, chunk_mb=0.01)
+    assert bands.shape == (3, 6)
+    assert (np.diff(bands, axis=0) > 0).all()
+    np.testing.assert_allclose(bands[1], center, atol=0.003)
+    np.testing.assert_allclose(bands[2] - bands[0], 2 * 1.2816 * 0.05, atol=0.003)
+
+    multi = simulate_bands(center, NOISE, n_paths=20_000, chunk_mb=0.01, max_workers=2)
+    np.testing.assert_array_equal(multi, bands)
+
+
+def test_scalar_and_empty_horizons():
+    assert simulate_bands(0.6, NOISE, n_paths=1_000).shape == (3, 1)
+    assert simulate_bands(np.array([]), NOISE, n_paths=1_000).shape == (3, 0)
+
+
+def test_chunking_keeps_the_distribution():
+    center = np.full(40, 0.6)
+    whole = simulate_bands(center, NOISE, n_paths=5_000)
+    split = simulate_bands(center, NOISE, n_paths=5_000, chunk_mb=0.05)
+    np.testing.assert_allclose(whole, split, atol=0.005)
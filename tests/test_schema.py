@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.processors.aggregates import yearly_totals
+from src.schema import apply_schema
+from src.storage import read_dataset, write_dataset
+
+
+def test_downcast_that_does_not_fit_is_refused():
+    df = pd.DataFrame({'year': [2024], 'arrivals': [3_000_000_000]})
+    with pytest.raises(ValueError, match='int32'):
+        apply_schema(df, 'tourism_complete')
+    assert apply_schema(df.assign(arrivals=1_000), 'tourism_complete')['arrivals'].dtype == 'int32'
+
+
+def test_yearly_totals_of_many_markets_keep_their_value(data_dir):
+    n = 2000
+    tourism = apply_schema(pd.DataFrame({
+        'country': np.repeat([f"M{i}" for i in range(n)], 2),
+        'year': np.tile([2021, 2022], n),
+        'arrivals': np.full(2 * n, 1_231_613),
+        'trend_interest': 50
+    }), 'tourism_complete')
+
+    write_dataset(yearly_totals(tourism), 'agg_yearly')
+    yearly = read_dataset('agg_yearly')
+    assert yearly['arrivals'].dtype == 'int64'
+    assert yearly['arrivals'].tolist() == [n * 1_231_613] * 2
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from src.models.occupancy import daily_occupancy
+from src.models.scoring import OccupancyScorer
+
+
+class _NoNoise:
+    def uniform(self, low, high, size):
+        return np.zeros(size)
+
+
+def test_scorer_without_model_matches_heuristic_engine(data_dir):
+    scorer = OccupancyScorer()
+    assert scorer.version is None
+
+    # Dos anos desde un 29 de febrero: el mes sale de la fecha, no del dia del ano
+    heuristic = daily_occupancy('2028-02-29', 730, rng=_NoNoise())
+    occupancy = scorer.occupancy(heuristic['date'].to_numpy())
+    np.testing.assert_allclose(np.round(occupancy * 100, 1), heuristic['occupancy_percent'])
+    assert abs(occupancy.mean() - heuristic['occupancy_percent'].mean() / 100) < 1e-3
+
+
+def test_scorer_without_model_broadcasts_over_scenarios(data_dir):
+    scorer = OccupancyScorer()
+    dates = pd.date_range('2026-01-01', periods=10).to_numpy()
+    result = scorer.score(dates[None, :], rooms=np.array([[100], [200]]))
+    assert result['rooms_sold'].shape == (2, 10)
+    np.testing.assert_allclose(result['rooms_sold'][1], 2 * result['rooms_sold'][0])
+
+
+def test_scorer_accepts_a_model_without_metadata(data_dir):
+    from sklearn.linear_model import Ridge
+
+    from src.models.training import FOURIER_ORDER
+
+    # Solo armonicos: sin origen la tendencia se ignora, el resto del modelo se usa igual
+    model = Ridge().fit(np.eye(1 + 2 * FOURIER_ORDER), np.linspace(0.5, 0.8, 1 + 2 * FOURIER_ORDER))
+    scorer = OccupancyScorer(model)
+    assert scorer.version is None and scorer.trend_per_year == 0.0
+
+    origin = pd.to_datetime(['2026-01-01']).to_numpy()
+    with_metadata = OccupancyScorer(model, {'origin': '2026-01-01', 'version': 3})
+    assert with_metadata.version == 3
+    # En el origen la tendencia es cero: misma ocupacion con y sin metadatos
+    np.testing.assert_allclose(scorer.occupancy(origin), with_metadata.occupancy(origin))
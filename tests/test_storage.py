@@ -0,0 +1,45 @@
+import json
+
+import pandas as pd
+
+from config import DATA_PROCESSED
+from src.cli import main
+from src.extractors.intelligent_generator import generate_current_data
+from src.storage import manifest_path, write_chunks, write_dataset
+
+STAGES = ['run', '--stages', 'tourism_complete', 'training', 'occupancy_monthly', 'arrivals_forecast',
+          'aggregates']
+
+
+def _tracked_files():
+    """Lo que el workflow commitea (sin pipeline_run.json, que esta en .gitignore)"""
+    return {path.relative_to(DATA_PROCESSED): path.read_bytes() for path in sorted(DATA_PROCESSED.rglob('*'))
+            if path.is_file() and path.name != 'pipeline_run.json'}
+
+
+def test_rewriting_the_same_data_keeps_the_manifest(data_dir):
+    df = pd.DataFrame({'country': ['A', 'B'], 'year': [2024, 2024], 'arrivals': [10, 20]})
+    write_dataset(df, 'demo')
+    before = manifest_path('demo').read_bytes()
+    write_dataset(df.copy(), 'demo', metadata={'extracted_at': '2030-01-01'})
+    assert manifest_path('demo').read_bytes() == before
+
+    write_dataset(df.assign(arrivals=[10, 21]), 'demo', metadata={'extracted_at': '2030-01-01'})
+    assert json.loads(manifest_path('demo').read_text())['extracted_at'] == '2030-01-01'
+
+
+def test_chunked_digest_does_not_depend_on_the_chunks(data_dir):
+    df = pd.DataFrame({'country': list('ABCDEF'), 'year': 2024, 'arrivals': range(6)})
+    write_chunks([df.iloc[:2], df.iloc[2:]], 'demo')
+    first = json.loads(manifest_path('demo').read_text())
+    write_chunks([df.iloc[:5], df.iloc[5:]], 'demo')
+    assert json.loads(manifest_path('demo').read_text()) == first
+
+
+def test_unchanged_refresh_leaves_tracked_files_identical(data_dir):
+    assert main(STAGES) == 0
+    before = _tracked_files()
+    # Se regeneran los mismos datos (como un extractor que vuelve a bajar lo mismo)
+    generate_current_data(force=True)
+    assert main(STAGES) == 0
+    assert _tracked_files() == before
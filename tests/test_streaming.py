@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.cli import main
+from src.models.predictor import forecast_arrivals_by_country
+from src.models.registry import load_model, model_digests
+from src.models.training import train_arrivals_model
+from src.storage import iter_country_groups, read_dataset
+
+STAGES = ['run', '--stages', 'tourism_complete', 'training', 'arrivals_forecast']
+
+
+def _outputs():
+    model, _ = load_model("arrivals")
+    return read_dataset("tourism_complete"), read_dataset("arrivals_forecast"), model
+
+
+def _assert_same(left, right):
+    for a, b in zip(left[:2], right[:2]):
+        pd.testing.assert_frame_equal(a, b, check_categorical=False)
+    pd.testing.assert_frame_equal(left[2], right[2])
+
+
+def test_chunked_pipeline_matches_in_memory(data_dir):
+    assert main(STAGES) == 0
+    in_memory, digests = _outputs(), model_digests("arrivals")
+
+    # Bloques de 9 filas: un pais (7 anos) por bloque al generar, paises partidos al leer
+    assert main(STAGES + ['--chunk-rows', '9']) == 0
+    _assert_same(_outputs(), in_memory)
+    assert model_digests("arrivals") == digests
+
+
+def test_chunked_markets_do_not_depend_on_chunk_size(data_dir, tmp_path):
+    n = 300
+    rng = np.random.default_rng(0)
+    markets = tmp_path / "markets.parquet"
+    pd.DataFrame({
+        'country': [f"M{i:04d}" for i in range(n)],
+        'base_arrivals': rng.integers(1_000, 1_000_000, n),
+        'interest': np.where(rng.random(n) < 0.3, np.nan, rng.uniform(1, 100, n))
+    }).to_parquet(markets, index=False)
+
+    assert main(STAGES + ['--markets', str(markets), '--chunk-rows', '50']) == 0
+    small = _outputs()
+    assert len(small[0]) == n * 7
+
+    assert main(STAGES + ['--markets', str(markets), '--chunk-rows', '1000000']) == 0
+    _assert_same(_outputs(), small)
+
+    # Mismo resultado que el modelo y el forecast en memoria sobre la misma tabla
+    model, _ = train_arrivals_model(small[0])
+    pd.testing.assert_frame_equal(model, small[2])
+    forecast_arrivals_by_country(force=True)
+    pd.testing.assert_frame_equal(read_dataset("arrivals_forecast"), small[1], check_categorical=False)
+
+
+def test_country_groups_require_grouped_input():
+    df = pd.DataFrame({'country': ['A', 'A', 'B', 'B', 'C'], 'year': range(5)})
+    # B llega partida entre los dos bloques y sale entera
+    groups = list(iter_country_groups([df.iloc[:3], df.iloc[3:]]))
+    assert [g['country'].tolist() for g in groups] == [['A', 'A'], ['B', 'B'], ['C']]
+
+    with pytest.raises(ValueError):
+        list(iter_country_groups([df.iloc[[0, 2, 1]]]))
+
+
+def test_chunked_peak_memory_does_not_grow_with_input(tmp_path):
+    # Version chica de benchmarks/bench_streaming.py: cada tamano en su propio proceso
+    from benchmarks.bench_streaming import ceiling_mb, run_child, write_markets_apart
+
+    small, large = [
+        run_child(write_markets_apart(tmp_path / f"markets_{n}.parquet", n), 20_000, 'bloques', tmp_path / str(n))
+        for n in (20_000, 80_000)
+    ]
+    assert large['rows'] == 4 * small['rows']
+    # Con 32 MB de holgura el modo en memoria (~+115 MB con 4x filas) ya se pasa
+    assert large['peak_mb'] <= ceiling_mb(small, large, margin_mb=32)
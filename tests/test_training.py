@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from src.models.training import TRAIN_FROM_YEAR, fit_trends, country_sums, train_arrivals_model
+
+
+def _history(n_countries=40, years=range(2020, 2027), seed=0):
+    rng = np.random.default_rng(seed)
+    years = np.array(list(years))
+    countries = np.repeat([f"C{i}" for i in range(n_countries)], len(years))
+    level = np.repeat(rng.uniform(8, 14, n_countries), len(years))
+    slope = np.repeat(rng.uniform(-0.1, 0.2, n_countries), len(years))
+    offset = np.tile(years, n_countries) - TRAIN_FROM_YEAR
+    arrivals = np.exp(level + slope * offset + rng.normal(0, 0.05, len(offset)))
+    return pd.DataFrame({'country': countries, 'year': np.tile(years, n_countries), 'arrivals': arrivals})
+
+
+def test_closed_form_matches_least_squares_per_country():
+    history = _history()
+    fitted = fit_trends(country_sums(history).groupby(level='country').sum())
+
+    recent = history[history['year'] >= TRAIN_FROM_YEAR]
+    for country, group in recent.groupby('country'):
+        slope, level = np.polyfit(group['year'] - TRAIN_FROM_YEAR, np.log(group['arrivals']), 1)
+        assert np.isclose(fitted.loc[country, 'slope'], slope)
+        assert np.isclose(fitted.loc[country, 'level'], level)
+
+
+def test_single_year_has_no_slope():
+    history = _history(n_countries=3, years=[2024])
+    fitted = fit_trends(country_sums(history).groupby(level='country').sum())
+    assert (fitted['slope'] == 0).all()
+    assert np.allclose(fitted['level'], np.log(history.set_index('country')['arrivals']).reindex(fitted.index))
+
+
+def test_arrivals_model_is_a_coefficient_table():
+    model, metadata = train_arrivals_model(_history())
+    assert list(model.columns) == ['level', 'slope']
+    assert metadata['n_countries'] == len(model) == 40
+    assert metadata['metrics']['holdout_r2'] > 0.9
+    assert 0 < metadata['resid_std'] < 0.1
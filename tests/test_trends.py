@@ -0,0 +1,147 @@
+import json
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.extractors.trends_extractor import (extract_trends_batched, keyword_batches, open_run_dir,
+                                             rescale_to_anchor)
+
+KEYWORDS = ['K0', 'K1', 'K2', 'K3', 'K4', 'K5']
+# Interes "real" de cada palabra; Google escala cada consulta a 100 en su maximo
+TRUE_INTEREST = {'K0': 40.0, 'K1': 80.0, 'K2': 20.0, 'K3': 10.0, 'K4': 60.0, 'K5': 160.0}
+DATES = pd.date_range('2026-01-04', periods=4, freq='W')
+
+
+def test_keyword_batches_share_the_anchor():
+    assert keyword_batches(['a', 'b'], size=5) == [['a', 'b']]
+    batches = keyword_batches(list('abcdefghi'), size=5)
+    assert batches == [['a', 'b', 'c', 'd', 'e'], ['a', 'f', 'g', 'h', 'i']]
+    assert keyword_batches(list('abcdef'), size=5) == [['a', 'b', 'c', 'd', 'e'], ['a', 'f']]
+
+
+def test_rescale_to_anchor():
+    df = pd.DataFrame({
+        'geo': 'WORLD',
+        'batch': [0, 0, 1, 1],
+        'keyword': ['A', 'B', 'A', 'C'],
+        'interest': [50.0, 100.0, 25.0, 10.0]
+    })
+    out = rescale_to_anchor(df, 'A', ['geo'])
+    # El lote 1 tiene el ancla a la mitad: C se duplica; el ancla del lote 1 se descarta
+    assert out.set_index('keyword')['interest'].to_dict() == {'A': 50.0, 'B': 100.0, 'C': 20.0}
+    assert 'batch' not in out
+
+    single = rescale_to_anchor(df[df['batch'] == 0], 'A', ['geo'])
+    assert list(single.columns) == ['geo', 'keyword', 'interest']
+
+
+class RateLimited(Exception):
+    def __init__(self):
+        super().__init__("429")
+        self.response = type('Response', (), {'status_code': 429, 'headers': {}})()
+
+
+class FakeLimiter:
+    interval = 0.0
+
+    def __init__(self):
+        self.throttles = 0
+
+    def acquire(self):
+        pass
+
+    def success(self):
+        pass
+
+    def throttled(self, retry_after=None):
+        self.throttles += 1
+
+
+class FakeGoogle:
+    """Cliente pytrends falso: cada consulta escalada a 100; `blocked` responde siempre 429"""
+
+    def __init__(self, first_429=True, blocked=None):
+        self.pending_429 = first_429
+        self.blocked = blocked
+        self.calls = []
+
+    def __call__(self):
+        google = self
+
+        class Client:
+            def build_payload(self, kw_list, timeframe, geo=''):
+                self.kw_list = kw_list
+
+            def _scaled(self):
+                top = max(TRUE_INTEREST[kw] for kw in self.kw_list)
+                return {kw: TRUE_INTEREST[kw] * 100 / top for kw in self.kw_list}
+
+            def _check(self, kind):
+                google.calls.append((kind, tuple(self.kw_list)))
+                if google.pending_429 or (kind, tuple(self.kw_list)) == google.blocked:
+                    google.pending_429 = False
+                    raise RateLimited()
+
+            def interest_over_time(self):
+                self._check('time')
+                values = self._scaled()
+                df = pd.DataFrame({kw: np.full(len(DATES), v) for kw, v in values.items()}, index=DATES)
+                return df.assign(isPartial=False).rename_axis('date')
+
+            def interest_by_region(self, resolution, inc_low_vol):
+                self._check('region')
+                values = self._scaled()
+                return pd.DataFrame({kw: [v, v / 2] for kw, v in values.items()},
+                                    index=pd.Index(['Mexico', 'Canada'], name='geoName'))
+        return Client()
+
+
+def _run(google, limiter, checkpoints):
+    return extract_trends_batched(KEYWORDS, timeframes=['today 12-m'], geo_resolutions=[('', 'COUNTRY')],
+                                  client_factory=google, limiter=limiter, use_cache=False,
+                                  checkpoint_dir=checkpoints)
+
+
+def test_batched_extraction_retries_resumes_and_rescales(data_dir, tmp_path):
+    checkpoints = tmp_path / 'checkpoints'
+    blocked = ('region', ('K0', 'K5'))
+
+    # Primera corrida: un 429 suelto se reintenta; la consulta bloqueada agota los reintentos
+    limiter = FakeLimiter()
+    google = FakeGoogle(blocked=blocked)
+    time_df, region_df = _run(google, limiter, checkpoints)
+    assert limiter.throttles > 1
+    assert not region_df['keyword'].eq('K5').any()
+    [run_dir] = [path for path in checkpoints.iterdir()]
+    assert len(list(run_dir.glob('*.parquet'))) == 3
+
+    # Segunda corrida: solo se pide la consulta que faltaba y se borra el checkpoint
+    google = FakeGoogle(first_429=False)
+    time_df, region_df = _run(google, FakeLimiter(), checkpoints)
+    assert google.calls == [blocked]
+    assert not run_dir.exists()
+
+    # K5 viene de otro lote (escalado a su propio maximo) y vuelve a la escala del lote 0
+    top = max(TRUE_INTEREST[kw] for kw in KEYWORDS[:5])
+    expected = {kw: value * 100 / top for kw, value in TRUE_INTEREST.items()}
+    by_keyword = time_df.groupby('keyword')['interest'].mean()
+    np.testing.assert_allclose(by_keyword.reindex(KEYWORDS), [expected[kw] for kw in KEYWORDS])
+    mexico = region_df[region_df['region'] == 'Mexico'].set_index('keyword')['interest']
+    np.testing.assert_allclose(mexico.reindex(KEYWORDS), [expected[kw] for kw in KEYWORDS])
+
+
+@pytest.mark.parametrize('age, kept', [(0, True), (1, True), (2, False)])
+def test_checkpoints_expire_by_creation_date(tmp_path, age, kept):
+    run = open_run_dir(tmp_path, 'plan')
+    (run / 'time_x.parquet').write_bytes(b'')
+    created = (date.today() - timedelta(days=age)).isoformat()
+    (run / 'run.json').write_text(json.dumps({'created': created}))
+    legacy = tmp_path / '2026-01-01-plan'
+    legacy.mkdir()
+
+    run = open_run_dir(tmp_path, 'plan', max_age_days=2)
+    assert (run / 'time_x.parquet').exists() == kept
+    assert json.loads((run / 'run.json').read_text())['created'] == (created if kept else date.today().isoformat())
+    assert not legacy.exists()
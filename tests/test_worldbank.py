@@ -0,0 +1,26 @@
+import pytest
+
+from benchmarks.bench_worldbank import LATENCY, run, start_stub_server
+from src.extractors.worldbank_extractor import fetch_arrivals
+
+COUNTRIES = {f"Country {i}": f"C{i:02d}" for i in range(12)}
+
+
+@pytest.fixture(scope='module')
+def base_url():
+    server, url = start_stub_server()
+    yield url
+    server.shutdown()
+
+
+def test_concurrent_fetch_beats_serial_with_the_same_frame(base_url):
+    t_serial, serial, n_serial = run(fetch_arrivals, base_url, country_codes=COUNTRIES, max_workers=1)
+    t_concurrent, concurrent, n_concurrent = run(fetch_arrivals, base_url, country_codes=COUNTRIES,
+                                                 max_workers=8)
+
+    assert n_serial == n_concurrent == len(COUNTRIES)
+    assert t_serial >= len(COUNTRIES) * LATENCY
+    # 12 peticiones en 8 workers son 2 rondas de latencia contra 12: se exige al menos 2x
+    assert t_concurrent < t_serial / 2
+    assert concurrent.equals(serial)
+    assert len(serial) == len(COUNTRIES) * 5